@@ -0,0 +1,103 @@
+"""Micro-benchmark of response serialization modes on Metrika-shaped payloads.
+
+Usage:
+    python benchmarks/bench_serialization.py [--rows 100 10000 100000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from ya_metrics_mcp.utils.serialization import OUTPUT_FORMATS, orjson, serialize
+
+
+def make_report(rows: int, seed: int = 0) -> dict:
+    """Build a /stat/v1/data-style response with URL and search-phrase dimensions."""
+    rng = random.Random(seed)
+    engines = ["Яндекс", "Google", "Bing", "DuckDuckGo"]
+    data = [
+        {
+            "dimensions": [
+                {"name": f"/catalog/section-{i % 97}/item-{i}", "id": None},
+                {"name": engines[i % len(engines)], "id": f"engine-{i % len(engines)}"},
+                {"name": f"купить товар {i} недорого", "id": None},
+            ],
+            "metrics": [
+                float(rng.randint(1, 10_000)),
+                round(rng.uniform(0, 100), 6),
+                round(rng.uniform(0, 600), 6),
+            ],
+        }
+        for i in range(rows)
+    ]
+    return {
+        "query": {
+            "ids": [12345678],
+            "dimensions": ["ym:s:URLPath", "ym:s:searchEngine", "ym:s:searchPhrase"],
+            "metrics": [
+                "ym:s:pageviews",
+                "ym:s:bounceRate",
+                "ym:s:avgVisitDurationSeconds",
+            ],
+            "date1": "2024-01-01",
+            "date2": "2024-01-31",
+            "limit": rows,
+            "offset": 1,
+        },
+        "data": data,
+        "total_rows": rows,
+        "sampled": False,
+        "totals": [1.0e6, 35.5, 120.25],
+        "min": [1.0, 0.0, 0.0],
+        "max": [10_000.0, 100.0, 600.0],
+    }
+
+
+def bench(
+    data: dict, output_format: str, backend: str, repeat: int
+) -> tuple[float, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = serialize(data, output_format, backend=backend)
+        best = min(best, time.perf_counter() - start)
+        size = len(text.encode())
+    return best, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    backends = ["stdlib"] + (["orjson"] if orjson is not None else [])
+    print(
+        f"{'rows':>8} {'format':>8} {'backend':>8} {'best ms':>10} {'bytes':>12} "
+        f"{'vs pretty/stdlib':>17}"
+    )
+    for rows in args.rows:
+        data = make_report(rows)
+        baseline: tuple[float, int] | None = None
+        for output_format in OUTPUT_FORMATS:
+            # Delimited formats are written by the csv module regardless of backend.
+            format_backends = (
+                ["stdlib"] if output_format in ("csv", "tsv") else backends
+            )
+            for backend in format_backends:
+                seconds, size = bench(data, output_format, backend, args.repeat)
+                if baseline is None:
+                    baseline = (seconds, size)
+                speedup = baseline[0] / seconds if seconds else float("inf")
+                shrink = size / baseline[1] if baseline[1] else 0.0
+                print(
+                    f"{rows:>8} {output_format:>8} {backend:>8} "
+                    f"{seconds * 1000:>10.2f} "
+                    f"{size:>12} {speedup:>6.1f}x / {shrink:>5.0%}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""End-to-end benchmark of MCP tool calls against a mocked Metrika API.
+
+Tools are called through an in-memory FastMCP client, so every call goes through
+argument validation, the fetcher, the client (rate limiter, retries, caching
+layers) and serialization. The Metrika API is replaced by an httpx.MockTransport
+that answers with Metrika-shaped payloads of ``--rows`` rows after ``--latency``
+milliseconds. Response caching is disabled so that every call reaches the mock.
+
+For each tool and payload size the benchmark reports calls per second, p50/p95/p99
+latency, time spent in serialization (from the ``serialize`` trace spans), the
+response size and the peak traced memory of a single call.
+
+Usage:
+    python benchmarks/bench_tools.py [--rows 10 1000 100000] [--calls 20]
+        [--latency 0] [--concurrency 1] [--tools get_page_performance ...]
+        [--output results.json] [--baseline previous.json]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any
+
+import httpx
+
+COUNTER_ID = "12345678"
+CITIES = [
+    "Москва",
+    "Санкт-Петербург",
+    "Новосибирск",
+    "Екатеринбург",
+    "Казань",
+    "Самара",
+]
+ENGINES = ["Яндекс", "Google", "Bing", "DuckDuckGo"]
+
+# name -> (tool, arguments); a scenario's date range is shifted per call.
+SCENARIOS: dict[str, tuple[str, dict[str, Any]]] = {
+    "get_page_performance": ("get_page_performance", {}),
+    "get_page_performance:compact": (
+        "get_page_performance",
+        {"output_format": "compact"},
+    ),
+    "get_page_performance:table": ("get_page_performance", {"output_format": "table"}),
+    "get_page_performance:csv": ("get_page_performance", {"output_format": "csv"}),
+    "get_regional_data": ("get_regional_data", {}),
+    "get_data_by_time": (
+        "get_data_by_time",
+        {
+            "metrics": ["ym:s:visits", "ym:s:users"],
+            "dimensions": ["ym:s:trafficSource"],
+        },
+    ),
+    "get_drilldown": (
+        "get_drilldown",
+        {
+            "dimensions": "ym:s:regionCountry,ym:s:regionCity",
+            "metrics": ["ym:s:visits"],
+        },
+    ),
+}
+# Tools without a date range; every other scenario gets date_from/date_to.
+_UNDATED = {"get_regional_data"}
+
+
+def _dimension(name: str, i: int) -> dict[str, Any]:
+    if name.endswith("URLPath"):
+        return {"name": f"/catalog/section-{i % 97}/item-{i}", "id": None}
+    if name.endswith(("regionCityName", "regionCity")):
+        return {
+            "name": f"{CITIES[i % len(CITIES)]} {i // len(CITIES) or ''}".strip(),
+            "id": i,
+        }
+    if name.endswith("searchEngine"):
+        return {"name": ENGINES[i % len(ENGINES)], "id": f"engine-{i % len(ENGINES)}"}
+    if name.endswith("searchPhrase"):
+        return {"name": f"купить товар {i} недорого", "id": None}
+    return {"name": f"{name.rsplit(':', 1)[-1]} {i}", "id": str(i)}
+
+
+def make_payload(
+    path: str, params: httpx.QueryParams, rows: int, seed: int = 0
+) -> dict:
+    """Build a Metrika response for ``path`` shaped by the requested query."""
+    rng = random.Random(seed)
+    dimensions = [d for d in params.get("dimensions", "").split(",") if d]
+    metrics = [m for m in params.get("metrics", "").split(",") if m] or ["ym:s:visits"]
+    query = {
+        "ids": [int(params.get("ids", params.get("id", COUNTER_ID)))],
+        "dimensions": dimensions,
+        "metrics": metrics,
+        "date1": params.get("date1", "2024-01-01"),
+        "date2": params.get("date2", "2024-01-31"),
+    }
+
+    def values(count: int) -> list[float]:
+        return [round(rng.uniform(0, 10_000), 4) for _ in range(count)]
+
+    if path.endswith("/bytime"):
+        # ``rows`` cells spread over up to top_keys series.
+        series = max(1, min(rows, int(params.get("top_keys", 7))))
+        intervals = max(1, rows // series)
+        start = date(2024, 1, 1)
+        days = [(start + timedelta(days=i)).isoformat() for i in range(intervals)]
+        return {
+            "query": query,
+            "data": [
+                {
+                    "dimensions": [_dimension(d, i) for d in dimensions],
+                    "metrics": [values(intervals) for _ in metrics],
+                }
+                for i in range(series)
+            ],
+            "time_intervals": [[day, day] for day in days],
+            "totals": [values(intervals) for _ in metrics],
+            "total_rows": series,
+            "sampled": False,
+        }
+    if path.endswith("/drilldown"):
+        return {
+            "query": query,
+            "data": [
+                {
+                    "dimension": _dimension(dimensions[0] if dimensions else "node", i),
+                    "metrics": values(len(metrics)),
+                    "expand": len(dimensions) > 1,
+                }
+                for i in range(rows)
+            ],
+            "total_rows": rows,
+            "totals": values(len(metrics)),
+            "sampled": False,
+        }
+    return {
+        "query": query,
+        "data": [
+            {
+                "dimensions": [_dimension(d, i) for d in dimensions],
+                "metrics": values(len(metrics)),
+            }
+            for i in range(rows)
+        ],
+        "total_rows": rows,
+        "totals": values(len(metrics)),
+        "sampled": False,
+    }
+
+
+class MockMetrika:
+    """Answers every request with a pre-rendered ``rows``-row payload after ``latency``.
+
+    ``rows`` and ``latency`` may be changed between scenarios; payloads are
+    rendered once per endpoint, dimensions, metrics and size.
+    """
+
+    def __init__(self, rows: int = 10, latency: float = 0.0) -> None:
+        self.rows = rows
+        self.latency = latency
+        self._bodies: dict[tuple[str, str, str, int], bytes] = {}
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        params = request.url.params
+        key = (
+            request.url.path,
+            params.get("dimensions", ""),
+            params.get("metrics", ""),
+            self.rows,
+        )
+        body = self._bodies.get(key)
+        if body is None:
+            body = self._bodies[key] = json.dumps(
+                make_payload(request.url.path, params, self.rows), ensure_ascii=False
+            ).encode()
+        return httpx.Response(
+            200, content=body, headers={"Content-Type": "application/json"}
+        )
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handler)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _arguments(scenario: str, call: int) -> dict[str, Any]:
+    tool, arguments = SCENARIOS[scenario]
+    arguments = {"counter_id": COUNTER_ID, **arguments}
+    if tool not in _UNDATED:
+        end = date(2024, 6, 30) - timedelta(days=call % 180)
+        arguments.update(
+            date_from=(end - timedelta(days=29)).isoformat(), date_to=end.isoformat()
+        )
+    return arguments
+
+
+def _serialize_seconds(traces: list[dict[str, Any]]) -> list[float]:
+    def walk(node: dict[str, Any]) -> float:
+        own = node["duration_ms"] / 1000 if node["name"] == "serialize" else 0.0
+        return own + sum(walk(child) for child in node.get("children", []))
+
+    return [walk(trace) for trace in traces]
+
+
+async def run_scenario(
+    client: Any, scenario: str, rows: int, calls: int, concurrency: int
+) -> dict[str, Any]:
+    from ya_metrics_mcp.utils.tracing import configure_tracing, recent_traces
+
+    tool = SCENARIOS[scenario][0]
+    # Renders the mock payload and warms imports; not measured.
+    first = await client.call_tool(tool, _arguments(scenario, 0))
+    response_bytes = len(first.content[0].text.encode())
+
+    configure_tracing("memory", max_traces=calls)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(call: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await client.call_tool(tool, _arguments(scenario, call))
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(call) for call in range(1, calls + 1)))
+    elapsed = time.perf_counter() - started
+    serialize = _serialize_seconds(recent_traces(limit=calls))
+
+    tracemalloc.start()
+    await client.call_tool(tool, _arguments(scenario, calls + 1))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scenario": scenario,
+        "rows": rows,
+        "calls": calls,
+        "calls_per_second": round(calls / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "serialize_ms": round(statistics.fmean(serialize) * 1000, 3)
+        if serialize
+        else None,
+        "response_bytes": response_bytes,
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def _change(before: dict[str, Any], after: dict[str, Any], key: str) -> str:
+    old, new = before[key], after[key]
+    return f"{(new - old) * 100 / old:+.1f}%" if old else "n/a"
+
+
+def compare(results: list[dict[str, Any]], baseline: list[dict[str, Any]]) -> None:
+    previous = {(r["scenario"], r["rows"]): r for r in baseline}
+    print(
+        f"\n{'scenario':<30} {'rows':>7} {'calls/s':>14} {'p95':>14} "
+        f"{'peak mem':>14}"
+    )
+    for result in results:
+        before = previous.get((result["scenario"], result["rows"]))
+        if before is None:
+            continue
+        calls, p95, memory = (
+            _change(before, result, key)
+            for key in ("calls_per_second", "p95_ms", "peak_memory_kb")
+        )
+        print(
+            f"{result['scenario']:<30} {result['rows']:>7} {calls:>14} "
+            f"{p95:>14} {memory:>14}"
+        )
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    from fastmcp import Client
+
+    import ya_metrics_mcp.servers.tools  # noqa: F401
+    from ya_metrics_mcp.servers import main
+
+    api = MockMetrika(latency=args.latency / 1000)
+    main.http_transport = api.transport()
+    results = []
+    print(
+        f"{'scenario':<30} {'rows':>7} {'calls/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'ser. ms':>9} {'bytes':>11} {'peak KB':>10}"
+    )
+    async with Client(main.mcp) as client:
+        for rows in args.rows:
+            api.rows = rows
+            for scenario in args.tools:
+                result = await run_scenario(
+                    client, scenario, rows, args.calls, args.concurrency
+                )
+                results.append(result)
+                print(
+                    f"{scenario:<30} {rows:>7} {result['calls_per_second']:>9.1f} "
+                    f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                    f"{result['p99_ms']:>9.2f} {result['serialize_ms'] or 0:>9.2f} "
+                    f"{result['response_bytes']:>11} "
+                    f"{result['peak_memory_kb']:>10.0f}"
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 1_000, 100_000])
+    parser.add_argument(
+        "--calls", type=int, default=20, help="Measured calls per scenario"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Mock API latency in ms"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Calls in flight at once (identical concurrent fetches are coalesced)",
+    )
+    parser.add_argument(
+        "--tools", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS)
+    )
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument(
+        "--baseline", help="Results file of an earlier run to compare with"
+    )
+    args = parser.parse_args()
+
+    os.environ.setdefault("YANDEX_API_KEY", "benchmark")
+    # Every call must reach the mock, unthrottled and without connection warm-up.
+    os.environ.update(
+        YANDEX_CACHE_MAX_ENTRIES="0",
+        YANDEX_RATE_LIMIT="0",
+        YANDEX_RATE_LIMIT_PER_TOKEN="0",
+        YANDEX_RATE_LIMIT_PER_COUNTER="0",
+        YANDEX_WARMUP="false",
+    )
+
+    results = asyncio.run(run(args))
+    if args.output:
+        report = {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {
+                "calls": args.calls,
+                "latency_ms": args.latency,
+                "concurrency": args.concurrency,
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            compare(results, json.load(file)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Vectorized anomaly, change-point and trend detection over bytime series.
+
+Every top_keys series and metric of a bytime report is stacked into one
+``(series, metrics, intervals)`` array, and all statistics are computed for the
+whole array at once:
+
+* rolling z-score: distance from the mean of the previous ``window`` points, in
+  standard deviations of those points;
+* seasonal z-score: the seasonal-naive residual ``x[t] - x[t - season]``
+  standardized with its median and MAD, which tolerates a few outliers;
+* change point: the split maximizing the two-sample t statistic between the
+  segment means before and after it;
+* trend: least-squares slope, expressed as percent of the series mean over
+  the whole range.
+
+Only flagged points and one summary line per series and metric are returned.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from ya_metrics_mcp.utils.optional import require_numpy
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is not installed
+    np = None  # type: ignore[assignment]
+
+# Seasonal period (in intervals) used by default for each bytime grouping.
+DEFAULT_SEASON = {"day": 7, "week": 52, "month": 12, "quarter": 4, "year": 0}
+# A change point must move the mean by at least this much to be reported.
+MIN_SHIFT_PCT = 10.0
+# Shortest segment allowed on either side of a change point.
+MIN_SEGMENT = 3
+_MAD_SCALE = 1.4826
+
+
+def rolling_zscores(values: Any, window: int) -> Any:
+    """z-score of each point against the ``window`` points before it (else NaN)."""
+    zeros = np.zeros(values.shape[:-1] + (1,))
+    sums = np.concatenate([zeros, np.cumsum(values, axis=-1)], axis=-1)
+    squares = np.concatenate([zeros, np.cumsum(values**2, axis=-1)], axis=-1)
+    result = np.full(values.shape, np.nan)
+    if values.shape[-1] <= window:
+        return result
+    mean = (sums[..., window:-1] - sums[..., :-window - 1]) / window
+    mean_sq = (squares[..., window:-1] - squares[..., :-window - 1]) / window
+    std = np.sqrt(np.clip(mean_sq - mean**2, 0, None) * window / (window - 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[..., window:] = np.where(
+            std > 0, (values[..., window:] - mean) / std, np.nan
+        )
+    return result
+
+
+def seasonal_zscores(values: Any, season: int) -> Any:
+    """Robust z-score of seasonal-naive residuals (NaN for the first season)."""
+    result = np.full(values.shape, np.nan)
+    if season <= 0 or values.shape[-1] <= season + 1:
+        return result
+    residuals = values[..., season:] - values[..., :-season]
+    median = np.median(residuals, axis=-1, keepdims=True)
+    mad = np.median(np.abs(residuals - median), axis=-1, keepdims=True) * _MAD_SCALE
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[..., season:] = np.where(mad > 0, (residuals - median) / mad, np.nan)
+    return result
+
+
+def change_points(values: Any) -> tuple[Any, Any, Any, Any]:
+    """Best mean-shift split per series: ``(index, score, mean_before, mean_after)``.
+
+    ``index`` is the first interval after the shift; series too short to split
+    get a score of 0.
+    """
+    length = values.shape[-1]
+    shape = values.shape[:-1]
+    if length < 2 * MIN_SEGMENT:
+        zeros = np.zeros(shape)
+        return np.zeros(shape, dtype=np.int64), zeros, zeros, zeros
+    sums = np.cumsum(values, axis=-1)
+    squares = np.cumsum(values**2, axis=-1)
+    splits = np.arange(MIN_SEGMENT, length - MIN_SEGMENT + 1)
+    left_n = splits.astype(np.float64)
+    right_n = length - left_n
+    left_sum = sums[..., splits - 1]
+    right_sum = sums[..., -1:] - left_sum
+    left_mean, right_mean = left_sum / left_n, right_sum / right_n
+    within = (
+        squares[..., splits - 1] - left_n * left_mean**2
+        + (squares[..., -1:] - squares[..., splits - 1]) - right_n * right_mean**2
+    )
+    # Floor the pooled variance so a noiseless step gets a large finite score.
+    variance = np.maximum(
+        np.clip(within, 0, None) / (length - 2),
+        1e-6 * values.var(axis=-1, keepdims=True),
+    )
+    spread = np.sqrt(variance * (1 / left_n + 1 / right_n))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.abs(left_mean - right_mean) / spread
+    scores = np.nan_to_num(scores, nan=0.0)
+    best = np.argmax(scores, axis=-1)
+    pick = best[..., None]
+    return (
+        splits[best],
+        np.take_along_axis(scores, pick, -1)[..., 0],
+        np.take_along_axis(left_mean, pick, -1)[..., 0],
+        np.take_along_axis(right_mean, pick, -1)[..., 0],
+    )
+
+
+def trend_slopes(values: Any) -> Any:
+    """Least-squares slope per interval along the last axis."""
+    t = np.arange(values.shape[-1], dtype=np.float64)
+    t -= t.mean()
+    denominator = (t**2).sum()
+    if denominator == 0:
+        return np.zeros(values.shape[:-1])
+    centered = values - values.mean(axis=-1, keepdims=True)
+    return (centered * t).sum(axis=-1) / denominator
+
+
+def _label(dimensions: list[Any]) -> str:
+    names = [
+        d.get("name", d.get("id")) if isinstance(d, dict) else d for d in dimensions
+    ]
+    return " / ".join(str(n) for n in names) if names else "total"
+
+
+def _round(value: float, digits: int = 2) -> float | None:
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def detect_anomalies(
+    report: dict[str, Any],
+    metrics: list[str],
+    window: int,
+    season: int,
+    threshold: float,
+    max_points: int = 50,
+) -> dict[str, Any]:
+    """Analyze a bytime report; return flagged points, change points and trends."""
+    require_numpy("Anomaly detection")
+    rows = report.get("data", [])
+    dates = [
+        interval[0] if isinstance(interval, list) else interval
+        for interval in report.get("time_intervals", [])
+    ]
+    result: dict[str, Any] = {"anomalies": [], "change_points": [], "trends": []}
+    if not rows or not dates:
+        return result
+    labels = [_label(row.get("dimensions", [])) for row in rows]
+    # Missing values are treated as zero, as Metrika does for intervals without data.
+    values = np.nan_to_num(np.array([row["metrics"] for row in rows], dtype=np.float64))
+
+    rolling = rolling_zscores(values, window)
+    seasonal = seasonal_zscores(values, season)
+    with np.errstate(invalid="ignore"):
+        flagged = (np.abs(rolling) >= threshold) | (np.abs(seasonal) >= threshold)
+    strength = np.fmax(np.abs(np.nan_to_num(rolling)), np.abs(np.nan_to_num(seasonal)))
+    s_idx, m_idx, t_idx = np.nonzero(flagged)
+    order = np.argsort(-strength[s_idx, m_idx, t_idx], kind="stable")[:max_points]
+    result["total_anomalies"] = int(len(s_idx))
+    for i in order:
+        s, m, t = s_idx[i], m_idx[i], t_idx[i]
+        history = values[s, m, max(0, t - window):t]
+        result["anomalies"].append({
+            "series": labels[s],
+            "metric": metrics[m],
+            "date": dates[t],
+            "value": _round(values[s, m, t], 4),
+            "baseline": _round(history.mean(), 4) if history.size else None,
+            "z": _round(rolling[s, m, t]),
+            "seasonal_z": _round(seasonal[s, m, t]),
+        })
+
+    split, score, before, after = change_points(values)
+    slopes = trend_slopes(values)
+    means = values.mean(axis=-1)
+    counts = flagged.sum(axis=-1)
+    for s, label in enumerate(labels):
+        for m, metric in enumerate(metrics):
+            shift = (
+                (after[s, m] - before[s, m]) * 100 / before[s, m]
+                if before[s, m]
+                else np.nan
+            )
+            if score[s, m] >= threshold and (
+                np.isnan(shift) or abs(shift) >= MIN_SHIFT_PCT
+            ):
+                result["change_points"].append({
+                    "series": label,
+                    "metric": metric,
+                    "date": dates[split[s, m]],
+                    "mean_before": _round(before[s, m], 4),
+                    "mean_after": _round(after[s, m], 4),
+                    "change_pct": _round(shift),
+                    "score": _round(score[s, m]),
+                })
+            mean = means[s, m]
+            result["trends"].append(
+                {
+                    "series": label,
+                    "metric": metric,
+                    "mean": _round(mean, 4),
+                    "slope_per_interval": _round(slopes[s, m], 4),
+                    "trend_pct": _round(slopes[s, m] * (len(dates) - 1) * 100 / mean)
+                    if mean
+                    else None,
+                    "anomalies": int(counts[s, m]),
+                }
+            )
+    return result
@@ -0,0 +1,180 @@
+"""Derived columns computed in a vectorized way over a report's metric matrix.
+
+A derived column is written as ``func:metric``:
+
+* ``share:m``: percentage of the report total (``totals`` when present,
+  otherwise the sum of the returned rows);
+* ``rank:m``: 1-based rank by descending value, with ties sharing a rank;
+* ``cumsum:m``: running total down the rows, or along time for bytime reports;
+* ``ratio:a/b``: ``a`` divided by ``b`` per row, e.g. pageviews per user;
+* ``growth:m``: percent change from the previous interval (bytime only);
+* ``rollingN:m``: trailing mean over N intervals (bytime only).
+
+Derived values are appended to each row's ``metrics`` and their specs to
+``query.metrics``, so every output format shows them as extra columns.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from ya_metrics_mcp.utils.optional import require_numpy
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is not installed
+    np = None  # type: ignore[assignment]
+
+DERIVED_FUNCTIONS = ("share", "rank", "cumsum", "ratio", "growth", "rollingN")
+MAX_DERIVED = 20
+
+_ROLLING_PATTERN = re.compile(r"^rolling(\d+)$")
+_SIMPLE_FUNCTIONS = {"share", "rank", "cumsum", "ratio", "growth"}
+_SERIES_FUNCTIONS = {"growth", "rolling"}
+
+
+def parse_derived(spec: str) -> tuple[str, int, list[str]]:
+    """Parse a derived column spec into ``(func, window, metrics)``."""
+    func, _, rest = spec.partition(":")
+    window = 0
+    match = _ROLLING_PATTERN.match(func)
+    if match:
+        func, window = "rolling", int(match.group(1))
+        if window < 2:
+            raise ValueError(f"Rolling window must be at least 2 in {spec!r}")
+    elif func not in _SIMPLE_FUNCTIONS:
+        raise ValueError(
+            f"Unknown derived function in {spec!r}; use one of {DERIVED_FUNCTIONS}"
+        )
+    if not rest:
+        raise ValueError(
+            f"Derived column {spec!r} needs a metric, e.g. share:ym:s:visits"
+        )
+    metrics = rest.split("/") if func == "ratio" else [rest]
+    if func == "ratio" and (len(metrics) != 2 or not all(metrics)):
+        raise ValueError(
+            "ratio needs two metrics, e.g. ratio:ym:s:pageviews/ym:s:users, "
+            f"got {spec!r}"
+        )
+    return func, window, metrics
+
+
+def _rank(values: Any) -> Any:
+    """Competition ranking (1, 2, 2, 4) by descending value on axis 0; NaN last."""
+    keys = np.where(np.isnan(values), np.inf, -values)
+    ordered = np.sort(keys, axis=0)
+    if keys.ndim == 1:
+        return np.searchsorted(ordered, keys, side="left") + 1
+    ranks = np.empty(keys.shape, dtype=np.int64)
+    for t in range(keys.shape[1]):
+        ranks[:, t] = np.searchsorted(ordered[:, t], keys[:, t], side="left") + 1
+    return ranks
+
+
+def _divide(a: Any, b: Any) -> Any:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(b != 0, a / np.where(b != 0, b, 1), np.nan)
+
+
+def _rolling_mean(values: Any, window: int) -> Any:
+    """Trailing mean along the last axis; the first ``window - 1`` points are NaN."""
+    cumulative = np.cumsum(np.nan_to_num(values), axis=-1)
+    result = np.full(values.shape, np.nan)
+    if values.shape[-1] >= window:
+        shifted = np.concatenate(
+            [np.zeros(values.shape[:-1] + (1,)), cumulative[..., :-window]], axis=-1
+        )
+        result[..., window - 1:] = (cumulative[..., window - 1:] - shifted) / window
+    return result
+
+
+def _compute(
+    func: str,
+    window: int,
+    columns: list[Any],
+    total: Any,
+    bytime: bool,
+) -> Any:
+    values = columns[0]
+    if func == "share":
+        if total is None:
+            total = np.nansum(values, axis=0)
+        return _divide(values * 100, total)
+    if func == "rank":
+        return _rank(values)
+    if func == "cumsum":
+        return np.nancumsum(values, axis=-1 if bytime else 0)
+    if func == "ratio":
+        return _divide(columns[0], columns[1])
+    if func == "growth":
+        previous = np.concatenate(
+            [np.full(values.shape[:-1] + (1,), np.nan), values[..., :-1]], axis=-1
+        )
+        return _divide((values - previous) * 100, previous)
+    return _rolling_mean(values, window)
+
+
+def _to_list(values: Any) -> list[Any]:
+    if values.dtype.kind == "i":
+        integers: list[Any] = values.tolist()
+        return integers
+    rounded = np.round(values, 4).astype(object)
+    rounded[np.isnan(values)] = None
+    result: list[Any] = rounded.tolist()
+    return result
+
+
+def add_derived(report: dict[str, Any], specs: list[str]) -> dict[str, Any]:
+    """Return a copy of ``report`` with the derived columns in ``specs`` appended.
+
+    The input report is left untouched, since cached responses are shared.
+    """
+    require_numpy("Derived metrics")
+    if len(specs) > MAX_DERIVED:
+        raise ValueError(f"Maximum {MAX_DERIVED} derived columns allowed")
+    query = report.get("query") or {}
+    names = query.get("metrics")
+    if isinstance(names, str):
+        names = names.split(",")
+    if not isinstance(names, list):
+        raise ValueError("Derived metrics need a report with named metrics")
+    rows = report.get("data", [])
+    if any(not isinstance(row.get("metrics"), list) for row in rows):
+        raise ValueError(
+            "Derived metrics are not supported for segment comparison reports"
+        )
+    bytime = "time_intervals" in report
+
+    parsed = [parse_derived(spec) for spec in specs]
+    for spec, (func, _, metrics) in zip(specs, parsed, strict=True):
+        if func in _SERIES_FUNCTIONS and not bytime:
+            raise ValueError(f"{spec!r} needs a time series (bytime) report")
+        for metric in metrics:
+            if metric not in names:
+                raise ValueError(
+                    f"Metric {metric!r} in {spec!r} is not in the report: {names}"
+                )
+
+    derived_rows: list[list[Any]] = [[] for _ in rows]
+    if rows:
+        # (rows, metrics) for flat reports, (rows, metrics, intervals) for bytime.
+        matrix = np.array([row["metrics"] for row in rows], dtype=np.float64)
+        totals = report.get("totals")
+        for func, window, metrics in parsed:
+            indexes = [names.index(m) for m in metrics]
+            total = None
+            if isinstance(totals, list) and len(totals) == len(names):
+                total = np.array(totals[indexes[0]], dtype=np.float64)
+            result = _compute(
+                func, window, [matrix[:, i] for i in indexes], total, bytime
+            )
+            for derived, values in zip(derived_rows, _to_list(result), strict=True):
+                derived.append(values)
+
+    result = dict(report)
+    result["data"] = [
+        {**row, "metrics": list(row["metrics"]) + derived}
+        for row, derived in zip(rows, derived_rows, strict=True)
+    ]
+    result["query"] = {**query, "metrics": list(names) + list(specs)}
+    return result
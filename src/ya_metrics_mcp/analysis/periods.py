@@ -0,0 +1,78 @@
+"""Alignment of two reports for the same query over different date ranges."""
+from __future__ import annotations
+
+from typing import Any
+
+
+def _row_key(row: dict[str, Any]) -> tuple[Any, ...]:
+    return tuple(
+        d.get("id", d.get("name")) if isinstance(d, dict) else d
+        for d in row.get("dimensions", [])
+    )
+
+
+def _deltas(
+    current: list[Any], previous: list[Any]
+) -> tuple[list[Any], list[Any]]:
+    delta: list[Any] = []
+    delta_pct: list[Any] = []
+    for now, before in zip(current, previous, strict=True):
+        if now is None or before is None:
+            delta.append(None)
+            delta_pct.append(None)
+            continue
+        delta.append(round(now - before, 4))
+        delta_pct.append(round((now - before) * 100 / before, 2) if before else None)
+    return delta, delta_pct
+
+
+def compared_metric_names(metrics: list[str]) -> list[str]:
+    """Column names of an aligned row: current, previous, delta, delta_pct."""
+    return [
+        *metrics,
+        *(f"previous:{m}" for m in metrics),
+        *(f"delta:{m}" for m in metrics),
+        *(f"delta_pct:{m}" for m in metrics),
+    ]
+
+
+def align_periods(
+    current: dict[str, Any], previous: dict[str, Any], metrics: list[str]
+) -> dict[str, Any]:
+    """Join two reports on their dimension values and compute per-metric changes.
+
+    Rows keep the current report's order; rows found only in the previous report
+    follow. A metric missing from one side (e.g. a row outside that period's top
+    rows) is ``None`` there, and so are its deltas.
+    """
+    empty = [None] * len(metrics)
+    before = {_row_key(row): row for row in previous.get("data", [])}
+    rows = []
+    for row in current.get("data", []):
+        old = before.pop(_row_key(row), None)
+        rows.append(
+            (
+                row.get("dimensions", []),
+                row["metrics"],
+                old["metrics"] if old else empty,
+            )
+        )
+    for row in before.values():
+        rows.append((row.get("dimensions", []), empty, row["metrics"]))
+
+    def combine(now: list[Any], then: list[Any]) -> list[Any]:
+        delta, delta_pct = _deltas(now, then)
+        return [*now, *then, *delta, *delta_pct]
+
+    data: dict[str, Any] = {
+        "data": [
+            {"dimensions": dimensions, "metrics": combine(now, then)}
+            for dimensions, now, then in rows
+        ],
+        "total_rows": len(rows),
+    }
+    if isinstance(current.get("totals"), list) and isinstance(
+        previous.get("totals"), list
+    ):
+        data["totals"] = combine(current["totals"], previous["totals"])
+    return data
@@ -7,3 +7,7 @@ class MCPYaMetrikaError(Exception):
 
 class AuthenticationError(MCPYaMetrikaError):
     """Raised when Yandex API authentication fails (401/403)."""
+
+
+class CircuitOpenError(MCPYaMetrikaError):
+    """Raised when a circuit breaker rejects a call while the API is degraded."""
@@ -0,0 +1,159 @@
+"""In-memory TTL/LRU cache for Yandex Metrika API responses."""
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+_DAYS_AGO_PATTERN = re.compile(r"^(\d+)daysAgo$")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    stale_hits: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "stale_hits": self.stale_hits,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+def make_cache_key(path: str, params: Mapping[str, Any], token: str) -> str:
+    """Build a stable cache key from the request path, params and OAuth token.
+
+    Params are sorted so that logically identical requests share a key. The token
+    is hashed so that raw credentials never end up in cache keys.
+    """
+    token_hash = hashlib.sha256(token.encode()).hexdigest()[:16]
+    query = "&".join(f"{k}={params[k]}" for k in sorted(params))
+    return f"{token_hash}:{path}?{query}"
+
+
+def _resolve_date(value: str, today: date) -> date | None:
+    """Resolve a Metrika date parameter (YYYY-MM-DD, today, yesterday, NdaysAgo)."""
+    if value == "today":
+        return today
+    if value == "yesterday":
+        return today - timedelta(days=1)
+    match = _DAYS_AGO_PATTERN.match(value)
+    if match:
+        return today - timedelta(days=int(match.group(1)))
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def ttl_for_params(
+    params: Mapping[str, Any],
+    live_ttl: float,
+    historical_ttl: float,
+    today: date | None = None,
+) -> float:
+    """Pick a TTL based on whether the requested date range includes today.
+
+    Ranges that end before today are immutable on Metrika's side and may be cached
+    for ``historical_ttl``. Anything else (including a missing ``date2``, which
+    Metrika treats as today) uses ``live_ttl``.
+    """
+    date2 = params.get("date2")
+    if date2 is None:
+        return live_ttl
+    end = _resolve_date(str(date2), today or date.today())
+    if end is None:
+        return live_ttl
+    return historical_ttl if end < (today or date.today()) else live_ttl
+
+
+def freshness_marker(age: float) -> dict[str, Any]:
+    """Marker attached to a response served from cache past its TTL."""
+    return {"stale": True, "age_seconds": round(age, 1), "refreshing": True}
+
+
+class ResponseCache:
+    """Size-bounded LRU cache with per-entry TTL.
+
+    An entry may also be given a ``stale_ttl``: once its TTL has passed it is no
+    longer returned by :meth:`peek`, but :meth:`lookup` still returns it (flagged
+    as stale) for that much longer so callers can serve it while refreshing.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._clock = clock
+        # key -> (stored_at, expires_at, stale_until, value)
+        self._entries: OrderedDict[str, tuple[float, float, float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: str) -> tuple[Any, bool, float] | None:
+        """Return ``(value, is_stale, age_seconds)`` for a usable entry, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        stored_at, expires_at, stale_until, value = entry
+        now = self._clock()
+        if stale_until <= now:
+            del self._entries[key]
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if expires_at <= now:
+            self.stats.stale_hits += 1
+            return value, True, now - stored_at
+        self.stats.hits += 1
+        return value, False, now - stored_at
+
+    def peek(self, key: str) -> Any | None:
+        """Return a fresh entry's value without counting a hit or miss."""
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= self._clock():
+            return None
+        return entry[3]
+
+    def set(self, key: str, value: Any, ttl: float, stale_ttl: float = 0) -> None:
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        now = self._clock()
+        expires_at = now + ttl
+        self._entries[key] = (now, expires_at, expires_at + max(stale_ttl, 0), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, predicate: Callable[[str], bool]) -> int:
+        """Drop every entry whose key matches ``predicate``; return how many."""
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -3,63 +3,445 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from pathlib import Path
+from typing import Any
 
 import httpx
 
 from ya_metrics_mcp.exceptions import AuthenticationError, MCPYaMetrikaError
-from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.cache import (
+    ResponseCache,
+    freshness_marker,
+    make_cache_key,
+    ttl_for_params,
+)
+from ya_metrics_mcp.metrika.config import API_BASE, YaMetrikaConfig
+from ya_metrics_mcp.metrika.disk_cache import DiskCache, is_disk_cacheable
+from ya_metrics_mcp.metrika.metadata import is_metadata_path, metadata_key_matcher
+from ya_metrics_mcp.metrika.planner import QueryPlanner, plan_key
+from ya_metrics_mcp.metrika.ratelimit import (
+    RateLimiter,
+    counter_id_from_request,
+    parse_retry_after,
+)
+from ya_metrics_mcp.metrika.retry import CircuitBreaker, RetryPolicy, endpoint_family
+from ya_metrics_mcp.store.daily import DailyStore
+from ya_metrics_mcp.utils.metrics import Histogram, path_template
+from ya_metrics_mcp.utils.tracing import span
 
 logger = logging.getLogger("ya-metrics")
 
-API_BASE = "https://api-metrika.yandex.net"
-RETRYABLE_STATUS_CODES = {500, 502, 503}
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503}
+REPORT_PATH_PREFIX = "/stat/v1/data"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def _stream_to_file(response: httpx.Response, dest: Path) -> int:
+    """Write a streamed response body to ``dest`` chunk by chunk; return its size."""
+    size = 0
+    with dest.open("wb") as file:
+        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(file.write, chunk)
+            size += len(chunk)
+    return size
 
 
 class YaMetrikaClient:
-    def __init__(self, config: YaMetrikaConfig) -> None:
+    def __init__(
+        self,
+        config: YaMetrikaConfig,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """``transport`` replaces the network, e.g. with an in-memory benchmark mock."""
         self.config = config
-        self._http = httpx.AsyncClient(
-            base_url=API_BASE,
-            headers={"Authorization": f"OAuth {config.api_key}"},
-            timeout=config.timeout,
+        self._http = self._build_http_client(config, transport)
+        # Keys are scoped to the API base too, so that a fake or proxy API
+        # never shares disk cache entries with the real one.
+        self._cache_token = (
+            config.api_key
+            if config.api_base == API_BASE
+            else f"{config.api_base} {config.api_key}"
+        )
+        self.cache = ResponseCache(max_entries=config.cache_max_entries)
+        self.disk_cache = (
+            DiskCache(config.disk_cache_path, config.disk_cache_max_mb * 1024 * 1024)
+            if config.disk_cache_path
+            else None
+        )
+        self.rate_limiter = RateLimiter(
+            global_rate=config.rate_limit,
+            token_rate=config.rate_limit_per_token,
+            counter_rate=config.rate_limit_per_counter,
+        )
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._retries = 0
+        self._active_requests = 0
+        self.upstream_latency = Histogram(
+            "ya_metrics_upstream_request_duration_seconds",
+            "Duration of each HTTP attempt to the Metrika API.",
+            ("endpoint", "method", "status"),
+        )
+        self._inflight: dict[str, asyncio.Task[dict[str, Any]]] = {}
+        self._coalesced = 0
+        self._background_refreshes = 0
+        self._daily_store: DailyStore | None = None
+        self.planner = (
+            QueryPlanner(self._get_shared, window=config.planner_window_ms / 1000)
+            if config.planner_window_ms > 0
+            else None
         )
 
-    async def get(self, path: str, params: dict[str, str | int | None]) -> dict:
-        """Make a GET request with retry logic."""
-        clean_params = {k: v for k, v in params.items() if v is not None}
-        return await self._request_with_retry(path, clean_params, attempt=1)
+    @staticmethod
+    def _build_http_client(
+        config: YaMetrikaConfig, transport: httpx.AsyncBaseTransport | None = None
+    ) -> httpx.AsyncClient:
+        def _or_default(value: float | None) -> float:
+            return value if value is not None else config.timeout
 
-    async def _request_with_retry(
-        self, path: str, params: dict, attempt: int
-    ) -> dict:
+        timeout = httpx.Timeout(
+            config.timeout,
+            connect=_or_default(config.connect_timeout),
+            read=_or_default(config.read_timeout),
+            pool=_or_default(config.pool_timeout),
+        )
+        limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+        kwargs: dict[str, Any] = {
+            "base_url": config.api_base,
+            "headers": {"Authorization": f"OAuth {config.api_key}"},
+            "timeout": timeout,
+            "limits": limits,
+        }
+        if transport is not None:
+            kwargs["transport"] = transport
         try:
-            response = await self._http.get(path, params=params)
-        except (httpx.TimeoutException, httpx.ConnectError) as exc:
-            if attempt < self.config.retries:
-                await asyncio.sleep(self.config.retry_delay * attempt)
-                return await self._request_with_retry(path, params, attempt + 1)
-            raise MCPYaMetrikaError(f"Request failed after {attempt} attempts: {exc}") from exc
-
-        if response.status_code in (401, 403):
-            raise AuthenticationError(
-                f"Yandex Metrika authentication failed ({response.status_code}). "
-                "Check your YANDEX_API_KEY."
+            return httpx.AsyncClient(http2=config.http2, **kwargs)
+        except ImportError:
+            logger.warning(
+                "YANDEX_HTTP2 is enabled but the 'h2' package is not installed; "
+                "falling back to HTTP/1.1. Install ya-metrics-mcp[http2]."
             )
+            return httpx.AsyncClient(**kwargs)
+
+    async def warmup(self) -> None:
+        """Open a pooled connection so the first tool call skips DNS and TLS setup."""
+        try:
+            await self._http.head("/")
+        except httpx.HTTPError as exc:
+            logger.info("Connection warm-up failed: %s", exc)
+
+    async def get(
+        self, path: str, params: dict[str, str | int | None], cache: bool = True
+    ) -> dict[str, Any]:
+        """Make a GET request with response caching and retry logic.
+
+        ``cache=False`` always goes upstream, e.g. for polling a status.
+        """
+        clean_params = {k: v for k, v in params.items() if v is not None}
+        if not cache:
+            fresh: dict[str, Any] = await self._request_with_retry(path, clean_params)
+            return fresh
+        key = make_cache_key(path, clean_params, self._cache_token)
+        cached = self.cache.lookup(key)
+        if cached is not None:
+            value, stale, age = cached
+            logger.debug("Cache hit for %s%s", path, " (stale)" if stale else "")
+            if stale:
+                self._refresh_in_background(path, clean_params, key)
+                if isinstance(value, dict):
+                    return {**value, "freshness": freshness_marker(age)}
+            hit: dict[str, Any] = value
+            return hit
+        if (
+            self.planner is not None
+            and key not in self._inflight
+            and plan_key(path, clean_params) is not None
+        ):
+            data = await self.planner.submit(path, clean_params)
+            self.cache.set(key, data, *self._ttls(path, clean_params))
+            return data
+        return await self._get_shared(path, clean_params, key)
+
+    async def _get_shared(
+        self, path: str, clean_params: dict[str, Any], key: str | None = None
+    ) -> dict[str, Any]:
+        """Fetch through a single in-flight request shared by identical callers."""
+        if key is None:
+            # Planner batches land here after get() already counted their miss.
+            key = make_cache_key(path, clean_params, self._cache_token)
+            cached: dict[str, Any] | None = self.cache.peek(key)
+            if cached is not None:
+                return cached
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(path, clean_params, key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish_inflight(key, t))
+        else:
+            self._coalesced += 1
+            logger.debug("Coalescing request for %s", path)
+        # Shield the shared request so that one cancelled waiter does not cancel
+        # it for every other caller awaiting the same key.
+        return await asyncio.shield(task)
+
+    def _refresh_in_background(
+        self, path: str, clean_params: dict[str, Any], key: str
+    ) -> None:
+        """Refetch a stale entry unless a request for the same key is in flight."""
+        if key in self._inflight:
+            return
+        self._background_refreshes += 1
+        task = asyncio.ensure_future(self._fetch(path, clean_params, key, refresh=True))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._finish_inflight(key, t))
 
-        if response.status_code in RETRYABLE_STATUS_CODES:
-            if attempt < self.config.retries:
-                await asyncio.sleep(self.config.retry_delay * attempt)
-                return await self._request_with_retry(path, params, attempt + 1)
-            raise MCPYaMetrikaError(
-                f"Yandex Metrika error {response.status_code}: {response.text}"
+    def _ttls(self, path: str, clean_params: dict[str, Any]) -> tuple[float, float]:
+        """Return ``(ttl, stale_ttl)`` for caching a response."""
+        config = self.config
+        if is_metadata_path(path):
+            return config.metadata_ttl, config.metadata_stale_ttl
+        ttl = ttl_for_params(
+            clean_params, config.cache_ttl, config.cache_historical_ttl
+        )
+        if path.startswith(REPORT_PATH_PREFIX):
+            return ttl, config.report_stale_ttl
+        return ttl, 0
+
+    def invalidate_metadata(self, counter_id: str | None = None) -> int:
+        """Drop cached metadata for one counter (or all); return the number dropped."""
+        matches = metadata_key_matcher(counter_id)
+        removed = self.cache.invalidate(matches)
+        if self.disk_cache is not None:
+            removed += self.disk_cache.invalidate_sync(matches)
+        return removed
+
+    def _finish_inflight(self, key: str, task: asyncio.Task[dict[str, Any]]) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every waiter was cancelled.
+            exc = task.exception()
+            if exc is not None:
+                logger.debug("Request for %s failed: %s", key.split(":", 1)[-1], exc)
+
+    async def _fetch(
+        self,
+        path: str,
+        clean_params: dict[str, Any],
+        key: str,
+        refresh: bool = False,
+    ) -> dict[str, Any]:
+        """Fetch a response from the disk cache or upstream and cache it.
+
+        ``refresh`` skips the disk cache lookup to force an upstream request.
+        """
+        disk = self.disk_cache if is_disk_cacheable(path) else None
+        data: dict[str, Any]
+        if disk is not None and not refresh:
+            stored = await disk.get(key)
+            if stored is not None:
+                logger.debug("Disk cache hit for %s", path)
+                data, remaining_ttl = stored
+                self.cache.set(key, data, remaining_ttl)
+                return data
+        data = await self._request_with_retry(path, clean_params)
+        ttl, stale_ttl = self._ttls(path, clean_params)
+        self.cache.set(key, data, ttl, stale_ttl)
+        if disk is not None:
+            await disk.set(key, data, ttl)
+        return data
+
+    def stats(self) -> dict[str, Any]:
+        """Return runtime statistics for the client."""
+        stats: dict[str, Any] = {
+            "cache": {**self.cache.stats.as_dict(), "size": len(self.cache)},
+            "inflight": {
+                "active": len(self._inflight),
+                "upstream_active": self._active_requests,
+                "coalesced": self._coalesced,
+                "background_refreshes": self._background_refreshes,
+            },
+            "planner": self.planner.stats() if self.planner is not None else None,
+            "rate_limiter": self.rate_limiter.stats(),
+            "retries": self._retries,
+            "pool": self._pool_stats(),
+            "circuit_breakers": {
+                name: breaker.stats() for name, breaker in self._breakers.items()
+            },
+        }
+        if self.disk_cache is not None:
+            stats["disk_cache"] = {
+                **self.disk_cache.stats.as_dict(),
+                "size_bytes": self.disk_cache.size_bytes(),
+            }
+        return stats
+
+    def _pool_stats(self) -> dict[str, int]:
+        """Connection counts from the httpx transport's pool (best effort)."""
+        pool = getattr(getattr(self._http, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", None) or [])
+        return {
+            "connections": len(connections),
+            "idle": sum(1 for conn in connections if conn.is_idle()),
+            "max_connections": self.config.max_connections,
+        }
+
+    def _breaker(self, path: str) -> CircuitBreaker:
+        family = endpoint_family(path)
+        if family not in self._breakers:
+            self._breakers[family] = CircuitBreaker(
+                family,
+                failure_threshold=self.config.circuit_failure_threshold,
+                reset_timeout=self.config.circuit_reset_timeout,
             )
+        return self._breakers[family]
 
-        if not response.is_success:
-            raise MCPYaMetrikaError(
-                f"Yandex Metrika error {response.status_code}: {response.text}"
+    async def _request_with_retry(
+        self,
+        path: str,
+        params: dict[str, Any],
+        method: str = "GET",
+        dest: Path | None = None,
+    ) -> Any:
+        """Send a request with rate limiting, retries and the circuit breaker.
+
+        Returns the decoded JSON body, or the number of bytes written when the
+        body is streamed to ``dest``. Non-GET requests are only retried on 429,
+        which Metrika returns before doing any work.
+        """
+        policy = RetryPolicy.from_config(self.config)
+        breaker = self._breaker(path)
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            breaker.before_call()
+            with span("ratelimit.wait") as wait_span:
+                waited = await self.rate_limiter.acquire(
+                    self.config.api_key, counter_id_from_request(path, params)
+                )
+                wait_span.set_attribute("waited_ms", round(waited * 1000, 2))
+            if waited > 0:
+                logger.debug("Rate limiter delayed %s by %.3fs", path, waited)
+
+            retry_after: float | None = None
+            cause: Exception | None = None
+            retryable = method == "GET"
+            status = "error"
+            with span(
+                "metrika.request",
+                path=path_template(path),
+                method=method,
+                attempt=attempt,
+            ) as request_span:
+                attempt_started = time.monotonic()
+                self._active_requests += 1
+                try:
+                    async with self._http.stream(
+                        method, path, params=params
+                    ) as response:
+                        status = str(response.status_code)
+                        if response.status_code in (401, 403):
+                            breaker.record_success()
+                            raise AuthenticationError(
+                                "Yandex Metrika authentication failed "
+                                f"({response.status_code}). "
+                                "Check your YANDEX_API_KEY."
+                            )
+                        if response.status_code not in RETRYABLE_STATUS_CODES:
+                            breaker.record_success()
+                            if not response.is_success:
+                                await response.aread()
+                                raise MCPYaMetrikaError(
+                                    "Yandex Metrika error "
+                                    f"{response.status_code}: {response.text}"
+                                )
+                            if dest is not None:
+                                return await _stream_to_file(response, dest)
+                            await response.aread()
+                            request_span.set_attribute(
+                                "response.size", response.num_bytes_downloaded
+                            )
+                            return response.json()
+                        await response.aread()
+                        if response.status_code == 429:
+                            # Quota exhaustion is not a sign of a degraded API.
+                            breaker.record_success()
+                            retryable = True
+                        else:
+                            breaker.record_failure()
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                        error = MCPYaMetrikaError(
+                            "Yandex Metrika error "
+                            f"{response.status_code}: {response.text}"
+                        )
+                except httpx.TransportError as exc:
+                    breaker.record_failure()
+                    cause = exc
+                    error = MCPYaMetrikaError(
+                        f"Request failed after {attempt} attempts: {exc}"
+                    )
+                finally:
+                    self._active_requests -= 1
+                    request_span.set_attribute("http.status", status)
+                    self.upstream_latency.observe(
+                        time.monotonic() - attempt_started,
+                        path_template(path),
+                        method,
+                        status,
+                    )
+
+            delay = (
+                policy.next_delay(attempt, time.monotonic() - started, retry_after)
+                if retryable
+                else None
+            )
+            if delay is None:
+                raise error from cause
+            self._retries += 1
+            logger.debug(
+                "Retrying %s in %.2fs (attempt %d failed: %s)",
+                path,
+                delay,
+                attempt,
+                error,
             )
+            with span("retry.sleep", attempt=attempt, delay_ms=round(delay * 1000, 1)):
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def post(
+        self, path: str, params: dict[str, str | int | None]
+    ) -> dict[str, Any]:
+        """Make an uncached POST request (retried only on 429)."""
+        clean_params = {k: v for k, v in params.items() if v is not None}
+        data: dict[str, Any] = await self._request_with_retry(
+            path, clean_params, method="POST"
+        )
+        return data
+
+    async def download(
+        self, path: str, dest: Path, params: dict[str, str | int | None] | None = None
+    ) -> int:
+        """Stream a GET response body into ``dest`` unbuffered; return bytes written."""
+        clean_params = {k: v for k, v in (params or {}).items() if v is not None}
+        size: int = await self._request_with_retry(path, clean_params, dest=dest)
+        return size
 
-        return response.json()
+    @property
+    def daily_store(self) -> DailyStore:
+        """Daily aggregate store, opened on first use."""
+        if self._daily_store is None:
+            self._daily_store = DailyStore(self.config.sync_db_path)
+        return self._daily_store
 
     async def close(self) -> None:
         await self._http.aclose()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+        if self._daily_store is not None:
+            self._daily_store.close()
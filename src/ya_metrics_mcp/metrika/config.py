@@ -5,16 +5,71 @@ import os
 from dataclasses import dataclass
 
 from ya_metrics_mcp.exceptions import AuthenticationError
+from ya_metrics_mcp.utils.serialization import validate_output_format
+from ya_metrics_mcp.utils.tracing import validate_tracing_mode
+
+
+def _optional_float(value: str | None) -> float | None:
+    return float(value) if value else None
+
+
+def _csv_tuple(value: str) -> tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+API_BASE = "https://api-metrika.yandex.net"
+DEFAULT_SYNC_METRICS = "ym:s:visits,ym:s:users,ym:s:pageviews,ym:s:bounceRate"
 
 
 @dataclass
 class YaMetrikaConfig:
     api_key: str
+    api_base: str = API_BASE
     timeout: int = 30
+    connect_timeout: float | None = None
+    read_timeout: float | None = None
+    pool_timeout: float | None = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    warmup: bool = True
     retries: int = 3
     retry_delay: float = 1.0
+    retry_max_delay: float = 30.0
+    retry_deadline: float = 60.0
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
     read_only: bool = False
     enabled_tools: list[str] | None = None
+    output_format: str = "pretty"
+    json_backend: str = "auto"
+    csv_metadata: bool = False
+    cache_max_entries: int = 512
+    cache_ttl: int = 300
+    cache_historical_ttl: int = 86400
+    report_stale_ttl: int = 900
+    metadata_ttl: int = 3600
+    metadata_stale_ttl: int = 86400
+    disk_cache_path: str | None = None
+    disk_cache_max_mb: int = 256
+    page_size: int = 10_000
+    pagination_concurrency: int = 4
+    shard_concurrency: int = 4
+    shard_max_requests: int = 100
+    batch_concurrency: int = 8
+    planner_window_ms: float = 5.0
+    logs_dir: str = "~/.cache/ya-metrics-mcp/logs"
+    logs_concurrency: int = 4
+    logs_poll_interval: float = 10.0
+    logs_wait_timeout: float = 600.0
+    sync_db_path: str = "~/.cache/ya-metrics-mcp/daily.sqlite"
+    sync_metrics: tuple[str, ...] = _csv_tuple(DEFAULT_SYNC_METRICS)
+    tracing: str = "memory"
+    trace_buffer: int = 100
+    rate_limit: float = 30.0
+    rate_limit_per_token: float = 10.0
+    rate_limit_per_counter: float = 5.0
 
     @classmethod
     def from_env(cls) -> "YaMetrikaConfig":
@@ -32,11 +87,76 @@ class YaMetrikaConfig:
         )
         return cls(
             api_key=api_key,
+            api_base=os.environ.get("YANDEX_API_BASE", API_BASE).rstrip("/"),
             timeout=int(os.environ.get("YANDEX_TIMEOUT", "30")),
+            connect_timeout=_optional_float(os.environ.get("YANDEX_CONNECT_TIMEOUT")),
+            read_timeout=_optional_float(os.environ.get("YANDEX_READ_TIMEOUT")),
+            pool_timeout=_optional_float(os.environ.get("YANDEX_POOL_TIMEOUT")),
+            max_connections=int(os.environ.get("YANDEX_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(
+                os.environ.get("YANDEX_MAX_KEEPALIVE_CONNECTIONS", "20")
+            ),
+            keepalive_expiry=float(os.environ.get("YANDEX_KEEPALIVE_EXPIRY", "30")),
+            http2=os.environ.get("YANDEX_HTTP2", "").lower() == "true",
+            warmup=os.environ.get("YANDEX_WARMUP", "true").lower() == "true",
             retries=int(os.environ.get("YANDEX_RETRIES", "3")),
             retry_delay=float(os.environ.get("YANDEX_RETRY_DELAY", "1.0")),
+            retry_max_delay=float(os.environ.get("YANDEX_RETRY_MAX_DELAY", "30")),
+            retry_deadline=float(os.environ.get("YANDEX_RETRY_DEADLINE", "60")),
+            circuit_failure_threshold=int(
+                os.environ.get("YANDEX_CIRCUIT_FAILURE_THRESHOLD", "5")
+            ),
+            circuit_reset_timeout=float(
+                os.environ.get("YANDEX_CIRCUIT_RESET_TIMEOUT", "30")
+            ),
             read_only=os.environ.get("READ_ONLY_MODE", "").lower() == "true",
             enabled_tools=enabled_tools,
+            output_format=validate_output_format(
+                os.environ.get("YANDEX_OUTPUT_FORMAT", "pretty")
+            ),
+            json_backend=os.environ.get("YANDEX_JSON_BACKEND", "auto"),
+            csv_metadata=os.environ.get("YANDEX_CSV_METADATA", "").lower() == "true",
+            cache_max_entries=int(os.environ.get("YANDEX_CACHE_MAX_ENTRIES", "512")),
+            cache_ttl=int(os.environ.get("YANDEX_CACHE_TTL", "300")),
+            cache_historical_ttl=int(
+                os.environ.get("YANDEX_CACHE_HISTORICAL_TTL", "86400")
+            ),
+            report_stale_ttl=int(os.environ.get("YANDEX_REPORT_STALE_TTL", "900")),
+            metadata_ttl=int(os.environ.get("YANDEX_METADATA_TTL", "3600")),
+            metadata_stale_ttl=int(
+                os.environ.get("YANDEX_METADATA_STALE_TTL", "86400")
+            ),
+            disk_cache_path=os.environ.get("YANDEX_DISK_CACHE_PATH") or None,
+            disk_cache_max_mb=int(os.environ.get("YANDEX_DISK_CACHE_MAX_MB", "256")),
+            page_size=int(os.environ.get("YANDEX_PAGE_SIZE", "10000")),
+            pagination_concurrency=int(
+                os.environ.get("YANDEX_PAGINATION_CONCURRENCY", "4")
+            ),
+            shard_concurrency=int(os.environ.get("YANDEX_SHARD_CONCURRENCY", "4")),
+            shard_max_requests=int(
+                os.environ.get("YANDEX_SHARD_MAX_REQUESTS", "100")
+            ),
+            batch_concurrency=int(os.environ.get("YANDEX_BATCH_CONCURRENCY", "8")),
+            planner_window_ms=float(os.environ.get("YANDEX_PLANNER_WINDOW_MS", "5")),
+            logs_dir=os.environ.get("YANDEX_LOGS_DIR", "~/.cache/ya-metrics-mcp/logs"),
+            logs_concurrency=int(os.environ.get("YANDEX_LOGS_CONCURRENCY", "4")),
+            logs_poll_interval=float(os.environ.get("YANDEX_LOGS_POLL_INTERVAL", "10")),
+            logs_wait_timeout=float(os.environ.get("YANDEX_LOGS_WAIT_TIMEOUT", "600")),
+            sync_db_path=os.environ.get(
+                "YANDEX_SYNC_DB_PATH", "~/.cache/ya-metrics-mcp/daily.sqlite"
+            ),
+            sync_metrics=_csv_tuple(
+                os.environ.get("YANDEX_SYNC_METRICS", DEFAULT_SYNC_METRICS)
+            ),
+            tracing=validate_tracing_mode(os.environ.get("YANDEX_TRACING", "memory")),
+            trace_buffer=int(os.environ.get("YANDEX_TRACE_BUFFER", "100")),
+            rate_limit=float(os.environ.get("YANDEX_RATE_LIMIT", "30")),
+            rate_limit_per_token=float(
+                os.environ.get("YANDEX_RATE_LIMIT_PER_TOKEN", "10")
+            ),
+            rate_limit_per_counter=float(
+                os.environ.get("YANDEX_RATE_LIMIT_PER_COUNTER", "5")
+            ),
         )
 
     def is_auth_configured(self) -> bool:
@@ -0,0 +1,155 @@
+"""Persistent SQLite-backed cache for Yandex Metrika API responses."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ya_metrics_mcp.metrika.cache import CacheStats
+
+logger = logging.getLogger("ya-metrics")
+
+CACHEABLE_PATH_PREFIXES = ("/stat/v1/data", "/management/v1/")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+def is_disk_cacheable(path: str) -> bool:
+    return path.startswith(CACHEABLE_PATH_PREFIXES)
+
+
+class DiskCache:
+    """Size-capped SQLite store with zlib-compressed JSON values.
+
+    The database can be shared by several server processes (e.g. one per stdio
+    session). When the total stored size exceeds ``max_bytes``, the least
+    recently accessed entries are evicted. Blocking SQLite and compression work is
+    run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=10, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get_sync(self, key: str) -> tuple[Any, float] | None:
+        """Return ``(value, remaining_ttl)`` for a live entry, or None."""
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.stats.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        self.stats.hits += 1
+        return json.loads(zlib.decompress(row[0])), row[1] - now
+
+    def set_sync(self, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        blob = zlib.compress(
+            json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+        )
+        if len(blob) > self.max_bytes:
+            return
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl, now),
+            )
+            self._evict_locked(now)
+
+    def _evict_locked(self, now: float) -> None:
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.stats.evictions += 1
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return int(
+                self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()[0]
+            )
+
+    async def get(self, key: str) -> tuple[Any, float] | None:
+        try:
+            return await asyncio.to_thread(self.get_sync, key)
+        except sqlite3.Error as exc:
+            logger.warning("Disk cache read failed: %s", exc)
+            return None
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            await asyncio.to_thread(self.set_sync, key, value, ttl)
+        except sqlite3.Error as exc:
+            logger.warning("Disk cache write failed: %s", exc)
+
+    def invalidate_sync(self, predicate: Callable[[str], bool]) -> int:
+        """Delete every entry whose key matches ``predicate``; return how many."""
+        with self._lock:
+            keys = [
+                key for (key,) in self._conn.execute("SELECT key FROM responses")
+                if predicate(key)
+            ]
+            self._conn.executemany(
+                "DELETE FROM responses WHERE key = ?", [(key,) for key in keys]
+            )
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
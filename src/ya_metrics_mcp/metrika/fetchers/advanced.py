@@ -1,13 +1,23 @@
 """Advanced and specialized analytics fetcher mixin."""
 from __future__ import annotations
 
-from ya_metrics_mcp.utils.date import validate_date
+import asyncio
+
+from ya_metrics_mcp.analysis.anomalies import DEFAULT_SEASON, detect_anomalies
+from ya_metrics_mcp.analysis.periods import align_periods, compared_metric_names
+from ya_metrics_mcp.metrika.fetchers.base import FetcherMixin
+from ya_metrics_mcp.utils.date import (
+    comparison_range,
+    default_date_range,
+    validate_date,
+)
 from ya_metrics_mcp.utils.decorators import handle_api_errors
+from ya_metrics_mcp.utils.optional import require_numpy
 
 _VALID_GROUPS = {"day", "week", "month", "quarter", "year"}
 
 
-class AdvancedMixin:
+class AdvancedMixin(FetcherMixin):
     @handle_api_errors()
     async def get_ecommerce_performance(
         self,
@@ -15,9 +25,11 @@ class AdvancedMixin:
         currency: str = "RUB",
         date_from: str | None = None,
         date_to: str | None = None,
+        max_rows: int | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from, date_to = validate_date(date_from), validate_date(date_to)
-        data = await self.client.get(
+        data = await self.fetch_report(
             "/stat/v1/data",
             {
                 "ids": counter_id,
@@ -25,8 +37,9 @@ class AdvancedMixin:
                 "metrics": f"ym:s:ecommercePurchases,ym:s:ecommerce{currency}ConvertedRevenue",
                 "date1": date_from, "date2": date_to,
             },
+            max_rows,
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_data_by_time(
@@ -39,6 +52,9 @@ class AdvancedMixin:
         group: str = "day",
         top_keys: int = 7,
         timezone: str | None = None,
+        shard: str | None = None,
+        derived: list[str] | None = None,
+        output_format: str | None = None,
     ) -> str:
         if len(metrics) > 20:
             raise ValueError("Maximum 20 metrics allowed")
@@ -49,7 +65,7 @@ class AdvancedMixin:
         if not 1 <= top_keys <= 30:
             raise ValueError("top_keys must be between 1 and 30")
         date_from, date_to = validate_date(date_from), validate_date(date_to)
-        data = await self.client.get(
+        data = await self.fetch_report(
             "/stat/v1/data/bytime",
             {
                 "ids": counter_id,
@@ -61,12 +77,75 @@ class AdvancedMixin:
                 "date2": date_to,
                 "timezone": timezone,
             },
+            shard=shard,
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format, derived)
+
+    @handle_api_errors()
+    async def detect_anomalies(
+        self,
+        counter_id: str,
+        metrics: list[str],
+        date_from: str | None = None,
+        date_to: str | None = None,
+        dimensions: list[str] | None = None,
+        group: str = "day",
+        top_keys: int = 7,
+        window: int = 7,
+        season: int | None = None,
+        threshold: float = 3.0,
+        max_points: int = 50,
+        output_format: str | None = None,
+    ) -> str:
+        if len(metrics) > 20:
+            raise ValueError("Maximum 20 metrics allowed")
+        if dimensions and len(dimensions) > 10:
+            raise ValueError("Maximum 10 dimensions allowed")
+        if group not in _VALID_GROUPS:
+            raise ValueError(f"group must be one of {_VALID_GROUPS}")
+        if not 1 <= top_keys <= 30:
+            raise ValueError("top_keys must be between 1 and 30")
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        require_numpy("Anomaly detection")
+        date_from, date_to = validate_date(date_from), validate_date(date_to)
+        if date_from is None and date_to is None:
+            date_from, date_to = default_date_range(days=90)
+        report = await self.fetch_report(
+            "/stat/v1/data/bytime",
+            {
+                "ids": counter_id,
+                "metrics": ",".join(metrics),
+                "dimensions": ",".join(dimensions) if dimensions else None,
+                "group": group,
+                "top_keys": top_keys,
+                "date1": date_from,
+                "date2": date_to,
+            },
+        )
+        if season is None:
+            season = DEFAULT_SEASON[group]
+        data = {
+            "query": {
+                "metrics": metrics,
+                "dimensions": dimensions or [],
+                "date1": date_from,
+                "date2": date_to,
+                "group": group,
+                "window": window,
+                "season": season,
+                "threshold": threshold,
+            },
+            **detect_anomalies(report, metrics, window, season, threshold, max_points),
+        }
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_yandex_direct_experiment(
-        self, counter_id: str, experiment_id: int
+        self,
+        counter_id: str,
+        experiment_id: int,
+        output_format: str | None = None,
     ) -> str:
         data = await self.client.get(
             "/stat/v1/data",
@@ -76,7 +155,7 @@ class AdvancedMixin:
                 "metrics": "ym:s:bounceRate",
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_drilldown(
@@ -88,6 +167,7 @@ class AdvancedMixin:
         date_from: str | None = None,
         date_to: str | None = None,
         limit: int | None = None,
+        output_format: str | None = None,
     ) -> str:
         data = await self.client.get(
             "/stat/v1/data/drilldown",
@@ -101,7 +181,7 @@ class AdvancedMixin:
                 "limit": limit,
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def compare_segments(
@@ -116,6 +196,7 @@ class AdvancedMixin:
         date_from: str | None = None,
         date_to: str | None = None,
         limit: int | None = None,
+        output_format: str | None = None,
     ) -> str:
         import json as _json
 
@@ -144,7 +225,7 @@ class AdvancedMixin:
                 "limit": limit,
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def compare_segments_drilldown(
@@ -160,6 +241,7 @@ class AdvancedMixin:
         date_from: str | None = None,
         date_to: str | None = None,
         limit: int | None = None,
+        output_format: str | None = None,
     ) -> str:
         import json as _json
 
@@ -185,12 +267,71 @@ class AdvancedMixin:
                 "limit": limit,
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
-    async def get_browsers_report(self, counter_id: str) -> str:
+    async def get_browsers_report(
+        self,
+        counter_id: str,
+        output_format: str | None = None,
+    ) -> str:
         data = await self.client.get(
             "/stat/v1/data",
             {"preset": "tech_platforms", "dimensions": "ym:s:browser", "id": counter_id},
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
+
+    @handle_api_errors()
+    async def compare_periods(
+        self,
+        counter_id: str,
+        metrics: list[str],
+        dimensions: list[str] | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        compare_to: str = "previous",
+        filters: str | None = None,
+        limit: int | None = None,
+        output_format: str | None = None,
+    ) -> str:
+        if not metrics or len(metrics) > 20:
+            raise ValueError("Between 1 and 20 metrics required")
+        if dimensions and len(dimensions) > 10:
+            raise ValueError("Maximum 10 dimensions allowed")
+        date_from, date_to = validate_date(date_from), validate_date(date_to)
+        if (date_from is None) != (date_to is None):
+            raise ValueError("Pass both date_from and date_to, or neither")
+        if date_from is None or date_to is None:
+            date_from, date_to = default_date_range(days=7)
+        compare_from, compare_to_date = comparison_range(date_from, date_to, compare_to)
+
+        params = {
+            "ids": counter_id,
+            "metrics": ",".join(metrics),
+            "dimensions": ",".join(dimensions) if dimensions else None,
+            "filters": filters,
+            "limit": limit,
+        }
+        # The earlier range has ended, so it is cached for YANDEX_CACHE_HISTORICAL_TTL.
+        current, previous = await asyncio.gather(
+            self.client.get(
+                "/stat/v1/data", {**params, "date1": date_from, "date2": date_to}
+            ),
+            self.client.get(
+                "/stat/v1/data",
+                {**params, "date1": compare_from, "date2": compare_to_date},
+            ),
+        )
+        data = {
+            "query": {
+                "dimensions": dimensions or [],
+                "metrics": compared_metric_names(metrics),
+                "date1": date_from,
+                "date2": date_to,
+                "compare_to": compare_to,
+                "compare_date1": compare_from,
+                "compare_date2": compare_to_date,
+            },
+            **align_periods(current, previous, metrics),
+        }
+        return self.format_response(data, output_format)
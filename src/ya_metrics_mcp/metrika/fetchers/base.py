@@ -1,15 +1,133 @@
 """Base fetcher class."""
 from __future__ import annotations
 
-import json
+from typing import TYPE_CHECKING, Any
 
+from ya_metrics_mcp.analysis.derived import add_derived
 from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.pagination import fetch_report_rows
+from ya_metrics_mcp.metrika.sharding import fetch_sharded
+from ya_metrics_mcp.utils.serialization import serialize
+from ya_metrics_mcp.utils.tracing import recent_traces, span
 
 
 class BaseFetcher:
     def __init__(self, client: YaMetrikaClient) -> None:
         self.client = client
 
-    def format_response(self, data: dict | list) -> str:
-        """Format API response as a pretty-printed JSON string."""
-        return json.dumps(data, ensure_ascii=False, indent=2)
+    async def fetch_report(
+        self,
+        path: str,
+        params: dict[str, Any],
+        max_rows: int | None = None,
+        shard: str | None = None,
+    ) -> dict[str, Any]:
+        """Fetch a report, reading across pages when max_rows is given.
+
+        ``max_rows=None`` keeps the API's single default page, ``0`` reads every
+        row, and a positive value reads the top N rows. ``shard`` ("day", "week"
+        or "month") splits the date range into chunks that are fetched in
+        parallel and merged.
+        """
+        config = self.client.config
+        if shard is not None:
+            return await fetch_sharded(
+                lambda shard_params, shard_rows: self.fetch_report(
+                    path, shard_params, shard_rows
+                ),
+                path,
+                params,
+                shard,
+                concurrency=config.shard_concurrency,
+                max_rows=max_rows,
+                page_size=config.page_size,
+                max_requests=config.shard_max_requests,
+            )
+        if max_rows is None:
+            return await self.client.get(path, params)
+        if max_rows < 0:
+            raise ValueError("max_rows must be 0 (all rows) or positive")
+        return await fetch_report_rows(
+            self.client,
+            path,
+            params,
+            max_rows=max_rows or None,
+            page_size=config.page_size,
+            concurrency=config.pagination_concurrency,
+        )
+
+    async def get_counter(self, counter_id: str) -> dict[str, Any]:
+        """Return a counter's settings from the (long-lived) metadata cache."""
+        data = await self.client.get(f"/management/v1/counter/{counter_id}", {})
+        counter: dict[str, Any] = data.get("counter", {})
+        return counter
+
+    async def get_counter_timezone(self, counter_id: str) -> str | None:
+        """Return the counter's time zone name, e.g. ``Europe/Moscow``."""
+        return (await self.get_counter(counter_id)).get("time_zone_name")
+
+    async def get_goal_ids(self, counter_id: str) -> list[int]:
+        """Return the IDs of the counter's goals from the metadata cache."""
+        data = await self.client.get(f"/management/v1/counter/{counter_id}/goals", {})
+        return [goal["id"] for goal in data.get("goals", [])]
+
+    def format_response(
+        self,
+        data: dict[str, Any] | list[Any],
+        output_format: str | None = None,
+        derived: list[str] | None = None,
+    ) -> str:
+        """Format API response as a JSON string.
+
+        ``output_format`` overrides the configured default (YANDEX_OUTPUT_FORMAT).
+        ``derived`` lists derived columns (see analysis.derived) to append first.
+        """
+        if derived:
+            if not isinstance(data, dict):
+                raise ValueError("Derived columns need a report response")
+            data = add_derived(data, derived)
+        config = self.client.config
+        output_format = output_format or config.output_format
+        with span("serialize", format=output_format) as current:
+            text = serialize(
+                data,
+                output_format,
+                backend=config.json_backend,
+                csv_metadata=config.csv_metadata,
+            )
+            current.set_attribute("response.size", len(text))
+        return text
+
+    async def get_client_stats(self, output_format: str | None = None) -> str:
+        """Return client runtime statistics (cache hits/misses, etc.)."""
+        return self.format_response(self.client.stats(), output_format)
+
+    async def invalidate_metadata_cache(
+        self,
+        counter_id: str | None = None,
+        output_format: str | None = None,
+    ) -> str:
+        """Drop cached counter/goal metadata so the next call refetches it."""
+        removed = self.client.invalidate_metadata(counter_id)
+        return self.format_response({"invalidated": removed}, output_format)
+
+    async def get_recent_traces(
+        self,
+        limit: int = 20,
+        min_duration_ms: float = 0,
+        output_format: str | None = None,
+    ) -> str:
+        """Return recent tool-call traces from the in-process trace buffer."""
+        data = {
+            "tracing": self.client.config.tracing,
+            "traces": recent_traces(limit, min_duration_ms),
+        }
+        return self.format_response(data, output_format)
+
+
+# Domain mixins subclass this so that type checkers see the BaseFetcher helpers
+# they call; at runtime it is plain ``object`` and BaseFetcher stays last in the MRO.
+if TYPE_CHECKING:
+    FetcherMixin = BaseFetcher
+else:
+    FetcherMixin = object
@@ -0,0 +1,85 @@
+"""Batch execution fetcher mixin."""
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from ya_metrics_mcp.exceptions import MCPYaMetrikaError
+from ya_metrics_mcp.metrika.fetchers.base import FetcherMixin
+from ya_metrics_mcp.utils.decorators import handle_api_errors
+
+MAX_BATCH_SIZE = 50
+
+# Read-only report methods that may be dispatched from batch_query.
+BATCHABLE_METHODS = frozenset({
+    "list_counters", "list_goals", "get_account_info", "get_visits",
+    "sources_summary", "sources_search_phrases", "get_traffic_sources_types",
+    "get_search_engines_data", "get_new_users_by_source",
+    "get_content_analytics_sources", "get_content_analytics_categories",
+    "get_content_analytics_authors", "get_content_analytics_topics",
+    "get_content_analytics_articles", "get_user_demographics",
+    "get_device_analysis", "get_mobile_vs_desktop", "get_page_depth_analysis",
+    "get_regional_data", "get_geographical_organic_traffic",
+    "get_page_performance", "get_goals_conversion",
+    "get_organic_search_performance", "get_conversion_rate_by_source_and_landing",
+    "get_ecommerce_performance", "get_data_by_time", "detect_anomalies",
+    "get_yandex_direct_experiment",
+    "get_browsers_report", "get_drilldown", "compare_segments", "compare_periods",
+    "compare_segments_drilldown", "get_counters_report", "get_daily_series",
+})
+
+_JSON_FORMATS = {"pretty", "compact", "table"}
+
+
+class BatchMixin(FetcherMixin):
+    """Mixin that runs several report methods concurrently in one call.
+
+    Requires the report methods of the other mixins and self.format_response().
+    """
+
+    async def _run_batch_item(
+        self, semaphore: asyncio.Semaphore, item: dict[str, Any]
+    ) -> dict[str, Any]:
+        if not isinstance(item, Mapping):
+            return {"tool": None, "error": "Each query must be an object"}
+        tool = item.get("tool", "")
+        if tool not in BATCHABLE_METHODS:
+            return {"tool": tool, "error": f"Unknown or non-batchable tool: {tool!r}"}
+        raw_arguments = item.get("arguments") or {}
+        if not isinstance(raw_arguments, Mapping):
+            return {"tool": tool, "error": "arguments must be an object"}
+        arguments = dict(raw_arguments)
+        if arguments.get("output_format") is None:
+            arguments["output_format"] = "compact"
+        output_format = arguments["output_format"]
+        try:
+            async with semaphore:
+                text = await getattr(self, tool)(**arguments)
+        except MCPYaMetrikaError as exc:
+            return {"tool": tool, "error": str(exc)}
+        except TypeError as exc:
+            # Report methods wrap their own errors, so this is a bad argument list.
+            return {"tool": tool, "error": f"Invalid arguments: {exc}"}
+        result = json.loads(text) if output_format in _JSON_FORMATS else text
+        return {"tool": tool, "result": result}
+
+    @handle_api_errors()
+    async def batch_query(
+        self,
+        queries: list[dict[str, Any]],
+        output_format: str | None = None,
+    ) -> str:
+        if not queries:
+            raise ValueError("queries must not be empty")
+        if len(queries) > MAX_BATCH_SIZE:
+            raise ValueError(f"Maximum {MAX_BATCH_SIZE} queries per batch")
+        semaphore = asyncio.Semaphore(max(1, self.client.config.batch_concurrency))
+        results = await asyncio.gather(
+            *(self._run_batch_item(semaphore, item) for item in queries)
+        )
+        return self.format_response(
+            {"results": results, "failed": sum("error" in r for r in results)},
+            output_format,
+        )
@@ -1,14 +1,19 @@
 """Content (publishers) analytics fetcher mixin."""
 from __future__ import annotations
 
+from ya_metrics_mcp.metrika.fetchers.base import FetcherMixin
 from ya_metrics_mcp.utils.date import validate_date
 from ya_metrics_mcp.utils.decorators import handle_api_errors
 
 
-class ContentMixin:
+class ContentMixin(FetcherMixin):
     @handle_api_errors()
     async def get_content_analytics_sources(
-        self, counter_id: str, date_from: str | None = None, date_to: str | None = None
+        self,
+        counter_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from = validate_date(date_from)
         date_to = validate_date(date_to)
@@ -16,11 +21,15 @@ class ContentMixin:
             "/stat/v1/data",
             {"preset": "publishers_sources", "id": counter_id, "date1": date_from, "date2": date_to},
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_content_analytics_categories(
-        self, counter_id: str, date_from: str | None = None, date_to: str | None = None
+        self,
+        counter_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from = validate_date(date_from)
         date_to = validate_date(date_to)
@@ -28,11 +37,15 @@ class ContentMixin:
             "/stat/v1/data",
             {"preset": "publishers_rubrics", "id": counter_id, "date1": date_from, "date2": date_to},
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_content_analytics_authors(
-        self, counter_id: str, date_from: str | None = None, date_to: str | None = None
+        self,
+        counter_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from = validate_date(date_from)
         date_to = validate_date(date_to)
@@ -40,11 +53,15 @@ class ContentMixin:
             "/stat/v1/data",
             {"preset": "publishers_authors", "id": counter_id, "date1": date_from, "date2": date_to},
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_content_analytics_topics(
-        self, counter_id: str, date_from: str | None = None, date_to: str | None = None
+        self,
+        counter_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from = validate_date(date_from)
         date_to = validate_date(date_to)
@@ -52,15 +69,20 @@ class ContentMixin:
             "/stat/v1/data",
             {"preset": "publishers_thematics", "id": counter_id, "date1": date_from, "date2": date_to},
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_content_analytics_articles(
-        self, counter_id: str, date_from: str | None = None, date_to: str | None = None
+        self,
+        counter_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        max_rows: int | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from = validate_date(date_from)
         date_to = validate_date(date_to)
-        data = await self.client.get(
+        data = await self.fetch_report(
             "/stat/v1/data",
             {
                 "ids": counter_id,
@@ -71,5 +93,6 @@ class ContentMixin:
                 "date1": date_from,
                 "date2": date_to,
             },
+            max_rows,
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
@@ -1,14 +1,19 @@
 """User demographics and device analytics fetcher mixin."""
 from __future__ import annotations
 
+from ya_metrics_mcp.metrika.fetchers.base import FetcherMixin
 from ya_metrics_mcp.utils.date import validate_date
 from ya_metrics_mcp.utils.decorators import handle_api_errors
 
 
-class DemographicsMixin:
+class DemographicsMixin(FetcherMixin):
     @handle_api_errors()
     async def get_user_demographics(
-        self, counter_id: str, date_from: str | None = None, date_to: str | None = None
+        self,
+        counter_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from, date_to = validate_date(date_from), validate_date(date_to)
         data = await self.client.get(
@@ -20,11 +25,15 @@ class DemographicsMixin:
                 "date1": date_from, "date2": date_to,
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_device_analysis(
-        self, counter_id: str, date_from: str | None = None, date_to: str | None = None
+        self,
+        counter_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from, date_to = validate_date(date_from), validate_date(date_to)
         data = await self.client.get(
@@ -36,11 +45,15 @@ class DemographicsMixin:
                 "date1": date_from, "date2": date_to,
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_mobile_vs_desktop(
-        self, counter_id: str, date_from: str | None = None, date_to: str | None = None
+        self,
+        counter_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from, date_to = validate_date(date_from), validate_date(date_to)
         data = await self.client.get(
@@ -52,11 +65,14 @@ class DemographicsMixin:
                 "date1": date_from, "date2": date_to,
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_page_depth_analysis(
-        self, counter_id: str, min_pages: int = 5
+        self,
+        counter_id: str,
+        min_pages: int = 5,
+        output_format: str | None = None,
     ) -> str:
         data = await self.client.get(
             "/stat/v1/data",
@@ -66,4 +82,4 @@ class DemographicsMixin:
                 "filters": f"ym:s:pageViews>{min_pages}",
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
@@ -1,10 +1,14 @@
 """Composite fetcher combining all domain mixins."""
 from ya_metrics_mcp.metrika.fetchers.advanced import AdvancedMixin
 from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher
+from ya_metrics_mcp.metrika.fetchers.batch import BatchMixin
 from ya_metrics_mcp.metrika.fetchers.content import ContentMixin
 from ya_metrics_mcp.metrika.fetchers.demographics import DemographicsMixin
 from ya_metrics_mcp.metrika.fetchers.geographic import GeographicMixin
+from ya_metrics_mcp.metrika.fetchers.logs import LogsMixin
 from ya_metrics_mcp.metrika.fetchers.performance import PerformanceMixin
+from ya_metrics_mcp.metrika.fetchers.portfolio import PortfolioMixin
+from ya_metrics_mcp.metrika.fetchers.sync import SyncMixin
 from ya_metrics_mcp.metrika.fetchers.traffic import TrafficMixin
 
 
@@ -15,6 +19,10 @@ class YaMetrikaFetcher(
     GeographicMixin,
     PerformanceMixin,
     AdvancedMixin,
+    BatchMixin,
+    PortfolioMixin,
+    LogsMixin,
+    SyncMixin,
     BaseFetcher,
 ):
     """Full Yandex Metrika fetcher with all analytics capabilities."""
@@ -1,16 +1,19 @@
 """Geographic analytics fetcher mixin."""
 from __future__ import annotations
 
+from ya_metrics_mcp.metrika.fetchers.base import FetcherMixin
 from ya_metrics_mcp.utils.date import validate_date
 from ya_metrics_mcp.utils.decorators import handle_api_errors
 
 
-class GeographicMixin:
+class GeographicMixin(FetcherMixin):
     @handle_api_errors()
     async def get_regional_data(
         self,
         counter_id: str,
         cities: list[str] | None = None,
+        derived: list[str] | None = None,
+        output_format: str | None = None,
     ) -> str:
         if cities is None:
             cities = ["Москва", "Санкт-Петербург"]
@@ -24,7 +27,7 @@ class GeographicMixin:
                 "filters": f"ym:s:regionCityName=.({city_filter})",
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format, derived)
 
     @handle_api_errors()
     async def get_geographical_organic_traffic(
@@ -32,6 +35,7 @@ class GeographicMixin:
         counter_id: str,
         date_from: str | None = None,
         date_to: str | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from, date_to = validate_date(date_from), validate_date(date_to)
         data = await self.client.get(
@@ -44,4 +48,4 @@ class GeographicMixin:
                 "date1": date_from, "date2": date_to,
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
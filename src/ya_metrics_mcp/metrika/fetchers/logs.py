@@ -0,0 +1,160 @@
+"""Logs API fetcher mixin."""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from ya_metrics_mcp.metrika.fetchers.base import FetcherMixin
+from ya_metrics_mcp.metrika.logs import (
+    LOG_SOURCES,
+    MANIFEST_NAME,
+    clean_log_request,
+    create_log_request,
+    download_log_parts,
+    export_key,
+    load_manifest,
+    save_manifest,
+    wait_for_log_request,
+)
+from ya_metrics_mcp.store.columnar import COLUMNS_DIR, ColumnStore, query_store
+from ya_metrics_mcp.utils.date import validate_date
+from ya_metrics_mcp.utils.decorators import handle_api_errors
+from ya_metrics_mcp.utils.optional import require_numpy
+
+
+class LogsMixin(FetcherMixin):
+    """Mixin for raw visit/hit exports through the Logs API.
+
+    Requires self.client (YaMetrikaClient) and self.format_response().
+    """
+
+    @handle_api_errors()
+    async def export_logs(
+        self,
+        counter_id: str,
+        date_from: str,
+        date_to: str,
+        fields: list[str],
+        source: str = "visits",
+        wait_timeout: float | None = None,
+        clean_after: bool = True,
+        output_format: str | None = None,
+    ) -> str:
+        start, end = validate_date(date_from), validate_date(date_to)
+        if not start or not end:
+            raise ValueError("date_from and date_to are required")
+        date_from, date_to = start, end
+        if source not in LOG_SOURCES:
+            raise ValueError(f"source must be one of {LOG_SOURCES}")
+        if not fields:
+            raise ValueError("At least one field is required")
+        config = self.client.config
+        directory = (
+            Path(config.logs_dir).expanduser()
+            / str(counter_id)
+            / export_key(counter_id, date_from, date_to, fields, source)
+        )
+
+        # An existing manifest means an earlier call created the request: resume it.
+        manifest = load_manifest(directory)
+        if manifest is None:
+            info = await create_log_request(
+                self.client, counter_id, date_from, date_to, fields, source
+            )
+            manifest = {
+                "counter_id": str(counter_id),
+                "request_id": info["request_id"],
+                "date1": date_from,
+                "date2": date_to,
+                "source": source,
+                "fields": fields,
+                "status": "created",
+            }
+            save_manifest(directory, manifest)
+
+        if manifest["status"] != "downloaded":
+            if manifest["status"] == "created":
+                info = await wait_for_log_request(
+                    self.client,
+                    counter_id,
+                    manifest["request_id"],
+                    poll_interval=config.logs_poll_interval,
+                    timeout=wait_timeout
+                    if wait_timeout is not None
+                    else config.logs_wait_timeout,
+                )
+                manifest.update(status="processed", parts=info.get("parts", []))
+                save_manifest(directory, manifest)
+            manifest["files"] = await download_log_parts(
+                self.client,
+                counter_id,
+                manifest["request_id"],
+                manifest["parts"],
+                directory,
+                concurrency=config.logs_concurrency,
+            )
+            manifest["status"] = "downloaded"
+            save_manifest(directory, manifest)
+            if clean_after:
+                await clean_log_request(self.client, counter_id, manifest["request_id"])
+
+        return self.format_response(
+            {
+                "export_id": f"{directory.parent.name}/{directory.name}",
+                "directory": str(directory),
+                **manifest,
+                "total_bytes": sum(f["bytes"] for f in manifest.get("files", [])),
+            },
+            output_format,
+        )
+
+    def _export_dir(self, export_id: str) -> Path:
+        root = Path(self.client.config.logs_dir).expanduser().resolve()
+        directory = (root / export_id).resolve()
+        if root not in directory.parents or not (directory / MANIFEST_NAME).exists():
+            raise ValueError(f"Unknown log export {export_id!r}; see list_log_exports")
+        return directory
+
+    @handle_api_errors()
+    async def list_log_exports(self, output_format: str | None = None) -> str:
+        root = Path(self.client.config.logs_dir).expanduser()
+        exports: list[dict[str, Any]] = []
+        for manifest_path in sorted(root.glob(f"*/*/{MANIFEST_NAME}")):
+            directory = manifest_path.parent
+            manifest = load_manifest(directory) or {}
+            exports.append({
+                "export_id": f"{directory.parent.name}/{directory.name}",
+                "counter_id": manifest.get("counter_id"),
+                "date1": manifest.get("date1"),
+                "date2": manifest.get("date2"),
+                "source": manifest.get("source"),
+                "fields": manifest.get("fields"),
+                "status": manifest.get("status"),
+                "columnar": (directory / COLUMNS_DIR).exists(),
+            })
+        return self.format_response({"exports": exports}, output_format)
+
+    @handle_api_errors()
+    async def query_logs(
+        self,
+        export_id: str,
+        group_by: list[str] | None = None,
+        aggregates: list[str] | None = None,
+        filters: list[str] | None = None,
+        order_by: str | None = None,
+        limit: int = 100,
+        output_format: str | None = None,
+    ) -> str:
+        require_numpy()
+        directory = self._export_dir(export_id)
+        if (load_manifest(directory) or {}).get("status") != "downloaded":
+            raise ValueError(f"Log export {export_id!r} is not fully downloaded yet")
+
+        def run() -> dict[str, Any]:
+            # The first query converts the TSV parts; later ones memory-map the columns.
+            store = ColumnStore.open(directory)
+            return query_store(store, group_by, aggregates, filters, order_by, limit)
+
+        data = await asyncio.to_thread(run)
+        return self.format_response(data, output_format)
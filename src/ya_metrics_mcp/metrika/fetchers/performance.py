@@ -1,17 +1,25 @@
 """Performance and conversion analytics fetcher mixin."""
 from __future__ import annotations
 
+from ya_metrics_mcp.metrika.fetchers.base import FetcherMixin
 from ya_metrics_mcp.utils.date import validate_date
 from ya_metrics_mcp.utils.decorators import handle_api_errors
 
 
-class PerformanceMixin:
+class PerformanceMixin(FetcherMixin):
     @handle_api_errors()
     async def get_page_performance(
-        self, counter_id: str, date_from: str | None = None, date_to: str | None = None
+        self,
+        counter_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        max_rows: int | None = None,
+        shard: str | None = None,
+        derived: list[str] | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from, date_to = validate_date(date_from), validate_date(date_to)
-        data = await self.client.get(
+        data = await self.fetch_report(
             "/stat/v1/data",
             {
                 "ids": counter_id,
@@ -19,13 +27,23 @@ class PerformanceMixin:
                 "metrics": "ym:s:pageviews,ym:s:bounceRate,ym:s:avgVisitDurationSeconds",
                 "date1": date_from, "date2": date_to,
             },
+            max_rows,
+            shard,
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format, derived)
 
     @handle_api_errors()
     async def get_goals_conversion(
-        self, counter_id: str, goal_ids: list[int]
+        self,
+        counter_id: str,
+        goal_ids: list[int] | None = None,
+        output_format: str | None = None,
     ) -> str:
+        if not goal_ids:
+            # Metrika allows 20 metrics per request, one of which is users.
+            goal_ids = (await self.get_goal_ids(counter_id))[:19]
+            if not goal_ids:
+                raise ValueError(f"Counter {counter_id} has no goals")
         goal_metrics = ",".join(
             f"ym:s:goal{gid}conversionRate" for gid in goal_ids
         )
@@ -36,14 +54,19 @@ class PerformanceMixin:
                 "metrics": f"ym:s:users,{goal_metrics}",
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_organic_search_performance(
-        self, counter_id: str, date_from: str | None = None, date_to: str | None = None
+        self,
+        counter_id: str,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        max_rows: int | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from, date_to = validate_date(date_from), validate_date(date_to)
-        data = await self.client.get(
+        data = await self.fetch_report(
             "/stat/v1/data",
             {
                 "ids": counter_id,
@@ -52,8 +75,9 @@ class PerformanceMixin:
                 "filters": "ym:s:trafficSource=='organic'",
                 "date1": date_from, "date2": date_to,
             },
+            max_rows,
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_conversion_rate_by_source_and_landing(
@@ -62,9 +86,11 @@ class PerformanceMixin:
         goal_id: int,
         date_from: str | None = None,
         date_to: str | None = None,
+        max_rows: int | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from, date_to = validate_date(date_from), validate_date(date_to)
-        data = await self.client.get(
+        data = await self.fetch_report(
             "/stat/v1/data",
             {
                 "ids": counter_id,
@@ -72,5 +98,6 @@ class PerformanceMixin:
                 "metrics": f"ym:s:visits,ym:s:goal{goal_id}conversionRate",
                 "date1": date_from, "date2": date_to,
             },
+            max_rows,
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
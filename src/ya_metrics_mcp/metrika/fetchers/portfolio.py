@@ -0,0 +1,136 @@
+"""Multi-counter (portfolio) fetcher mixin."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from ya_metrics_mcp.exceptions import MCPYaMetrikaError
+from ya_metrics_mcp.metrika.fetchers.base import FetcherMixin
+from ya_metrics_mcp.metrika.sharding import merge_metric_values, metric_kind
+from ya_metrics_mcp.utils.date import default_date_range, validate_date
+from ya_metrics_mcp.utils.decorators import handle_api_errors
+
+# Largest page the management API returns for /management/v1/counters.
+_COUNTERS_PAGE_SIZE = 1000
+MAX_FANOUT_COUNTERS = 1000
+
+
+class PortfolioMixin(FetcherMixin):
+    """Mixin that runs one report across many counters and merges the results.
+
+    Metrika aggregates all counters passed in ``ids`` into a single result, so
+    per-counter figures need one request per counter; these are issued
+    concurrently (bounded by ``batch_concurrency``) and merged into one table
+    whose first dimension is the counter.
+
+    Requires self.client (YaMetrikaClient) and self.format_response().
+    """
+
+    async def _resolve_counters(
+        self, search: str | None, counter_ids: list[str] | None
+    ) -> list[dict[str, Any]]:
+        if counter_ids:
+            return [{"id": str(cid), "name": None} for cid in counter_ids]
+        counters: list[dict[str, Any]] = []
+        offset = 1
+        while True:
+            page = await self.client.get(
+                "/management/v1/counters",
+                {"per_page": _COUNTERS_PAGE_SIZE, "offset": offset, "search": search},
+            )
+            batch = page.get("counters", [])
+            counters.extend(
+                {"id": str(c["id"]), "name": c.get("name") or c.get("site")}
+                for c in batch
+            )
+            offset += len(batch)
+            if not batch or offset > int(page.get("rows", 0)):
+                return counters
+
+    @handle_api_errors()
+    async def get_counters_report(
+        self,
+        metrics: list[str],
+        dimensions: list[str] | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        search: str | None = None,
+        counter_ids: list[str] | None = None,
+        limit: int | None = None,
+        derived: list[str] | None = None,
+        output_format: str | None = None,
+    ) -> str:
+        if not metrics or len(metrics) > 20:
+            raise ValueError("Between 1 and 20 metrics required")
+        if dimensions and len(dimensions) > 9:
+            raise ValueError(
+                "Maximum 9 dimensions allowed (the counter is added as the first)"
+            )
+        date_from, date_to = validate_date(date_from), validate_date(date_to)
+        if date_from is None and date_to is None:
+            date_from, date_to = default_date_range(days=7)
+
+        counters = await self._resolve_counters(search, counter_ids)
+        if len(counters) > MAX_FANOUT_COUNTERS:
+            raise ValueError(
+                f"{len(counters)} counters matched; narrow the search "
+                f"(max {MAX_FANOUT_COUNTERS})"
+            )
+        semaphore = asyncio.Semaphore(max(1, self.client.config.batch_concurrency))
+
+        async def fetch(counter: dict[str, Any]) -> dict[str, Any] | MCPYaMetrikaError:
+            async with semaphore:
+                try:
+                    return await self.client.get(
+                        "/stat/v1/data",
+                        {
+                            "ids": counter["id"],
+                            "metrics": ",".join(metrics),
+                            "dimensions": ",".join(dimensions) if dimensions else None,
+                            "date1": date_from,
+                            "date2": date_to,
+                            "limit": limit,
+                        },
+                    )
+                except MCPYaMetrikaError as exc:
+                    return exc
+
+        reports = await asyncio.gather(*(fetch(c) for c in counters))
+
+        rows: list[dict[str, Any]] = []
+        totals: list[list[float | None]] = []
+        errors: list[dict[str, str]] = []
+        for counter, report in zip(counters, reports, strict=True):
+            if isinstance(report, MCPYaMetrikaError):
+                errors.append({"counter_id": counter["id"], "error": str(report)})
+                continue
+            node = {"id": counter["id"], "name": counter["name"] or counter["id"]}
+            for row in report.get("data", []):
+                rows.append(
+                    {
+                        "dimensions": [node, *row.get("dimensions", [])],
+                        "metrics": row["metrics"],
+                    }
+                )
+            if "totals" in report:
+                totals.append(report["totals"])
+
+        data: dict[str, Any] = {
+            "query": {
+                "dimensions": ["counter", *(dimensions or [])],
+                "metrics": metrics,
+                "date1": date_from,
+                "date2": date_to,
+            },
+            "data": rows,
+            "total_rows": len(rows),
+            "counters": len(counters),
+        }
+        if totals:
+            # Distinct counts (users) summed across counters are an upper bound.
+            data["totals"] = merge_metric_values(
+                totals, metrics, [metric_kind(m) for m in metrics]
+            )
+        if errors:
+            data["errors"] = errors
+        return self.format_response(data, output_format, derived)
@@ -0,0 +1,119 @@
+"""Incremental daily aggregate sync fetcher mixin."""
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from ya_metrics_mcp.metrika.fetchers.base import FetcherMixin
+from ya_metrics_mcp.store.daily import (
+    bytime_to_daily,
+    daily_report,
+    dims_key,
+    missing_ranges,
+    series_key,
+)
+from ya_metrics_mcp.utils.decorators import handle_api_errors
+
+# Metrika keeps per-day data for a bit over 3 years; longer windows are refused.
+MAX_SYNC_DAYS = 1100
+# Dimension combinations (by volume over the fetched range) kept per series.
+TOP_KEYS = 30
+
+
+def top_keys_changed(report: dict[str, Any], stored: set[str]) -> bool:
+    """Whether a fetched bytime report ranks a different top set than the store.
+
+    A report that returned every combination may lack stored ones that had no
+    traffic in its range; one cut at ``top_keys`` must match the stored set.
+    """
+    keys = {dims_key(row.get("dimensions", [])) for row in report.get("data", [])}
+    truncated = report.get("total_rows", len(keys)) > len(keys)
+    return not keys <= stored or (truncated and keys != stored)
+
+
+class SyncMixin(FetcherMixin):
+    """Mixin for daily series served from a local store, fetching only new days.
+
+    Requires self.client (YaMetrikaClient), self.get_counter_timezone() and
+    self.format_response().
+    """
+
+    async def _counter_today(self, counter_id: str) -> date:
+        """Today's date in the counter's time zone, which is how Metrika splits days."""
+        name = await self.get_counter_timezone(counter_id)
+        try:
+            return datetime.now(ZoneInfo(name)).date() if name else date.today()
+        except ZoneInfoNotFoundError:
+            return date.today()
+
+    @handle_api_errors()
+    async def get_daily_series(
+        self,
+        counter_id: str,
+        days: int = 30,
+        metrics: list[str] | None = None,
+        dimensions: list[str] | None = None,
+        derived: list[str] | None = None,
+        output_format: str | None = None,
+    ) -> str:
+        if not 1 <= days <= MAX_SYNC_DAYS:
+            raise ValueError(f"days must be between 1 and {MAX_SYNC_DAYS}")
+        metrics = list(metrics or self.client.config.sync_metrics)
+        dimensions = list(dimensions or [])
+        if len(metrics) > 20:
+            raise ValueError("Maximum 20 metrics allowed")
+        if len(dimensions) > 10:
+            raise ValueError("Maximum 10 dimensions allowed")
+
+        store = self.client.daily_store
+        series = series_key(metrics, dimensions)
+        today = await self._counter_today(counter_id)
+        start = today - timedelta(days=days - 1)
+        synced = await store.synced_range(counter_id, series)
+        ranges = missing_ranges(start, today, synced)
+
+        async def fetch(first: date, last: date) -> dict[str, Any]:
+            return await self.client.get(
+                "/stat/v1/data/bytime",
+                {
+                    "ids": counter_id,
+                    "metrics": ",".join(metrics),
+                    "dimensions": ",".join(dimensions) if dimensions else None,
+                    "group": "day",
+                    "top_keys": TOP_KEYS if dimensions else None,
+                    "date1": first.isoformat(),
+                    "date2": last.isoformat(),
+                },
+                # Rows are stored as fresh, so never fill the store from a cached
+                # (possibly stale-while-revalidate) response.
+                cache=False,
+            )
+
+        reports = await asyncio.gather(*(fetch(first, last) for first, last in ranges))
+        full_refresh = False
+        if dimensions and synced is not None:
+            stored = await store.keys(counter_id, series)
+            if any(top_keys_changed(report, stored) for report in reports):
+                # Each fetch picks its own top combinations; refetch the whole
+                # stored span so that every day covers the same ones.
+                full_refresh = True
+                ranges = [(min(start, synced[0]), today)]
+                reports = [await fetch(*ranges[0])]
+        for (first, last), report in zip(ranges, reports, strict=True):
+            await store.store_range(
+                counter_id, series, first, last, bytime_to_daily(report)
+            )
+        rows = await store.read(counter_id, series, start, today)
+        data = daily_report(rows, start, today, metrics, dimensions)
+        data["sync"] = {
+            "fetched_ranges": [
+                [first.isoformat(), last.isoformat()] for first, last in ranges
+            ],
+            "fetched_days": sum((last - first).days + 1 for first, last in ranges),
+            "window_days": days,
+            "full_refresh": full_refresh,
+            "high_water": today.isoformat(),
+        }
+        return self.format_response(data, output_format, derived)
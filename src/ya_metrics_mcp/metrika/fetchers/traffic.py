@@ -1,20 +1,25 @@
 """Traffic and sources analytics fetcher mixin."""
 from __future__ import annotations
 
+from ya_metrics_mcp.metrika.fetchers.base import FetcherMixin
 from ya_metrics_mcp.utils.date import default_date_range, validate_date
 from ya_metrics_mcp.utils.decorators import handle_api_errors
 
 
-class TrafficMixin:
+class TrafficMixin(FetcherMixin):
     """Mixin for traffic sources and basic visit analytics.
 
     Requires self.client (YaMetrikaClient) and self.format_response() from BaseFetcher.
     """
 
     @handle_api_errors()
-    async def get_account_info(self, counter_id: str) -> str:
+    async def get_account_info(
+        self,
+        counter_id: str,
+        output_format: str | None = None,
+    ) -> str:
         data = await self.client.get(f"/management/v1/counter/{counter_id}", {})
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_visits(
@@ -22,12 +27,14 @@ class TrafficMixin:
         counter_id: str,
         date_from: str | None = None,
         date_to: str | None = None,
+        shard: str | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from = validate_date(date_from)
         date_to = validate_date(date_to)
         if date_from is None and date_to is None:
             date_from, date_to = default_date_range(days=7)
-        data = await self.client.get(
+        data = await self.fetch_report(
             "/stat/v1/data",
             {
                 "ids": counter_id,
@@ -35,27 +42,40 @@ class TrafficMixin:
                 "date1": date_from,
                 "date2": date_to,
             },
+            shard=shard,
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
-    async def sources_summary(self, counter_id: str) -> str:
+    async def sources_summary(
+        self,
+        counter_id: str,
+        output_format: str | None = None,
+    ) -> str:
         data = await self.client.get(
             "/stat/v1/data",
             {"preset": "sources_summary", "id": counter_id},
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
-    async def sources_search_phrases(self, counter_id: str) -> str:
+    async def sources_search_phrases(
+        self,
+        counter_id: str,
+        output_format: str | None = None,
+    ) -> str:
         data = await self.client.get(
             "/stat/v1/data",
             {"preset": "sources_search_phrases", "id": counter_id},
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
-    async def get_traffic_sources_types(self, counter_id: str) -> str:
+    async def get_traffic_sources_types(
+        self,
+        counter_id: str,
+        output_format: str | None = None,
+    ) -> str:
         data = await self.client.get(
             "/stat/v1/data",
             {
@@ -64,7 +84,7 @@ class TrafficMixin:
                 "metrics": "ym:s:visits,ym:s:users",
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_search_engines_data(
@@ -72,6 +92,7 @@ class TrafficMixin:
         counter_id: str,
         exclude_robots: bool = False,
         new_users_only: bool = False,
+        output_format: str | None = None,
     ) -> str:
         filters = ["ym:s:trafficSource=='organic'"]
         if exclude_robots:
@@ -87,21 +108,26 @@ class TrafficMixin:
                 "filters": " AND ".join(filters),
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
-    async def list_goals(self, counter_id: str) -> str:
+    async def list_goals(
+        self,
+        counter_id: str,
+        output_format: str | None = None,
+    ) -> str:
         data = await self.client.get(
             f"/management/v1/counter/{counter_id}/goals",
             {},
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def list_counters(
         self,
         search: str | None = None,
         per_page: int = 100,
+        output_format: str | None = None,
     ) -> str:
         data = await self.client.get(
             "/management/v1/counters",
@@ -110,7 +136,7 @@ class TrafficMixin:
                 "search": search,
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
 
     @handle_api_errors()
     async def get_new_users_by_source(
@@ -118,6 +144,7 @@ class TrafficMixin:
         counter_id: str,
         date_from: str | None = None,
         date_to: str | None = None,
+        output_format: str | None = None,
     ) -> str:
         date_from = validate_date(date_from)
         date_to = validate_date(date_to)
@@ -133,4 +160,4 @@ class TrafficMixin:
                 "date2": date_to,
             },
         )
-        return self.format_response(data)
+        return self.format_response(data, output_format)
@@ -0,0 +1,155 @@
+"""Logs API export: create a log request, wait for it and download its parts."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ya_metrics_mcp.exceptions import MCPYaMetrikaError
+
+if TYPE_CHECKING:
+    from ya_metrics_mcp.metrika.client import YaMetrikaClient
+
+logger = logging.getLogger("ya-metrics")
+
+LOG_SOURCES = ("visits", "hits")
+MANIFEST_NAME = "manifest.json"
+_FAILED_STATUSES = {
+    "canceled",
+    "processing_failed",
+    "cleaned_by_user",
+    "cleaned_automatically_as_too_old",
+}
+
+
+def export_key(
+    counter_id: str, date1: str, date2: str, fields: list[str], source: str
+) -> str:
+    """Stable directory name for an export, so a repeated call resumes it."""
+    raw = "|".join([str(counter_id), date1, date2, source, ",".join(fields)])
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def load_manifest(directory: Path) -> dict[str, Any] | None:
+    path = directory / MANIFEST_NAME
+    if not path.exists():
+        return None
+    manifest: dict[str, Any] = json.loads(path.read_text())
+    return manifest
+
+
+def save_manifest(directory: Path, manifest: dict[str, Any]) -> None:
+    """Write the manifest atomically so an interruption never leaves it truncated."""
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2))
+    tmp.replace(directory / MANIFEST_NAME)
+
+
+def _counter_path(counter_id: str) -> str:
+    return f"/management/v1/counter/{counter_id}"
+
+
+async def create_log_request(
+    client: YaMetrikaClient,
+    counter_id: str,
+    date1: str,
+    date2: str,
+    fields: list[str],
+    source: str,
+) -> dict[str, Any]:
+    """Evaluate and create a log request; return Metrika's ``log_request`` object."""
+    params: dict[str, str | int | None] = {
+        "date1": date1,
+        "date2": date2,
+        "fields": ",".join(fields),
+        "source": source,
+    }
+    base = _counter_path(counter_id)
+    evaluation = (
+        await client.get(f"{base}/logrequests/evaluate", params, cache=False)
+    ).get("log_request_evaluation", {})
+    if not evaluation.get("possible", False):
+        raise MCPYaMetrikaError(
+            "Log request is not possible for this range; at most "
+            f"{evaluation.get('max_possible_day_quantity', 0)} days can be exported now"
+        )
+    response = await client.post(f"{base}/logrequests", params)
+    created: dict[str, Any] = response["log_request"]
+    return created
+
+
+async def wait_for_log_request(
+    client: YaMetrikaClient,
+    counter_id: str,
+    request_id: int,
+    poll_interval: float,
+    timeout: float,
+) -> dict[str, Any]:
+    """Poll a log request until it is processed; return its ``log_request`` object."""
+    deadline = time.monotonic() + timeout
+    path = f"{_counter_path(counter_id)}/logrequest/{request_id}"
+    while True:
+        info: dict[str, Any] = (await client.get(path, {}, cache=False))["log_request"]
+        status = info.get("status")
+        if status == "processed":
+            return info
+        if status in _FAILED_STATUSES:
+            raise MCPYaMetrikaError(
+                f"Log request {request_id} ended with status {status!r}"
+            )
+        if time.monotonic() + poll_interval > deadline:
+            raise MCPYaMetrikaError(
+                f"Log request {request_id} is not ready after {timeout:.0f}s "
+                f"(status {status!r}); call again later to resume"
+            )
+        logger.debug("Log request %s is %s; polling again", request_id, status)
+        await asyncio.sleep(poll_interval)
+
+
+async def download_log_parts(
+    client: YaMetrikaClient,
+    counter_id: str,
+    request_id: int,
+    parts: list[dict[str, Any]],
+    directory: Path,
+    concurrency: int = 4,
+) -> list[dict[str, Any]]:
+    """Download every part concurrently, streaming each one to disk.
+
+    A part is written to ``part-NNNN.tsv.partial`` and renamed when complete, so
+    parts that already exist are skipped on resume and interrupted ones restart.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    base = f"{_counter_path(counter_id)}/logrequest/{request_id}/part"
+
+    async def download(part: dict[str, Any]) -> dict[str, Any]:
+        number = part["part_number"]
+        final = directory / f"part-{number:04d}.tsv"
+        if final.exists():
+            return {"part_number": number, "path": str(final),
+                    "bytes": final.stat().st_size, "resumed": True}
+        partial = final.with_name(final.name + ".partial")
+        async with semaphore:
+            size = await client.download(f"{base}/{number}/download", partial)
+        partial.replace(final)
+        return {
+            "part_number": number,
+            "path": str(final),
+            "bytes": size,
+            "resumed": False,
+        }
+
+    return list(await asyncio.gather(*(download(part) for part in parts)))
+
+
+async def clean_log_request(
+    client: YaMetrikaClient, counter_id: str, request_id: int
+) -> None:
+    """Delete a downloaded log request to free the counter's log storage quota."""
+    await client.post(f"{_counter_path(counter_id)}/logrequest/{request_id}/clean", {})
@@ -0,0 +1,33 @@
+"""Identification of rarely-changing management API metadata endpoints."""
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+
+# Counter list, a single counter, and a counter's goals.
+_METADATA_PATH_PATTERN = re.compile(
+    r"^/management/v1/(counters|counter/(\d+)(/goals)?)$"
+)
+
+
+def is_metadata_path(path: str) -> bool:
+    return _METADATA_PATH_PATTERN.match(path) is not None
+
+
+def path_from_cache_key(key: str) -> str:
+    """Extract the request path from a key built by make_cache_key."""
+    return key.split(":", 1)[-1].split("?", 1)[0]
+
+
+def metadata_key_matcher(counter_id: str | None = None) -> Callable[[str], bool]:
+    """Predicate over cache keys selecting metadata for one counter or all counters.
+
+    The counter list embeds each counter's settings, so it always matches.
+    """
+    def matches(key: str) -> bool:
+        match = _METADATA_PATH_PATTERN.match(path_from_cache_key(key))
+        if match is None:
+            return False
+        return counter_id is None or match.group(2) in (None, str(counter_id))
+
+    return matches
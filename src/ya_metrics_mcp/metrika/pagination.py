@@ -0,0 +1,119 @@
+"""Paginated reading of /stat/v1/data reports."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ya_metrics_mcp.metrika.client import YaMetrikaClient
+
+# Metrika accepts up to 100000 rows per request; smaller pages keep individual
+# responses (and their cache entries) reasonably sized and allow parallelism.
+DEFAULT_PAGE_SIZE = 10_000
+MAX_PAGE_SIZE = 100_000
+
+
+def _page_params(params: dict[str, Any], offset: int, limit: int) -> dict[str, Any]:
+    return {**params, "offset": offset, "limit": limit}
+
+
+async def iter_report_pages(
+    client: YaMetrikaClient,
+    path: str,
+    params: dict[str, Any],
+    max_rows: int | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    concurrency: int = 4,
+) -> AsyncGenerator[dict[str, Any], None]:
+    """Yield report pages in order, fetching later pages concurrently.
+
+    The first page is fetched alone to learn ``total_rows``; the remaining pages
+    are then requested with at most ``concurrency`` requests in flight. When
+    ``max_rows`` is None, every row of the report is read.
+    """
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+    if max_rows is not None and max_rows < 1:
+        raise ValueError("max_rows must be positive")
+    first_limit = min(page_size, max_rows) if max_rows else page_size
+    first = await client.get(path, _page_params(params, 1, first_limit))
+    yield first
+
+    total = int(first.get("total_rows", len(first.get("data", []))))
+    target = min(total, max_rows) if max_rows else total
+    offsets = range(1 + first_limit, target + 1, page_size)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(offset: int) -> dict[str, Any]:
+        async with semaphore:
+            limit = min(page_size, target - offset + 1)
+            return await client.get(path, _page_params(params, offset, limit))
+
+    # Pages are scheduled in windows so that an early consumer exit does not
+    # leave the whole report downloading in the background.
+    window = max(1, concurrency) * 2
+    pending: list[asyncio.Task[dict[str, Any]]] = []
+    offset_iter = iter(offsets)
+    try:
+        for offset in offset_iter:
+            pending.append(asyncio.ensure_future(fetch(offset)))
+            if len(pending) >= window:
+                break
+        while pending:
+            page = await pending.pop(0)
+            next_offset = next(offset_iter, None)
+            if next_offset is not None:
+                pending.append(asyncio.ensure_future(fetch(next_offset)))
+            yield page
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def iter_report_rows(
+    client: YaMetrikaClient,
+    path: str,
+    params: dict[str, Any],
+    max_rows: int | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    concurrency: int = 4,
+) -> AsyncGenerator[dict[str, Any], None]:
+    """Yield individual report rows across all pages (see iter_report_pages)."""
+    remaining = max_rows
+    pages = iter_report_pages(client, path, params, max_rows, page_size, concurrency)
+    try:
+        async for page in pages:
+            for row in page.get("data", []):
+                if remaining is not None:
+                    if remaining <= 0:
+                        return
+                    remaining -= 1
+                yield row
+    finally:
+        await pages.aclose()
+
+
+async def fetch_report_rows(
+    client: YaMetrikaClient,
+    path: str,
+    params: dict[str, Any],
+    max_rows: int | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    concurrency: int = 4,
+) -> dict[str, Any]:
+    """Read a report across pages and return it as a single response dict.
+
+    The result keeps the first page's metadata (query, totals, total_rows) with
+    ``data`` replaced by the rows from every page.
+    """
+    report: dict[str, Any] | None = None
+    rows: list[dict[str, Any]] = []
+    pages = iter_report_pages(client, path, params, max_rows, page_size, concurrency)
+    async for page in pages:
+        if report is None:
+            report = page
+        rows.extend(page.get("data", []))
+    if max_rows is not None:
+        rows = rows[:max_rows]
+    return {**(report or {}), "data": rows}
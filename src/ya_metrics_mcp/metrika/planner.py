@@ -0,0 +1,201 @@
+"""Query planner that merges compatible /stat/v1/data requests into one call."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+# Metrika accepts at most 20 metrics per /stat/v1/data request.
+MAX_METRICS = 20
+_PLANNED_PATH = "/stat/v1/data"
+# Per-metric vectors in a report response that must be split like row metrics.
+_METRIC_VECTORS = ("totals", "min", "max")
+
+# A caller's params and metrics, and the future that receives its result.
+_Waiter = tuple[dict[str, Any], list[str], "asyncio.Future[dict[str, Any]]"]
+
+
+def effective_sort(params: dict[str, Any]) -> str:
+    """Sort Metrika applies: the request's own, else descending by the first metric."""
+    sort = params.get("sort")
+    if sort:
+        return str(sort)
+    return "-" + str(params["metrics"]).split(",")[0]
+
+
+def plan_key(path: str, params: dict[str, Any]) -> tuple[Any, ...] | None:
+    """Key shared by requests that differ only in metrics, or None if not mergeable.
+
+    Requests are mergeable when everything but ``metrics`` matches and they would
+    be sorted the same way, so the merged request selects the same rows.
+    """
+    if path != _PLANNED_PATH or not params.get("metrics") or "preset" in params:
+        return None
+    rest = tuple(sorted(
+        (k, str(v)) for k, v in params.items() if k not in ("metrics", "sort")
+    ))
+    return rest, effective_sort(params)
+
+
+def split_report(
+    report: dict[str, Any], metrics: list[str], wanted: list[str]
+) -> dict[str, Any]:
+    """Project a merged report onto the ``wanted`` subset of its ``metrics``."""
+    indexes = [metrics.index(m) for m in wanted]
+
+    def pick(values: list[Any]) -> list[Any]:
+        return [values[i] for i in indexes]
+
+    result = dict(report)
+    result["data"] = [
+        {**row, "metrics": pick(row["metrics"])} for row in report.get("data", [])
+    ]
+    for key in _METRIC_VECTORS:
+        if isinstance(report.get(key), list) and len(report[key]) == len(metrics):
+            result[key] = pick(report[key])
+    if isinstance(report.get("query"), dict):
+        result["query"] = {**report["query"], "metrics": list(wanted)}
+    return result
+
+
+class _Batch:
+    def __init__(self, params: dict[str, Any]) -> None:
+        self.params = params
+        self.metrics: list[str] = []
+        self.sort: str | None = None
+        self.waiters: list[_Waiter] = []
+
+    def fits(self, metrics: list[str]) -> bool:
+        return len(set(self.metrics) | set(metrics)) <= MAX_METRICS
+
+    def add(
+        self, params: dict[str, Any], metrics: list[str]
+    ) -> asyncio.Future[dict[str, Any]]:
+        self.metrics.extend(m for m in metrics if m not in self.metrics)
+        self.sort = self.sort or params.get("sort")
+        future: asyncio.Future[dict[str, Any]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self.waiters.append((params, metrics, future))
+        return future
+
+    def merged_params(self) -> dict[str, Any]:
+        if len(self.waiters) == 1:
+            return self.params
+        params = {k: v for k, v in self.params.items() if k != "sort"}
+        params["metrics"] = ",".join(self.metrics)
+        # Without an explicit sort every waiter sorts by the same first metric,
+        # which is also the first metric of the union, so none is needed.
+        if self.sort:
+            params["sort"] = self.sort
+        return params
+
+
+class QueryPlanner:
+    """Collects report requests for a short window and merges their metrics.
+
+    Requests for /stat/v1/data that share ids, dimensions, filters, dates and
+    sort are sent as one request with the union of their metrics (up to 20),
+    and each caller receives the response restricted to its own metrics.
+
+    A request that arrives while the planner is idle (no batch pending or in
+    flight) is sent at once instead of waiting for the window; requests made in
+    the same event-loop step still join its batch.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, dict[str, Any]], Awaitable[dict[str, Any]]],
+        window: float = 0.005,
+    ) -> None:
+        self._fetch = fetch
+        self.window = window
+        self._pending: dict[tuple[Any, ...], _Batch] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._active = 0
+        self.upstream_requests = 0
+        self.merged_requests = 0
+        self.immediate_requests = 0
+        self.fallback_requests = 0
+
+    async def submit(self, path: str, params: dict[str, Any]) -> dict[str, Any]:
+        key = plan_key(path, params)
+        if key is None:
+            return await self._fetch(path, params)
+        metrics = str(params["metrics"]).split(",")
+        batch = self._pending.get(key)
+        if batch is None or not batch.fits(metrics):
+            idle = not self._pending and not self._active
+            batch = _Batch(params)
+            self._pending[key] = batch
+            task = asyncio.ensure_future(
+                self._run(path, key, batch, 0 if idle else self.window)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await batch.add(params, metrics)
+
+    async def _run(
+        self, path: str, key: tuple[Any, ...], batch: _Batch, window: float
+    ) -> None:
+        if window > 0:
+            await asyncio.sleep(window)
+        else:
+            self.immediate_requests += 1
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        waiters = [w for w in batch.waiters if not w[2].done()]
+        if not waiters:
+            return
+        self.upstream_requests += 1
+        if len(batch.waiters) > 1:
+            self.merged_requests += len(batch.waiters)
+        self._active += 1
+        try:
+            report = await self._fetch(path, batch.merged_params())
+        except Exception as exc:
+            if len(batch.waiters) == 1:
+                _, _, future = waiters[0]
+                if not future.done():
+                    future.set_exception(exc)
+                return
+            # One caller's bad metric fails the merged request for everyone, so
+            # each caller's own request is retried to get per-caller results.
+            await self._run_separately(path, waiters)
+            return
+        finally:
+            self._active -= 1
+        for _, metrics, future in waiters:
+            if future.done():
+                continue
+            if len(batch.waiters) == 1:
+                future.set_result(report)
+            else:
+                future.set_result(split_report(report, batch.metrics, metrics))
+
+    async def _run_separately(
+        self,
+        path: str,
+        waiters: list[_Waiter],
+    ) -> None:
+        self.fallback_requests += len(waiters)
+        results = await asyncio.gather(
+            *(self._fetch(path, params) for params, _, _ in waiters),
+            return_exceptions=True,
+        )
+        for (_, _, future), result in zip(waiters, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending_batches": len(self._pending),
+            "upstream_requests": self.upstream_requests,
+            "merged_requests": self.merged_requests,
+            "immediate_requests": self.immediate_requests,
+            "fallback_requests": self.fallback_requests,
+        }
@@ -0,0 +1,153 @@
+"""Client-side token-bucket rate limiting for the Yandex Metrika API."""
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections.abc import Callable, Mapping
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+_COUNTER_PATH_PATTERN = re.compile(r"/counter/(\d+)")
+
+
+def counter_id_from_request(path: str, params: Mapping[str, Any]) -> str | None:
+    """Extract the counter ID a request is made against, if any."""
+    ids = params.get("ids", params.get("id"))
+    if ids is not None:
+        return str(ids)
+    match = _COUNTER_PATH_PATTERN.search(path)
+    return match.group(1) if match else None
+
+
+def parse_retry_after(value: str | None, now: float | None = None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def delay(self) -> float:
+        """Seconds until one token is available (0 if available now)."""
+        self._refill()
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def consume(self) -> None:
+        self._tokens -= 1
+
+
+class RateLimiter:
+    """Global, per-token and per-counter token buckets.
+
+    Callers wait in :meth:`acquire` until every applicable bucket has a token, so
+    bursts are queued instead of being rejected by the API. A rate of 0 disables
+    the corresponding bucket.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = 0,
+        token_rate: float = 0,
+        counter_rate: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.global_rate = global_rate
+        self.token_rate = token_rate
+        self.counter_rate = counter_rate
+        self._clock = clock
+        self._global = (
+            TokenBucket(global_rate, clock=clock) if global_rate > 0 else None
+        )
+        self._by_token: dict[str, TokenBucket] = {}
+        self._by_counter: dict[str, TokenBucket] = {}
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.waited_requests = 0
+        self.total_wait_time = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.global_rate > 0 or self.token_rate > 0 or self.counter_rate > 0
+
+    def _buckets(self, token: str, counter_id: str | None) -> list[TokenBucket]:
+        buckets = [self._global] if self._global is not None else []
+        if self.token_rate > 0:
+            if token not in self._by_token:
+                self._by_token[token] = TokenBucket(self.token_rate, clock=self._clock)
+            buckets.append(self._by_token[token])
+        if self.counter_rate > 0 and counter_id is not None:
+            if counter_id not in self._by_counter:
+                self._by_counter[counter_id] = TokenBucket(
+                    self.counter_rate, clock=self._clock
+                )
+            buckets.append(self._by_counter[counter_id])
+        return buckets
+
+    async def acquire(self, token: str, counter_id: str | None = None) -> float:
+        """Wait for a slot in all applicable buckets; return seconds waited."""
+        buckets = self._buckets(token, counter_id)
+        if not buckets:
+            return 0.0
+        start = self._clock()
+        queued = False
+        try:
+            while True:
+                delay = max(bucket.delay() for bucket in buckets)
+                if delay <= 0:
+                    for bucket in buckets:
+                        bucket.consume()
+                    break
+                if not queued:
+                    queued = True
+                    self.queue_depth += 1
+                    self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+                await asyncio.sleep(delay)
+        finally:
+            if queued:
+                self.queue_depth -= 1
+        waited = self._clock() - start
+        if queued:
+            self.waited_requests += 1
+            self.total_wait_time += waited
+        return waited
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "waited_requests": self.waited_requests,
+            "total_wait_seconds": round(self.total_wait_time, 3),
+        }
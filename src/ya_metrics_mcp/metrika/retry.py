@@ -0,0 +1,122 @@
+"""Retry policy and circuit breaker for Yandex Metrika API requests."""
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from ya_metrics_mcp.exceptions import CircuitOpenError
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+
+
+def endpoint_family(path: str) -> str:
+    """Group request paths into families that share a circuit breaker."""
+    if path.startswith("/stat/"):
+        return "stat"
+    if path.startswith("/management/"):
+        return "management"
+    return "other"
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by a per-call deadline."""
+
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    deadline: float = 60.0
+
+    @classmethod
+    def from_config(cls, config: YaMetrikaConfig) -> RetryPolicy:
+        return cls(
+            max_attempts=config.retries,
+            base_delay=config.retry_delay,
+            max_delay=config.retry_max_delay,
+            deadline=config.retry_deadline,
+        )
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Delay before the retry that follows ``attempt`` (1-based)."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def next_delay(
+        self, attempt: int, elapsed: float, retry_after: float | None = None
+    ) -> float | None:
+        """Return the delay before the next attempt, or None to stop retrying."""
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt, retry_after)
+        if elapsed + delay > self.deadline:
+            return None
+        return delay
+
+
+class CircuitBreaker:
+    """Fail fast after repeated upstream failures.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and rejects
+    calls for ``reset_timeout`` seconds. It then lets a single probe through
+    (half-open); success closes it again, failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+
+    def before_call(self) -> None:
+        if self.failure_threshold <= 0 or self.state == "closed":
+            return
+        if self.state == "open":
+            if self._clock() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError(
+                    f"Yandex Metrika {self.name} API is unavailable "
+                    "(circuit breaker open), try again later."
+                )
+            self.state = "half_open"
+        now = self._clock()
+        # A probe that never reported back (e.g. was cancelled) expires after
+        # reset_timeout so the breaker cannot get stuck half-open.
+        if (
+            self._probe_started is not None
+            and now - self._probe_started < self.reset_timeout
+        ):
+            raise CircuitOpenError(
+                f"Yandex Metrika {self.name} API is recovering "
+                "(circuit breaker half-open), try again later."
+            )
+        self._probe_started = now
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_started = None
+        if self.failure_threshold > 0 and (
+            self.state == "half_open" or self.failures >= self.failure_threshold
+        ):
+            self.state = "open"
+            self._opened_at = self._clock()
+
+    def stats(self) -> dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures}
@@ -0,0 +1,282 @@
+"""Date-range sharding: split a report by date, fetch chunks in parallel, merge."""
+from __future__ import annotations
+
+import asyncio
+import re
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ya_metrics_mcp.utils.date import split_date_range
+
+# Metrics that are averages or ratios and must be recombined weighted by volume.
+_RATIO_PATTERN = re.compile(r"(rate|percent|avg|pagedepth)", re.IGNORECASE)
+# Metrics that count distinct entities and cannot be summed exactly across ranges.
+_NON_ADDITIVE_METRICS = {"users"}
+
+# Volume metric used as the weight for ratio metrics, by metric namespace.
+_WEIGHT_METRICS = {"ym:s:": "ym:s:visits", "ym:pv:": "ym:pv:pageviews"}
+# Rows the API returns when a request sets no limit.
+API_DEFAULT_LIMIT = 100
+
+
+def metric_kind(metric: str) -> str:
+    """Classify a metric as 'ratio', 'distinct' or 'additive' for merging."""
+    name = metric.rsplit(":", 1)[-1]
+    if _RATIO_PATTERN.search(name):
+        return "ratio"
+    if name in _NON_ADDITIVE_METRICS:
+        return "distinct"
+    return "additive"
+
+
+def weight_metric_for(metric: str) -> str | None:
+    for prefix, weight in _WEIGHT_METRICS.items():
+        if metric.startswith(prefix):
+            return weight
+    return None
+
+
+def _row_key(row: dict[str, Any]) -> tuple[Any, ...]:
+    return tuple(d.get("id", d.get("name")) for d in row.get("dimensions", []))
+
+
+def merge_metric_values(
+    values: list[list[float | None]],
+    metrics: list[str],
+    kinds: list[str],
+) -> list[float | None]:
+    """Merge per-shard (or per-counter) metric vectors into one vector."""
+    merged: list[float | None] = []
+    for i, (metric, kind) in enumerate(zip(metrics, kinds, strict=True)):
+        column = [x for x in (v[i] for v in values) if x is not None]
+        if kind != "ratio":
+            merged.append(sum(column) if column else None)
+            continue
+        weight = weight_metric_for(metric)
+        w_index = metrics.index(weight) if weight in metrics else None
+        if w_index is None:
+            merged.append(sum(column) / len(column) if column else None)
+            continue
+        total_weight = sum(v[w_index] or 0 for v in values if v[i] is not None)
+        weighted = sum(
+            (v[i] or 0) * (v[w_index] or 0) for v in values if v[i] is not None
+        )
+        merged.append(weighted / total_weight if total_weight else 0.0)
+    return merged
+
+
+def merge_table_reports(
+    reports: list[dict[str, Any]], metrics: list[str]
+) -> dict[str, Any]:
+    """Merge /stat/v1/data responses for consecutive date ranges.
+
+    Rows are matched on their dimension values. Additive metrics are summed, ratio
+    metrics are averaged weighted by visits (or pageviews), and distinct counts
+    such as users are summed as an upper bound.
+    """
+    kinds = [metric_kind(m) for m in metrics]
+    rows: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for report in reports:
+        for row in report.get("data", []):
+            key = _row_key(row)
+            entry = rows.setdefault(
+                key, {"dimensions": row["dimensions"], "values": []}
+            )
+            entry["values"].append(row["metrics"])
+
+    merged_rows = [
+        {
+            "dimensions": e["dimensions"],
+            "metrics": merge_metric_values(e["values"], metrics, kinds),
+        }
+        for e in rows.values()
+    ]
+    totals = [r["totals"] for r in reports if "totals" in r]
+
+    merged = dict(reports[0]) if reports else {}
+    merged["data"] = merged_rows
+    merged["total_rows"] = len(merged_rows)
+    if totals:
+        merged["totals"] = merge_metric_values(totals, metrics, kinds)
+    if merged_rows:
+        columns = list(zip(*(r["metrics"] for r in merged_rows), strict=True))
+        merged["min"] = [
+            min((v for v in c if v is not None), default=None) for c in columns
+        ]
+        merged["max"] = [
+            max((v for v in c if v is not None), default=None) for c in columns
+        ]
+    merged["sampled"] = any(r.get("sampled") for r in reports)
+    return merged
+
+
+def merge_bytime_reports(
+    reports: list[dict[str, Any]], metrics: list[str]
+) -> dict[str, Any]:
+    """Concatenate /stat/v1/data/bytime responses for consecutive date ranges.
+
+    A dimension row missing from a shard (e.g. outside that shard's top_keys) is
+    padded with None for that shard's intervals.
+    """
+    intervals: list[Any] = []
+    rows: dict[tuple[Any, ...], dict[str, Any]] = {}
+    totals: list[list[Any]] = [[] for _ in metrics]
+    offset = 0
+    for report in reports:
+        shard_intervals = report.get("time_intervals", [])
+        width = len(shard_intervals)
+        for row in report.get("data", []):
+            key = _row_key(row)
+            entry = rows.setdefault(
+                key,
+                {
+                    "dimensions": row.get("dimensions", []),
+                    "metrics": [[] for _ in metrics],
+                },
+            )
+            for i, series in enumerate(row["metrics"]):
+                pad = offset - len(entry["metrics"][i])
+                entry["metrics"][i].extend([None] * pad)
+                entry["metrics"][i].extend(series)
+        for i, series in enumerate(report.get("totals", [])):
+            totals[i].extend(series)
+        intervals.extend(shard_intervals)
+        offset += width
+    for entry in rows.values():
+        for series in entry["metrics"]:
+            series.extend([None] * (offset - len(series)))
+
+    merged = dict(reports[0]) if reports else {}
+    merged["data"] = list(rows.values())
+    merged["time_intervals"] = intervals
+    merged["totals"] = totals
+    merged["total_rows"] = len(rows)
+    merged["sampled"] = any(r.get("sampled") for r in reports)
+    return merged
+
+
+def _sort_rows(report: dict[str, Any], metrics: list[str], sort: str | None) -> None:
+    descending = True
+    index = 0
+    if sort:
+        field = sort.split(",")[0]
+        descending = field.startswith("-")
+        field = field.lstrip("-")
+        if field not in metrics:
+            return
+        index = metrics.index(field)
+    report["data"].sort(
+        key=lambda row: (
+            row["metrics"][index] if row["metrics"][index] is not None else 0
+        ),
+        reverse=descending,
+    )
+
+
+async def fetch_sharded(
+    fetch: Callable[[dict[str, Any], int | None], Awaitable[dict[str, Any]]],
+    path: str,
+    params: dict[str, Any],
+    unit: str,
+    concurrency: int = 4,
+    max_rows: int | None = None,
+    page_size: int = 10_000,
+    max_requests: int | None = None,
+) -> dict[str, Any]:
+    """Fetch a report in date shards with bounded parallelism and merge the results.
+
+    ``fetch`` is called once per shard with params whose date1/date2 cover that
+    shard and the number of rows to read (``fetch_report``'s ``max_rows``).
+    Requires explicit YYYY-MM-DD ``date1``/``date2`` and a ``metrics`` list.
+
+    A row can rank into one shard's top rows and miss another's, so every shard
+    of a table report with dimensions is read in full; the merged rows are cut
+    to ``max_rows`` (or the request's ``limit``) only after summing. With
+    ``max_requests``, each shard reads at most its share of that many pages of
+    ``page_size`` rows (at least one), and ``sharding.truncated`` is set when a
+    shard had more rows than it read.
+    """
+    date1, date2 = params.get("date1"), params.get("date2")
+    if not date1 or not date2:
+        raise ValueError("Sharding requires both date_from and date_to")
+    if not params.get("metrics"):
+        raise ValueError("Sharding requires an explicit metrics list")
+    metrics = str(params["metrics"]).split(",")
+    bytime = path.endswith("/bytime")
+    if bytime:
+        group = params.get("group", "day")
+        if group != "day" and group != unit:
+            raise ValueError(
+                f"Cannot shard group={group!r} by {unit!r}; "
+                f"use shard='{group}' or group='day'"
+            )
+
+    # Ratio metrics need a volume metric in each shard to be recombined exactly.
+    request_metrics = list(metrics)
+    if not bytime:
+        for metric in metrics:
+            weight = weight_metric_for(metric)
+            if (
+                metric_kind(metric) == "ratio"
+                and weight
+                and weight not in request_metrics
+            ):
+                request_metrics.append(weight)
+    if len(request_metrics) > 20:
+        request_metrics = metrics
+
+    shards = split_date_range(str(date1), str(date2), unit)
+    complete = not bytime and bool(params.get("dimensions"))
+    shard_rows = max_rows
+    if complete:
+        pages = max(1, max_requests // len(shards)) if max_requests else 0
+        shard_rows = pages * page_size
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch_shard(start: str, end: str) -> dict[str, Any]:
+        async with semaphore:
+            return await fetch(
+                {
+                    **params,
+                    "date1": start,
+                    "date2": end,
+                    "metrics": ",".join(request_metrics),
+                },
+                shard_rows,
+            )
+
+    reports = await asyncio.gather(*(fetch_shard(s, e) for s, e in shards))
+    truncated = complete and any(
+        report.get("total_rows", 0) > len(report.get("data", [])) for report in reports
+    )
+
+    if bytime:
+        merged = merge_bytime_reports(list(reports), request_metrics)
+    else:
+        merged = merge_table_reports(list(reports), request_metrics)
+        extra = len(request_metrics) - len(metrics)
+        if extra:
+            for row in merged["data"]:
+                del row["metrics"][-extra:]
+            for key in ("totals", "min", "max"):
+                if key in merged:
+                    del merged[key][-extra:]
+        _sort_rows(merged, metrics, params.get("sort"))
+        if max_rows is None and complete:
+            max_rows = int(params.get("limit") or API_DEFAULT_LIMIT)
+        if max_rows:
+            merged["data"] = merged["data"][:max_rows]
+
+    query = dict(merged.get("query", {}))
+    if query:
+        query.update({"date1": date1, "date2": date2, "metrics": metrics})
+        merged["query"] = query
+    merged["sharding"] = {
+        "unit": unit,
+        "shards": len(shards),
+        "approximate_metrics": [m for m in metrics if metric_kind(m) == "distinct"],
+    }
+    if complete:
+        merged["sharding"]["rows_per_shard"] = shard_rows or None
+        merged["sharding"]["truncated"] = truncated
+    return merged
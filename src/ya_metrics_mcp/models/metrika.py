@@ -0,0 +1,21 @@
+"""Pydantic models for structured tool inputs."""
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class BatchQuery(BaseModel):
+    """One report call inside a batch_query request."""
+
+    tool: str = Field(
+        description="Report tool name, e.g. 'get_visits' or 'sources_summary'"
+    )
+    arguments: dict[str, Any] = Field(
+        default_factory=dict,
+        description=(
+            "Arguments for the tool, e.g. "
+            "{'counter_id': '12345', 'date_from': '2024-01-01'}"
+        ),
+    )
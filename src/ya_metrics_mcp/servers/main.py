@@ -4,15 +4,24 @@ from __future__ import annotations
 import logging
 from contextlib import asynccontextmanager
 
+import httpx
 from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
 from ya_metrics_mcp.metrika.client import YaMetrikaClient
 from ya_metrics_mcp.metrika.config import YaMetrikaConfig
 from ya_metrics_mcp.metrika.fetchers.fetcher import YaMetrikaFetcher
 from ya_metrics_mcp.servers.context import MainAppContext
+from ya_metrics_mcp.servers.metrics import CONTENT_TYPE, ServerMetrics
+from ya_metrics_mcp.utils.tracing import configure_tracing
 
 logger = logging.getLogger("ya-metrics")
 
+server_metrics = ServerMetrics()
+# Serves Metrika API requests without the network when set (benchmarks).
+http_transport: httpx.AsyncBaseTransport | None = None
+
 
 @asynccontextmanager
 async def main_lifespan(app: FastMCP):  # type: ignore[type-arg]
@@ -23,11 +32,17 @@ async def main_lifespan(app: FastMCP):  # type: ignore[type-arg]
         config.read_only,
         config.enabled_tools,
     )
-    client = YaMetrikaClient(config)
+    configure_tracing(config.tracing, config.trace_buffer)
+    client = YaMetrikaClient(config, transport=http_transport)
+    if config.warmup:
+        await client.warmup()
     fetcher = YaMetrikaFetcher(client)
+    server_metrics.client = client
     try:
         yield MainAppContext(fetcher=fetcher, config=config)
     finally:
+        server_metrics.client = None
+        logger.info("Client stats at shutdown: %s", client.stats())
         await client.close()
         logger.info("ya-metrics-mcp shutdown complete")
 
@@ -37,3 +52,10 @@ mcp = FastMCP(
     instructions="MCP server for Yandex Metrika analytics. Provides access to traffic, content, demographics, performance, and e-commerce data.",
     lifespan=main_lifespan,
 )
+mcp.add_middleware(server_metrics)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint (HTTP transports only)."""
+    return PlainTextResponse(server_metrics.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,182 @@
+"""Prometheus metrics for tool calls and the Metrika client, served at /metrics."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.utils.metrics import Counter, Histogram, render_family
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_PREFIX = "ya_metrics"
+
+
+class ServerMetrics(Middleware):
+    """Records per-tool call counts and latency and renders all server metrics.
+
+    The lifespan attaches the shared client so that its cache, planner, rate
+    limiter, pool and upstream latency figures are exported alongside.
+    """
+
+    def __init__(self) -> None:
+        self.client: YaMetrikaClient | None = None
+        self.in_progress = 0
+        self.tool_calls = Counter(
+            f"{_PREFIX}_tool_calls_total", "Tool calls by outcome.", ("tool", "outcome")
+        )
+        self.tool_latency = Histogram(
+            f"{_PREFIX}_tool_duration_seconds", "Tool call duration.", ("tool",)
+        )
+
+    async def on_call_tool(
+        self, context: MiddlewareContext, call_next: CallNext
+    ) -> Any:
+        tool = context.message.name
+        started = time.monotonic()
+        outcome = "error"
+        self.in_progress += 1
+        try:
+            result = await call_next(context)
+            outcome = "error" if getattr(result, "is_error", False) else "success"
+            return result
+        finally:
+            self.in_progress -= 1
+            self.tool_calls.inc(tool, outcome)
+            self.tool_latency.observe(time.monotonic() - started, tool)
+
+    def render(self) -> str:
+        lines = self.tool_calls.render() + self.tool_latency.render()
+        lines += render_family(
+            f"{_PREFIX}_tool_calls_in_progress", "gauge",
+            "Tool calls currently running.", [({}, self.in_progress)],
+        )
+        if self.client is not None:
+            lines += self.client.upstream_latency.render()
+            lines += _client_lines(self.client.stats())
+        return "\n".join(lines) + "\n"
+
+
+def _client_lines(stats: dict[str, Any]) -> list[str]:
+    lines: list[str] = []
+
+    def add(name: str, kind: str, help_text: str, samples: list[Any]) -> None:
+        lines.extend(render_family(f"{_PREFIX}_{name}", kind, help_text, samples))
+
+    caches = [("memory", stats["cache"])]
+    if "disk_cache" in stats:
+        caches.append(("disk", stats["disk_cache"]))
+    for field, kind in (("hits", "counter"), ("misses", "counter"),
+                        ("stale_hits", "counter"), ("evictions", "counter")):
+        samples = [
+            ({"cache": name}, cache[field]) for name, cache in caches if field in cache
+        ]
+        add(
+            f"cache_{field}_total",
+            kind,
+            f"Response cache {field.replace('_', ' ')}.",
+            samples,
+        )
+    add("cache_hit_ratio", "gauge", "Response cache hit ratio since start.",
+        [({"cache": name}, cache["hit_ratio"]) for name, cache in caches])
+    add("cache_entries", "gauge", "Entries in the in-memory response cache.",
+        [({}, stats["cache"]["size"])])
+    if "disk_cache" in stats:
+        add("disk_cache_bytes", "gauge", "Size of the on-disk response cache.",
+            [({}, stats["disk_cache"]["size_bytes"])])
+
+    inflight = stats["inflight"]
+    add(
+        "upstream_requests_in_flight",
+        "gauge",
+        "HTTP requests to Metrika currently open.",
+        [({}, inflight["upstream_active"])],
+    )
+    add(
+        "shared_requests_in_flight",
+        "gauge",
+        "Distinct report fetches callers are waiting on.",
+        [({}, inflight["active"])],
+    )
+    add(
+        "coalesced_requests_total",
+        "counter",
+        "Calls that joined an identical in-flight fetch.",
+        [({}, inflight["coalesced"])],
+    )
+    add(
+        "background_refreshes_total",
+        "counter",
+        "Stale cache entries refreshed in background.",
+        [({}, inflight["background_refreshes"])],
+    )
+    add("upstream_retries_total", "counter", "Retried Metrika requests.",
+        [({}, stats["retries"])])
+
+    if stats.get("planner") is not None:
+        planner = stats["planner"]
+        add(
+            "planner_upstream_requests_total",
+            "counter",
+            "Report requests sent by the planner.",
+            [({}, planner["upstream_requests"])],
+        )
+        add(
+            "planner_merged_requests_total",
+            "counter",
+            "Report requests merged with others.",
+            [({}, planner["merged_requests"])],
+        )
+        add("planner_pending_batches", "gauge", "Planner batches waiting to be sent.",
+            [({}, planner["pending_batches"])])
+
+    limiter = stats["rate_limiter"]
+    add("rate_limiter_queue_depth", "gauge", "Requests waiting for a rate limit slot.",
+        [({}, limiter["queue_depth"])])
+    add(
+        "rate_limiter_max_queue_depth",
+        "gauge",
+        "Highest rate limiter queue depth seen.",
+        [({}, limiter["max_queue_depth"])],
+    )
+    add(
+        "rate_limiter_waited_requests_total",
+        "counter",
+        "Requests delayed by the rate limiter.",
+        [({}, limiter["waited_requests"])],
+    )
+    add(
+        "rate_limiter_wait_seconds_total",
+        "counter",
+        "Time spent waiting for rate limits.",
+        [({}, limiter["total_wait_seconds"])],
+    )
+
+    pool = stats["pool"]
+    add("http_pool_connections", "gauge", "Connections in the HTTP pool by state.",
+        [({"state": "idle"}, pool["idle"]),
+         ({"state": "active"}, pool["connections"] - pool["idle"])])
+    add("http_pool_max_connections", "gauge", "Configured HTTP pool size.",
+        [({}, pool["max_connections"])])
+
+    breakers = stats["circuit_breakers"]
+    add(
+        "circuit_breaker_open",
+        "gauge",
+        "1 when the endpoint family's circuit is open.",
+        [
+            ({"endpoint": name}, int(b["state"] == "open"))
+            for name, b in sorted(breakers.items())
+        ],
+    )
+    add(
+        "circuit_breaker_consecutive_failures",
+        "gauge",
+        "Consecutive failures per family.",
+        [
+            ({"endpoint": name}, b["consecutive_failures"])
+            for name, b in sorted(breakers.items())
+        ],
+    )
+    return lines
@@ -1,11 +1,16 @@
 """MCP tool registrations for Yandex Metrika analytics."""
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastmcp import Context
 from pydantic import Field
 
+from ya_metrics_mcp.models.metrika import BatchQuery
 from ya_metrics_mcp.servers.dependencies import get_metrika_fetcher
 from ya_metrics_mcp.servers.main import mcp
+from ya_metrics_mcp.utils.serialization import OutputFormat as FormatName
+
+# ``output_format`` parameter shared by every tool.
+OutputFormat = Annotated[FormatName | None, Field(description="Response format: pretty|compact JSON, table (column names + row arrays), csv or tsv; non-report responses fall back to compact JSON (default: YANDEX_OUTPUT_FORMAT)")]
 
 # ─── Account & Basic Analytics ───────────────────────────────────────────────
 
@@ -14,30 +19,33 @@ async def list_counters(
     ctx: Context,
     search: Annotated[str | None, Field(description="Filter counters by name or site URL")] = None,
     per_page: Annotated[int, Field(description="Max counters to return (default 100)", ge=1, le=1000)] = 100,
+    output_format: OutputFormat = None,
 ) -> str:
     """List all Yandex Metrika counters available to this account. Use this to find counter IDs."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.list_counters(search, per_page)
+    return await fetcher.list_counters(search, per_page, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
 async def list_goals(
     ctx: Context,
     counter_id: Annotated[str, Field(description="Yandex Metrika counter ID")],
+    output_format: OutputFormat = None,
 ) -> str:
     """List all conversion goals configured for a counter. Use goal IDs with get_goals_conversion."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.list_goals(counter_id)
+    return await fetcher.list_goals(counter_id, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
 async def get_account_info(
     ctx: Context,
     counter_id: Annotated[str, Field(description="Yandex Metrika counter ID")],
+    output_format: OutputFormat = None,
 ) -> str:
     """Get basic account and counter information from Yandex Metrika."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_account_info(counter_id)
+    return await fetcher.get_account_info(counter_id, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -46,10 +54,12 @@ async def get_visits(
     counter_id: Annotated[str, Field(description="Yandex Metrika counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    shard: Annotated[Literal["day", "week", "month"] | None, Field(description="Split the date range into day/week/month chunks fetched in parallel and merged (needs date_from and date_to)")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Retrieve visit statistics with optional date range (defaults to last 7 days)."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_visits(counter_id, date_from, date_to)
+    return await fetcher.get_visits(counter_id, date_from, date_to, shard, output_format=output_format)
 
 
 # ─── Traffic Sources ─────────────────────────────────────────────────────────
@@ -58,30 +68,33 @@ async def get_visits(
 async def sources_summary(
     ctx: Context,
     counter_id: Annotated[str, Field(description="Counter ID")],
+    output_format: OutputFormat = None,
 ) -> str:
     """Get comprehensive traffic sources overview and summary report."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.sources_summary(counter_id)
+    return await fetcher.sources_summary(counter_id, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
 async def sources_search_phrases(
     ctx: Context,
     counter_id: Annotated[str, Field(description="Counter ID")],
+    output_format: OutputFormat = None,
 ) -> str:
     """Retrieve search phrases and browser information from traffic sources."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.sources_search_phrases(counter_id)
+    return await fetcher.sources_search_phrases(counter_id, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
 async def get_traffic_sources_types(
     ctx: Context,
     counter_id: Annotated[str, Field(description="Counter ID")],
+    output_format: OutputFormat = None,
 ) -> str:
     """Analyze different types of traffic sources (organic, direct, referral)."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_traffic_sources_types(counter_id)
+    return await fetcher.get_traffic_sources_types(counter_id, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -90,10 +103,11 @@ async def get_search_engines_data(
     counter_id: Annotated[str, Field(description="Counter ID")],
     exclude_robots: Annotated[bool, Field(description="Exclude robot traffic")] = False,
     new_users_only: Annotated[bool, Field(description="Filter to new users only")] = False,
+    output_format: OutputFormat = None,
 ) -> str:
     """Get sessions and users data from search engines with optional filters."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_search_engines_data(counter_id, exclude_robots, new_users_only)
+    return await fetcher.get_search_engines_data(counter_id, exclude_robots, new_users_only, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -102,10 +116,11 @@ async def get_new_users_by_source(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Identify which traffic sources are most effective in acquiring new users."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_new_users_by_source(counter_id, date_from, date_to)
+    return await fetcher.get_new_users_by_source(counter_id, date_from, date_to, output_format=output_format)
 
 
 # ─── Content Analytics ────────────────────────────────────────────────────────
@@ -116,10 +131,11 @@ async def get_content_analytics_sources(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Get sources that drive users to website articles."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_content_analytics_sources(counter_id, date_from, date_to)
+    return await fetcher.get_content_analytics_sources(counter_id, date_from, date_to, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -128,10 +144,11 @@ async def get_content_analytics_categories(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Retrieve overall statistics by content category."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_content_analytics_categories(counter_id, date_from, date_to)
+    return await fetcher.get_content_analytics_categories(counter_id, date_from, date_to, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -140,10 +157,11 @@ async def get_content_analytics_authors(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Get statistics on article authors performance."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_content_analytics_authors(counter_id, date_from, date_to)
+    return await fetcher.get_content_analytics_authors(counter_id, date_from, date_to, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -152,10 +170,11 @@ async def get_content_analytics_topics(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Analyze performance by article topics."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_content_analytics_topics(counter_id, date_from, date_to)
+    return await fetcher.get_content_analytics_topics(counter_id, date_from, date_to, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -164,10 +183,12 @@ async def get_content_analytics_articles(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    max_rows: Annotated[int | None, Field(description="Rows to read across result pages: 0 for all rows, N for the top N (default: first page only)", ge=0)] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Get detailed report on article views grouped by article."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_content_analytics_articles(counter_id, date_from, date_to)
+    return await fetcher.get_content_analytics_articles(counter_id, date_from, date_to, max_rows, output_format=output_format)
 
 
 # ─── User Behavior & Demographics ─────────────────────────────────────────────
@@ -178,10 +199,11 @@ async def get_user_demographics(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Access user demographics and engagement by device category."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_user_demographics(counter_id, date_from, date_to)
+    return await fetcher.get_user_demographics(counter_id, date_from, date_to, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -190,10 +212,11 @@ async def get_device_analysis(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Analyze user behavior by browser and operating system."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_device_analysis(counter_id, date_from, date_to)
+    return await fetcher.get_device_analysis(counter_id, date_from, date_to, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -202,10 +225,11 @@ async def get_mobile_vs_desktop(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Compare traffic and engagement metrics between mobile and desktop users."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_mobile_vs_desktop(counter_id, date_from, date_to)
+    return await fetcher.get_mobile_vs_desktop(counter_id, date_from, date_to, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -213,10 +237,11 @@ async def get_page_depth_analysis(
     ctx: Context,
     counter_id: Annotated[str, Field(description="Counter ID")],
     min_pages: Annotated[int, Field(description="Minimum page views threshold", ge=1)] = 5,
+    output_format: OutputFormat = None,
 ) -> str:
     """Get sessions where users viewed more than the specified number of pages."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_page_depth_analysis(counter_id, min_pages)
+    return await fetcher.get_page_depth_analysis(counter_id, min_pages, output_format=output_format)
 
 
 # ─── Geographic ───────────────────────────────────────────────────────────────
@@ -226,10 +251,12 @@ async def get_regional_data(
     ctx: Context,
     counter_id: Annotated[str, Field(description="Counter ID")],
     cities: Annotated[list[str] | None, Field(description="City names to filter by")] = None,
+    derived: Annotated[list[str] | None, Field(description="Derived columns appended to each row: share:M (percent of total), rank:M, cumsum:M, ratio:A/B. Requires the analytics extra (numpy)")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Get sessions and users data for specific regions/cities."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_regional_data(counter_id, cities)
+    return await fetcher.get_regional_data(counter_id, cities, derived, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -238,10 +265,11 @@ async def get_geographical_organic_traffic(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Analyze geographical distribution of organic traffic."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_geographical_organic_traffic(counter_id, date_from, date_to)
+    return await fetcher.get_geographical_organic_traffic(counter_id, date_from, date_to, output_format=output_format)
 
 
 # ─── Performance & Conversion ─────────────────────────────────────────────────
@@ -252,21 +280,26 @@ async def get_page_performance(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    max_rows: Annotated[int | None, Field(description="Rows to read across result pages: 0 for all rows, N for the top N (default: first page only)", ge=0)] = None,
+    shard: Annotated[Literal["day", "week", "month"] | None, Field(description="Split the date range into day/week/month chunks fetched in parallel and merged (needs date_from and date_to)")] = None,
+    derived: Annotated[list[str] | None, Field(description="Derived columns appended to each row: share:M (percent of total), rank:M, cumsum:M, ratio:A/B. Requires the analytics extra (numpy)")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Get page performance and bounce rate by URL path."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_page_performance(counter_id, date_from, date_to)
+    return await fetcher.get_page_performance(counter_id, date_from, date_to, max_rows, shard, derived, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
 async def get_goals_conversion(
     ctx: Context,
     counter_id: Annotated[str, Field(description="Counter ID")],
-    goal_ids: Annotated[list[int], Field(description="List of goal IDs to track")],
+    goal_ids: Annotated[list[int] | None, Field(description="List of goal IDs to track (default: the counter's goals, up to 19)")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Track conversion rates for specified goals."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_goals_conversion(counter_id, goal_ids)
+    return await fetcher.get_goals_conversion(counter_id, goal_ids, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -275,10 +308,12 @@ async def get_organic_search_performance(
     counter_id: Annotated[str, Field(description="Counter ID")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    max_rows: Annotated[int | None, Field(description="Rows to read across result pages: 0 for all rows, N for the top N (default: first page only)", ge=0)] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Analyze organic search performance by search engine and query."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_organic_search_performance(counter_id, date_from, date_to)
+    return await fetcher.get_organic_search_performance(counter_id, date_from, date_to, max_rows, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -288,10 +323,12 @@ async def get_conversion_rate_by_source_and_landing(
     goal_id: Annotated[int, Field(description="Goal ID to track conversion for")],
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    max_rows: Annotated[int | None, Field(description="Rows to read across result pages: 0 for all rows, N for the top N (default: first page only)", ge=0)] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Get conversion rate analysis by traffic source and landing page."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_conversion_rate_by_source_and_landing(counter_id, goal_id, date_from, date_to)
+    return await fetcher.get_conversion_rate_by_source_and_landing(counter_id, goal_id, date_from, date_to, max_rows, output_format=output_format)
 
 
 # ─── Advanced Analytics ───────────────────────────────────────────────────────
@@ -303,10 +340,12 @@ async def get_ecommerce_performance(
     currency: Annotated[str, Field(description="Currency code, e.g. RUB, USD")] = "RUB",
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
+    max_rows: Annotated[int | None, Field(description="Rows to read across result pages: 0 for all rows, N for the top N (default: first page only)", ge=0)] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Get e-commerce performance by product category and region."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_ecommerce_performance(counter_id, currency, date_from, date_to)
+    return await fetcher.get_ecommerce_performance(counter_id, currency, date_from, date_to, max_rows, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -320,10 +359,49 @@ async def get_data_by_time(
     group: Annotated[str, Field(description="Time grouping: day|week|month|quarter|year")] = "day",
     top_keys: Annotated[int, Field(description="Number of top results (1-30)", ge=1, le=30)] = 7,
     timezone: Annotated[str | None, Field(description="Timezone offset, e.g. +03:00")] = None,
+    shard: Annotated[Literal["day", "week", "month"] | None, Field(description="Split the date range into day/week/month chunks fetched in parallel and merged (needs date_from and date_to)")] = None,
+    derived: Annotated[list[str] | None, Field(description="Derived columns appended to each row: share:M (percent of total), rank:M, cumsum:M, ratio:A/B, growth:M (percent change from previous interval), rollingN:M (trailing N-interval mean). Requires the analytics extra (numpy)")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Get data for specific time periods grouped by day/week/month/quarter/year."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_data_by_time(counter_id, metrics, date_from, date_to, dimensions, group, top_keys, timezone)
+    return await fetcher.get_data_by_time(counter_id, metrics, date_from, date_to, dimensions, group, top_keys, timezone, shard, derived, output_format=output_format)
+
+
+@mcp.tool(tags={"metrika", "read"})
+async def detect_anomalies(
+    ctx: Context,
+    counter_id: Annotated[str, Field(description="Counter ID")],
+    metrics: Annotated[list[str], Field(description="Metric names (max 20), e.g. ['ym:s:visits']")],
+    date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD (default: 90 days ago)")] = None,
+    date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD (default: today)")] = None,
+    dimensions: Annotated[list[str] | None, Field(description="Dimension names (max 10); each of the top_keys series is analyzed")] = None,
+    group: Annotated[str, Field(description="Time grouping: day|week|month|quarter|year")] = "day",
+    top_keys: Annotated[int, Field(description="Number of top series (1-30)", ge=1, le=30)] = 7,
+    window: Annotated[int, Field(description="Intervals in the rolling baseline", ge=2, le=365)] = 7,
+    season: Annotated[int | None, Field(description="Seasonal period in intervals, 0 to disable (default: 7 for day, 52 for week, 12 for month)", ge=0)] = None,
+    threshold: Annotated[float, Field(description="z-score at or above which a point is flagged", gt=0)] = 3.0,
+    max_points: Annotated[int, Field(description="Max flagged points returned, strongest first", ge=1, le=1000)] = 50,
+    output_format: OutputFormat = None,
+) -> str:
+    """Find spikes, drops, level shifts and trends in time series. Returns only flagged points, change points and a per-series trend summary instead of the raw series. Requires the analytics extra (numpy)."""
+    fetcher = await get_metrika_fetcher(ctx)
+    return await fetcher.detect_anomalies(counter_id, metrics, date_from, date_to, dimensions, group, top_keys, window, season, threshold, max_points, output_format=output_format)
+
+
+@mcp.tool(tags={"metrika", "read"})
+async def get_daily_series(
+    ctx: Context,
+    counter_id: Annotated[str, Field(description="Counter ID")],
+    days: Annotated[int, Field(description="Number of days up to and including today (counter time zone)", ge=1, le=1100)] = 30,
+    metrics: Annotated[list[str] | None, Field(description="Metric names (max 20) (default: YANDEX_SYNC_METRICS)")] = None,
+    dimensions: Annotated[list[str] | None, Field(description="Dimension names (max 10); the top 30 keys per fetched range are stored")] = None,
+    derived: Annotated[list[str] | None, Field(description="Derived columns appended to each row: share:M (percent of total), rank:M, cumsum:M, ratio:A/B, growth:M (percent change from previous day), rollingN:M (trailing N-day mean). Requires the analytics extra (numpy)")] = None,
+    output_format: OutputFormat = None,
+) -> str:
+    """Get a daily series for the last N days from the local daily store. Only days not yet stored, plus today and yesterday, are fetched from the API."""
+    fetcher = await get_metrika_fetcher(ctx)
+    return await fetcher.get_daily_series(counter_id, days, metrics, dimensions, derived, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -331,20 +409,22 @@ async def get_yandex_direct_experiment(
     ctx: Context,
     counter_id: Annotated[str, Field(description="Counter ID")],
     experiment_id: Annotated[int, Field(description="Yandex Direct experiment ID")],
+    output_format: OutputFormat = None,
 ) -> str:
     """Get bounce rate for specific Yandex Direct A/B experiments."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_yandex_direct_experiment(counter_id, experiment_id)
+    return await fetcher.get_yandex_direct_experiment(counter_id, experiment_id, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
 async def get_browsers_report(
     ctx: Context,
     counter_id: Annotated[str, Field(description="Counter ID")],
+    output_format: OutputFormat = None,
 ) -> str:
     """Get browsers report without accounting for browser version."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_browsers_report(counter_id)
+    return await fetcher.get_browsers_report(counter_id, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -357,10 +437,11 @@ async def get_drilldown(
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
     limit: Annotated[int | None, Field(description="Maximum rows to return")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Generate a single branch of a hierarchical tree-view report (drill-down)."""
     fetcher = await get_metrika_fetcher(ctx)
-    return await fetcher.get_drilldown(counter_id, dimensions, metrics, parent_id, date_from, date_to, limit)
+    return await fetcher.get_drilldown(counter_id, dimensions, metrics, parent_id, date_from, date_to, limit, output_format=output_format)
 
 
 @mcp.tool(tags={"metrika", "read"})
@@ -376,6 +457,7 @@ async def compare_segments(
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
     limit: Annotated[int | None, Field(description="Maximum rows to return")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Compare two user segments side by side in a table report."""
     fetcher = await get_metrika_fetcher(ctx)
@@ -384,6 +466,7 @@ async def compare_segments(
         segment_a_name, segment_a_filter,
         segment_b_name, segment_b_filter,
         date_from, date_to, limit,
+        output_format=output_format,
     )
 
 
@@ -401,6 +484,7 @@ async def compare_segments_drilldown(
     date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD")] = None,
     date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD")] = None,
     limit: Annotated[int | None, Field(description="Maximum rows to return")] = None,
+    output_format: OutputFormat = None,
 ) -> str:
     """Compare two segments in a hierarchical tree-view report with drill-down capability."""
     fetcher = await get_metrika_fetcher(ctx)
@@ -409,4 +493,134 @@ async def compare_segments_drilldown(
         segment_a_name, segment_a_filter,
         segment_b_name, segment_b_filter,
         parent_id, date_from, date_to, limit,
+        output_format=output_format,
     )
+
+
+@mcp.tool(tags={"metrika", "read"})
+async def compare_periods(
+    ctx: Context,
+    counter_id: Annotated[str, Field(description="Counter ID")],
+    metrics: Annotated[list[str], Field(description="Metric names (max 20), e.g. ['ym:s:visits', 'ym:s:users']")],
+    dimensions: Annotated[list[str] | None, Field(description="Dimension names (max 10); rows are matched across periods by dimension values")] = None,
+    date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD (default: 7 days ago)")] = None,
+    date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD (default: today)")] = None,
+    compare_to: Annotated[Literal["previous", "year_ago"], Field(description="previous: the same number of days just before date_from; year_ago: the same dates one year earlier")] = "previous",
+    filters: Annotated[str | None, Field(description="Filter expression applied to both periods, e.g. \"ym:s:trafficSource=='organic'\"")] = None,
+    limit: Annotated[int | None, Field(description="Max rows per period", ge=1, le=100000)] = None,
+    output_format: OutputFormat = None,
+) -> str:
+    """Compare a date range with the previous period or the same period a year ago. Both ranges are fetched concurrently; each row carries current, previous, delta and delta_pct values per metric."""
+    fetcher = await get_metrika_fetcher(ctx)
+    return await fetcher.compare_periods(counter_id, metrics, dimensions, date_from, date_to, compare_to, filters, limit, output_format=output_format)
+
+
+# ─── Batch & Portfolio ────────────────────────────────────────────────────────
+
+@mcp.tool(tags={"metrika", "read"})
+async def batch_query(
+    ctx: Context,
+    queries: Annotated[list[BatchQuery], Field(description="Report calls to run concurrently (max 50), each with a tool name and its arguments", min_length=1, max_length=50)],
+    output_format: OutputFormat = None,
+) -> str:
+    """Run several report tools concurrently in one call. A failing query is reported in its own entry without failing the batch."""
+    fetcher = await get_metrika_fetcher(ctx)
+    return await fetcher.batch_query([q.model_dump() for q in queries], output_format=output_format)
+
+
+@mcp.tool(tags={"metrika", "read"})
+async def get_counters_report(
+    ctx: Context,
+    metrics: Annotated[list[str], Field(description="Metric names (max 20), e.g. ['ym:s:visits', 'ym:s:bounceRate']")],
+    dimensions: Annotated[list[str] | None, Field(description="Dimension names (max 9); the counter is always the first dimension")] = None,
+    date_from: Annotated[str | None, Field(description="Start date YYYY-MM-DD (default: 7 days ago)")] = None,
+    date_to: Annotated[str | None, Field(description="End date YYYY-MM-DD (default: today)")] = None,
+    search: Annotated[str | None, Field(description="Only counters whose name or site matches this text")] = None,
+    counter_ids: Annotated[list[str] | None, Field(description="Explicit counter IDs (default: every counter available to the token)")] = None,
+    limit: Annotated[int | None, Field(description="Max rows per counter", ge=1, le=100000)] = None,
+    derived: Annotated[list[str] | None, Field(description="Derived columns appended to each row: share:M (percent of total), rank:M, cumsum:M, ratio:A/B. Requires the analytics extra (numpy)")] = None,
+    output_format: OutputFormat = None,
+) -> str:
+    """Run one report across many counters concurrently and merge it into a single table keyed by counter."""
+    fetcher = await get_metrika_fetcher(ctx)
+    return await fetcher.get_counters_report(metrics, dimensions, date_from, date_to, search, counter_ids, limit, derived, output_format=output_format)
+
+
+# ─── Logs API ─────────────────────────────────────────────────────────────────
+
+@mcp.tool(tags={"metrika", "write"})
+async def export_logs(
+    ctx: Context,
+    counter_id: Annotated[str, Field(description="Counter ID")],
+    date_from: Annotated[str, Field(description="Start date YYYY-MM-DD")],
+    date_to: Annotated[str, Field(description="End date YYYY-MM-DD (must be before today)")],
+    fields: Annotated[list[str], Field(description="Logs API fields, e.g. ['ym:s:visitID', 'ym:s:date', 'ym:s:startURL']", min_length=1)],
+    source: Annotated[Literal["visits", "hits"], Field(description="Export visits (ym:s:*) or hits (ym:pv:*)")] = "visits",
+    wait_timeout: Annotated[float | None, Field(description="Seconds to wait for Metrika to prepare the logs (default: YANDEX_LOGS_WAIT_TIMEOUT)", ge=0)] = None,
+    clean_after: Annotated[bool, Field(description="Delete the log request on Metrika after downloading to free log quota")] = True,
+    output_format: OutputFormat = None,
+) -> str:
+    """Export raw visits or hits through the Logs API to TSV files on the server. Parts download in parallel; calling again with the same arguments resumes an interrupted or unfinished export."""
+    fetcher = await get_metrika_fetcher(ctx)
+    return await fetcher.export_logs(counter_id, date_from, date_to, fields, source, wait_timeout, clean_after, output_format=output_format)
+
+
+@mcp.tool(tags={"metrika", "read"})
+async def list_log_exports(
+    ctx: Context,
+    output_format: OutputFormat = None,
+) -> str:
+    """List Logs API exports stored on the server and their IDs for query_logs."""
+    fetcher = await get_metrika_fetcher(ctx)
+    return await fetcher.list_log_exports(output_format=output_format)
+
+
+@mcp.tool(tags={"metrika", "read"})
+async def query_logs(
+    ctx: Context,
+    export_id: Annotated[str, Field(description="Export ID from export_logs or list_log_exports, e.g. '12345/3f2a9c0d1b7e4a65'")],
+    group_by: Annotated[list[str] | None, Field(description="Log fields to group by, e.g. ['ym:s:startURL']")] = None,
+    aggregates: Annotated[list[str] | None, Field(description="Aggregates: 'count' or func:field with func in sum|avg|min|max|uniq, e.g. ['count', 'uniq:ym:s:clientID'] (default: ['count'])")] = None,
+    filters: Annotated[list[str] | None, Field(description="Conditions ANDed together: field op value with op in == != > >= < <= =@ (contains), e.g. ['ym:s:date>=2024-01-10', 'ym:s:startURL=@/blog/']")] = None,
+    order_by: Annotated[str | None, Field(description="Aggregate to sort by, '-' prefix for descending (default: first aggregate, descending)")] = None,
+    limit: Annotated[int, Field(description="Max rows to return", ge=1, le=100000)] = 100,
+    output_format: OutputFormat = None,
+) -> str:
+    """Run an unsampled filtered group-by over a downloaded log export locally, without API quota. Requires the analytics extra (numpy)."""
+    fetcher = await get_metrika_fetcher(ctx)
+    return await fetcher.query_logs(export_id, group_by, aggregates, filters, order_by, limit, output_format=output_format)
+
+
+# ─── Server Diagnostics ───────────────────────────────────────────────────────
+
+@mcp.tool(tags={"metrika", "read"})
+async def get_client_stats(
+    ctx: Context,
+    output_format: OutputFormat = None,
+) -> str:
+    """Get runtime statistics of the Metrika client, such as response cache hits and misses."""
+    fetcher = await get_metrika_fetcher(ctx)
+    return await fetcher.get_client_stats(output_format=output_format)
+
+
+@mcp.tool(tags={"metrika", "read"})
+async def invalidate_metadata_cache(
+    ctx: Context,
+    counter_id: Annotated[str | None, Field(description="Counter whose cached settings and goals to drop (default: all counters)")] = None,
+    output_format: OutputFormat = None,
+) -> str:
+    """Drop cached counter and goal metadata, e.g. after changing goals, so the next call fetches it fresh."""
+    fetcher = await get_metrika_fetcher(ctx)
+    return await fetcher.invalidate_metadata_cache(counter_id, output_format=output_format)
+
+
+@mcp.tool(tags={"metrika", "read"})
+async def get_recent_traces(
+    ctx: Context,
+    limit: Annotated[int, Field(description="Max traces to return, newest first", ge=1, le=100)] = 20,
+    min_duration_ms: Annotated[float, Field(description="Only traces at least this long (ms)", ge=0)] = 0,
+    output_format: OutputFormat = None,
+) -> str:
+    """Show recent tool-call traces with time spent in each upstream attempt, rate limiter wait, retry sleep and serialization. Empty unless YANDEX_TRACING=memory."""
+    fetcher = await get_metrika_fetcher(ctx)
+    return await fetcher.get_recent_traces(limit, min_duration_ms, output_format=output_format)
@@ -0,0 +1,251 @@
+"""SQLite store of per-counter daily aggregates with incremental sync state."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily (
+    counter_id TEXT NOT NULL,
+    series TEXT NOT NULL,
+    day TEXT NOT NULL,
+    dims_key TEXT NOT NULL,
+    dimensions TEXT NOT NULL,
+    metrics TEXT NOT NULL,
+    PRIMARY KEY (counter_id, series, day, dims_key)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    counter_id TEXT NOT NULL,
+    series TEXT NOT NULL,
+    low_water TEXT NOT NULL,
+    high_water TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (counter_id, series)
+);
+"""
+
+# Days Metrika may still revise: today is incomplete and yesterday's data can
+# keep arriving for a while after midnight.
+REFRESH_DAYS = 2
+
+
+def series_key(metrics: list[str], dimensions: list[str]) -> str:
+    """Identify a (dimensions, metrics) combination stored for a counter."""
+    raw = ",".join(dimensions) + "|" + ",".join(metrics)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def missing_ranges(
+    start: date, today: date, synced: tuple[date, date] | None
+) -> list[tuple[date, date]]:
+    """Date ranges to fetch so that ``start..today`` is stored and current.
+
+    Only days outside the synced ``(low_water, high_water)`` span are fetched,
+    plus the last ``REFRESH_DAYS`` days, which are always re-fetched. The synced
+    span is kept contiguous.
+    """
+    if synced is None:
+        return [(start, today)]
+    low, high = synced
+    ranges = []
+    if start < low:
+        ranges.append((start, low - timedelta(days=1)))
+    # Continue from the high-water mark even if the window starts later, so the
+    # stored span never has gaps.
+    tail_start = min(high + timedelta(days=1), today - timedelta(days=REFRESH_DAYS - 1))
+    ranges.append((tail_start, today))
+    return ranges
+
+
+def dims_key(dimensions: list[Any]) -> str:
+    """Stable key of a row's dimension combination (ids, or names without ids)."""
+    return json.dumps(
+        [d.get("id", d.get("name")) if isinstance(d, dict) else d for d in dimensions],
+        ensure_ascii=False,
+    )
+
+
+def bytime_to_daily(report: dict[str, Any]) -> list[tuple[str, list[Any], list[Any]]]:
+    """Flatten a ``group=day`` bytime report into (day, dimensions, metrics) rows."""
+    days = [
+        interval[0] if isinstance(interval, list) else interval
+        for interval in report.get("time_intervals", [])
+    ]
+    rows = []
+    for row in report.get("data", []):
+        dimensions = row.get("dimensions", [])
+        for i, day in enumerate(days):
+            rows.append((day, dimensions, [series[i] for series in row["metrics"]]))
+    return rows
+
+
+class DailyStore:
+    """Per-counter daily rows plus a low/high-water mark per stored series.
+
+    Blocking SQLite work runs in a worker thread, as in DiskCache.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=10, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def synced_range_sync(
+        self, counter_id: str, series: str
+    ) -> tuple[date, date] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT low_water, high_water FROM sync_state "
+                "WHERE counter_id = ? AND series = ?",
+                (counter_id, series),
+            ).fetchone()
+        if row is None:
+            return None
+        return date.fromisoformat(row[0]), date.fromisoformat(row[1])
+
+    def store_range_sync(
+        self,
+        counter_id: str,
+        series: str,
+        start: date,
+        end: date,
+        rows: list[tuple[str, list[Any], list[Any]]],
+    ) -> None:
+        """Replace every stored row in ``start..end`` and widen the synced span."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "DELETE FROM daily WHERE counter_id = ? AND series = ? "
+                    "AND day BETWEEN ? AND ?",
+                    (counter_id, series, start.isoformat(), end.isoformat()),
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO daily VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (counter_id, series, day, dims_key(dims),
+                         json.dumps(dims, ensure_ascii=False), json.dumps(metrics))
+                        for day, dims, metrics in rows
+                    ],
+                )
+                self._conn.execute(
+                    "INSERT INTO sync_state VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (counter_id, series) DO UPDATE SET "
+                    "low_water = MIN(low_water, excluded.low_water), "
+                    "high_water = MAX(high_water, excluded.high_water), "
+                    "updated_at = excluded.updated_at",
+                    (
+                        counter_id,
+                        series,
+                        start.isoformat(),
+                        end.isoformat(),
+                        time.time(),
+                    ),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def keys_sync(self, counter_id: str, series: str) -> set[str]:
+        """Dimension combinations stored for a series on any day."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT dims_key FROM daily "
+                "WHERE counter_id = ? AND series = ?",
+                (counter_id, series),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def read_sync(
+        self, counter_id: str, series: str, start: date, end: date
+    ) -> list[tuple[str, list[Any], list[Any]]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, dimensions, metrics FROM daily "
+                "WHERE counter_id = ? AND series = ? AND day BETWEEN ? AND ? "
+                "ORDER BY day",
+                (counter_id, series, start.isoformat(), end.isoformat()),
+            ).fetchall()
+        return [
+            (day, json.loads(dims), json.loads(metrics)) for day, dims, metrics in rows
+        ]
+
+    async def synced_range(
+        self, counter_id: str, series: str
+    ) -> tuple[date, date] | None:
+        return await asyncio.to_thread(self.synced_range_sync, counter_id, series)
+
+    async def store_range(
+        self,
+        counter_id: str,
+        series: str,
+        start: date,
+        end: date,
+        rows: list[tuple[str, list[Any], list[Any]]],
+    ) -> None:
+        await asyncio.to_thread(
+            self.store_range_sync, counter_id, series, start, end, rows
+        )
+
+    async def keys(self, counter_id: str, series: str) -> set[str]:
+        return await asyncio.to_thread(self.keys_sync, counter_id, series)
+
+    async def read(
+        self, counter_id: str, series: str, start: date, end: date
+    ) -> list[tuple[str, list[Any], list[Any]]]:
+        return await asyncio.to_thread(self.read_sync, counter_id, series, start, end)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def daily_report(
+    rows: list[tuple[str, list[Any], list[Any]]],
+    start: date,
+    end: date,
+    metrics: list[str],
+    dimensions: list[str],
+) -> dict[str, Any]:
+    """Assemble stored rows into a bytime-shaped report covering ``start..end``.
+
+    Days on which a dimension combination has no stored row are left as None,
+    as in merged date shards: the value is unknown rather than zero.
+    """
+    days = [
+        (start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)
+    ]
+    index = {day: i for i, day in enumerate(days)}
+    series: dict[str, dict[str, Any]] = {}
+    for day, dims, values in rows:
+        entry = series.setdefault(
+            dims_key(dims),
+            {"dimensions": dims, "metrics": [[None] * len(days) for _ in metrics]},
+        )
+        for m, value in enumerate(values):
+            entry["metrics"][m][index[day]] = value
+    return {
+        "query": {
+            "dimensions": dimensions,
+            "metrics": metrics,
+            "date1": start.isoformat(),
+            "date2": end.isoformat(),
+            "group": "day",
+        },
+        "data": list(series.values()),
+        "time_intervals": [[day, day] for day in days],
+        "total_rows": len(series),
+    }
@@ -0,0 +1,820 @@
+"""Local stand-in for the Metrika API, for load tests that must not spend quota.
+
+Serves the report endpoints (``/stat/v1/data`` and its ``bytime``,
+``drilldown``, ``comparison`` and ``comparison/drilldown`` variants) and the
+management endpoints for counters and goals as a Starlette app. Point the
+server at it with ``YANDEX_API_BASE``::
+
+    python -m ya_metrics_mcp.testing.fake_api --port 8081 --counters 5 --urls 50000
+    YANDEX_API_BASE=http://127.0.0.1:8081 YANDEX_API_KEY=fake ya-metrics-mcp
+
+Data is synthetic but consistent: the same request always returns the same
+numbers, additive metrics (visits, users, pageviews, goal reaches, ...) of the
+rows sum to the report totals, bytime intervals sum to the range totals, and
+drilldown children sum to their parent. Rate metrics (bounce rate, depth,
+conversion rates, ...) are stable per row. Report presets used by the server's
+tools resolve to their default dimensions and metrics. Filters, segments and
+sorting are not interpreted; rows come in a fixed order, most visited members
+first.
+
+Faults can be injected per request: added latency, 5xx errors and 429
+responses, either at random or once a requests-per-second limit is exceeded.
+``GET /_fake/stats`` reports the requests served and the faults injected.
+Logs API endpoints are not emulated.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import zlib
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+_DAYS_AGO_PATTERN = re.compile(r"^(\d+)daysAgo$")
+_GOAL_METRIC = re.compile(r"^goal(\d+)(\w+)$")
+_COUNTER_ID_BASE = 10_000_000
+_GOAL_ID_BASE = 100_000
+_MAX_LIMIT = 100_000
+GROUPS = ("day", "week", "month", "quarter", "year")
+
+_CITIES = [
+    "Москва", "Санкт-Петербург", "Новосибирск", "Екатеринбург", "Казань",
+    "Нижний Новгород", "Челябинск", "Самара", "Омск", "Ростов-на-Дону",
+]
+_COUNTRIES = ["Россия", "Беларусь", "Казахстан", "Узбекистан", "Германия", "США"]
+_PHRASE_WORDS = [
+    "купить", "цена", "отзывы", "доставка", "недорого", "москва", "официальный сайт",
+    "интернет магазин", "скидки", "каталог", "как выбрать", "сравнение",
+]
+_PRODUCTS = ["диван", "кресло", "стол", "шкаф", "кровать", "комод", "стул", "полка"]
+# Dimension name suffix -> fixed member names; URL and phrase members scale.
+_FIXED_MEMBERS = {
+    "SearchEngine": ["Яндекс", "Google", "Mail.ru", "Bing", "DuckDuckGo"],
+    "TrafficSource": [
+        "organic", "direct", "ad", "referral", "social", "internal", "email",
+    ],
+    "CityName": _CITIES,
+    "City": _CITIES,
+    "CountryName": _COUNTRIES,
+    "Country": _COUNTRIES,
+    "deviceCategory": ["desktop", "mobile", "tablet", "tv"],
+    "isMobile": ["No", "Yes"],
+    "browser": ["Yandex Browser", "Chrome", "Safari", "Firefox", "Edge", "Opera"],
+    "operatingSystemRoot": ["Android", "Windows", "iOS", "macOS", "Linux"],
+    "gender": ["female", "male"],
+    "ageInterval": ["18-24", "25-34", "35-44", "45-54", "55+", "<18"],
+    "isNewUser": ["No", "Yes"],
+    "isRobot": ["No", "Yes"],
+}
+_DEFAULT_MEMBERS = 20
+# Rate metric short name -> (low, high) range.
+_RATE_METRICS = {
+    "bounceRate": (15.0, 45.0),
+    "pageDepth": (1.5, 4.5),
+    "avgVisitDurationSeconds": (40.0, 320.0),
+    "percentNewVisitors": (20.0, 65.0),
+    "robotPercentage": (0.5, 8.0),
+    "conversionRate": (0.5, 9.0),
+    "avgDaysBetweenVisits": (1.0, 20.0),
+    "avgPublisherArticleViewDurationSeconds": (30.0, 240.0),
+}
+# Additive metric short name -> visits multiplier.
+_ADDITIVE_METRICS = {
+    "visits": 1.0,
+    "users": 0.78,
+    "newUsers": 0.41,
+    "pageviews": 2.6,
+    "hits": 2.9,
+    "publisherviews": 1.9,
+    "publisherusers": 0.7,
+}
+_BASIC_METRICS = (
+    "ym:s:visits,ym:s:users,ym:s:bounceRate,ym:s:pageDepth,ym:s:avgVisitDurationSeconds"
+)
+_PUBLISHER_METRICS = (
+    "ym:s:publisherviews,ym:s:publisherusers,ym:s:avgPublisherArticleViewDurationSeconds"
+)
+# Preset -> default (dimensions, metrics); explicit parameters take precedence.
+PRESETS = {
+    "sources_summary": ("ym:s:lastTrafficSource,ym:s:lastSourceEngine", _BASIC_METRICS),
+    "sources_search_phrases": (
+        "ym:s:lastSearchPhrase,ym:s:lastSearchEngine", _BASIC_METRICS
+    ),
+    "tech_platforms": ("ym:s:operatingSystemRoot,ym:s:browser", _BASIC_METRICS),
+    "publishers_sources": ("ym:s:publisherTrafficSource", _PUBLISHER_METRICS),
+    "publishers_rubrics": ("ym:s:publisherArticleRubric", _PUBLISHER_METRICS),
+    "publishers_authors": ("ym:s:publisherArticleAuthor", _PUBLISHER_METRICS),
+    "publishers_thematics": ("ym:s:publisherArticleThematic", _PUBLISHER_METRICS),
+}
+
+
+@dataclass
+class FakeScale:
+    """Size of the synthetic dataset."""
+
+    counters: int = 3
+    goals: int = 5
+    urls: int = 1_000
+    search_phrases: int = 500
+    daily_visits: int = 10_000
+    seed: int = 0
+
+
+@dataclass
+class FaultInjection:
+    """Faults applied before a request is answered.
+
+    ``error_rate`` and ``throttle_rate`` are fractions of requests answered with
+    a 500/502/503 and a 429 respectively; ``max_rps`` answers 429 once more than
+    that many requests arrived in the last second (0 disables it).
+    """
+
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    max_rps: float = 0.0
+    retry_after: float = 1.0
+    seed: int = 0
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, error_type: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.error_type = error_type
+        self.message = message
+
+
+def _unit(*parts: Any) -> float:
+    """Deterministic pseudo-random number in [0, 1) for ``parts``."""
+    return zlib.crc32("|".join(map(str, parts)).encode()) / 2**32
+
+
+def resolve_date(value: str, today: date) -> date:
+    if value == "today":
+        return today
+    if value == "yesterday":
+        return today - timedelta(days=1)
+    match = _DAYS_AGO_PATTERN.match(value)
+    if match:
+        return today - timedelta(days=int(match.group(1)))
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        message = f"Wrong date format: {value}"
+        raise ApiError(400, "invalid_parameter", message) from None
+
+
+def _interval_start(day: date, group: str) -> date:
+    if group == "week":
+        return day - timedelta(days=day.weekday())
+    if group == "month":
+        return day.replace(day=1)
+    if group == "quarter":
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    if group == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def split_intervals(start: date, end: date, group: str) -> list[list[date]]:
+    """Days of ``start..end`` grouped into day/week/month/quarter/year intervals."""
+    intervals: list[list[date]] = []
+    day = start
+    while day <= end:
+        start_of = _interval_start(day, group)
+        if not intervals or start_of != _interval_start(intervals[-1][0], group):
+            intervals.append([])
+        intervals[-1].append(day)
+        day += timedelta(days=1)
+    return intervals
+
+
+class FakeDataset:
+    """Counters, goals and deterministic report figures at a given scale."""
+
+    def __init__(self, scale: FakeScale) -> None:
+        self.scale = scale
+        self.counters: list[dict[str, Any]] = [
+            {
+                "id": _COUNTER_ID_BASE + i + 1,
+                "name": f"Demo site {i + 1}",
+                "site": f"site{i + 1}.example.ru",
+                "status": "Active",
+                "permission": "own",
+                "type": "simple",
+                "create_time": "2020-01-01T00:00:00+03:00",
+                "time_zone_name": "Europe/Moscow",
+            }
+            for i in range(scale.counters)
+        ]
+        self._by_id = {c["id"]: i for i, c in enumerate(self.counters)}
+        self._members: dict[str, list[tuple[str, str]]] = {}
+        self._weights: dict[int, list[float]] = {}
+
+    # -- management ------------------------------------------------------
+
+    def counter(self, counter_id: int) -> dict[str, Any]:
+        index = self._by_id.get(counter_id)
+        if index is None:
+            raise ApiError(404, "not_found", f"Counter {counter_id} not found")
+        return self.counters[index]
+
+    def goals(self, counter_id: int) -> list[dict[str, Any]]:
+        self.counter(counter_id)
+        index = self._by_id[counter_id]
+        return [
+            {
+                "id": _GOAL_ID_BASE + index * 100 + j + 1,
+                "name": f"Goal {j + 1}",
+                "type": "url",
+                "is_retargeting": 0,
+                "conditions": [{"type": "contain", "url": f"/checkout/step-{j + 1}"}],
+            }
+            for j in range(self.scale.goals)
+        ]
+
+    # -- dimensions ------------------------------------------------------
+
+    def members(self, dimension: str) -> list[tuple[str, str]]:
+        """``(id, name)`` pairs of a dimension, most visited first."""
+        short = dimension.rsplit(":", 1)[-1]
+        cached = self._members.get(short)
+        if cached is not None:
+            return cached
+        if "URL" in short or short.endswith(("Page", "Path")):
+            members = [
+                (str(i), f"/catalog/{_PRODUCTS[i % len(_PRODUCTS)]}/item-{i}")
+                for i in range(self.scale.urls)
+            ]
+        elif "Phrase" in short:
+            members = [
+                (str(i), self._phrase(i)) for i in range(self.scale.search_phrases)
+            ]
+        else:
+            lowered = short.lower()
+            names = next(
+                (v for suffix, v in _FIXED_MEMBERS.items()
+                 if lowered.endswith(suffix.lower())),
+                [f"{short} {i + 1}" for i in range(_DEFAULT_MEMBERS)],
+            )
+            members = [(str(i), name) for i, name in enumerate(names)]
+        self._members[short] = members
+        return members
+
+    def _phrase(self, i: int) -> str:
+        product = _PRODUCTS[i % len(_PRODUCTS)]
+        first = _PHRASE_WORDS[(i // len(_PRODUCTS)) % len(_PHRASE_WORDS)]
+        rest = i // (len(_PRODUCTS) * len(_PHRASE_WORDS))
+        phrase = f"{first} {product}"
+        if not rest:
+            return phrase
+        return f"{phrase} {_PHRASE_WORDS[rest % len(_PHRASE_WORDS)]} {rest}"
+
+    def weights(self, size: int) -> list[float]:
+        """Zipf shares of ``size`` members; they sum to 1."""
+        cached = self._weights.get(size)
+        if cached is None:
+            raw = [1 / (i + 1) for i in range(size)]
+            total = sum(raw)
+            cached = self._weights[size] = [w / total for w in raw]
+        return cached
+
+    # -- figures ---------------------------------------------------------
+
+    def daily_visits(self, counter_id: int, day: date) -> float:
+        index = self._by_id[counter_id]
+        weekend = 0.7 if day.weekday() >= 5 else 1.0
+        trend = 1 + 0.0005 * (day - date(2020, 1, 1)).days
+        noise = 0.9 + 0.2 * _unit(self.scale.seed, counter_id, day)
+        return self.scale.daily_visits / (index + 1) * weekend * trend * noise
+
+    def visits(self, counter_ids: list[int], days: list[date]) -> float:
+        return sum(self.daily_visits(c, d) for c in counter_ids for d in days)
+
+    def metric(self, name: str, visits: float, key: str) -> float:
+        """Value of metric ``name`` for a row with ``visits`` visits.
+
+        ``key`` identifies the row, so that rate metrics are stable for it.
+        """
+        short = name.rsplit(":", 1)[-1]
+        goal = _GOAL_METRIC.match(short)
+        if goal is not None:
+            rate = 0.5 + 8.5 * _unit(self.scale.seed, goal.group(1))
+            if goal.group(2) in ("conversionRate", "ConversionRate"):
+                return round(rate, 6)
+            return round(visits * rate / 100, 4)
+        if short in _ADDITIVE_METRICS:
+            return round(visits * _ADDITIVE_METRICS[short], 4)
+        if short in _RATE_METRICS:
+            low, high = _RATE_METRICS[short]
+            return round(low + (high - low) * _unit(self.scale.seed, short, key), 6)
+        # Unknown metrics are treated as additive, at a fixed fraction of visits.
+        return round(visits * (0.05 + _unit(self.scale.seed, short)), 4)
+
+    def metric_values(
+        self, metrics: list[str], visits: float, key: str
+    ) -> list[float]:
+        return [self.metric(m, visits, key) for m in metrics]
+
+
+def _split(value: str | None) -> list[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def _missing(name: str) -> ApiError:
+    return ApiError(400, "invalid_parameter", f"Required parameter {name} is missing")
+
+
+def _page_of(
+    members: list[tuple[str, str]], weights: list[float], offset: int, limit: int
+) -> list[tuple[tuple[str, str], float]]:
+    """Members and weights of the 1-based ``offset``/``limit`` page."""
+    pairs = list(zip(members, weights, strict=True))
+    return pairs[offset - 1:offset - 1 + limit]
+
+
+def _parse_parent(value: str | None) -> list[str]:
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return _split(value)
+    return [str(p) for p in parsed] if isinstance(parsed, list) else [str(parsed)]
+
+
+class FakeMetrika:
+    """Starlette app answering Metrika API requests from a :class:`FakeDataset`."""
+
+    def __init__(
+        self,
+        scale: FakeScale | None = None,
+        faults: FaultInjection | None = None,
+        today: date | None = None,
+    ) -> None:
+        self.data = FakeDataset(scale or FakeScale())
+        self.faults = faults or FaultInjection()
+        self.today = today
+        self.requests: Counter[str] = Counter()
+        self.injected: Counter[str] = Counter()
+        self._rng = random.Random(self.faults.seed)
+        self._recent: deque[float] = deque()
+        counter = "/management/v1/counter/{counter_id:int}"
+        self.app = Starlette(routes=[
+            Route("/stat/v1/data", self._endpoint(self.report)),
+            Route("/stat/v1/data/bytime", self._endpoint(self.bytime)),
+            Route("/stat/v1/data/drilldown", self._endpoint(self.drilldown)),
+            Route("/stat/v1/data/comparison", self._endpoint(self.comparison)),
+            Route(
+                "/stat/v1/data/comparison/drilldown",
+                self._endpoint(self.comparison_drilldown),
+            ),
+            Route("/management/v1/counters", self._endpoint(self.list_counters)),
+            Route(counter, self._endpoint(self.get_counter)),
+            Route(f"{counter}/goals", self._endpoint(self.list_goals)),
+            Route("/_fake/stats", self.stats),
+        ])
+
+    # -- request handling ------------------------------------------------
+
+    def _endpoint(
+        self, build: Callable[[Request], dict[str, Any]]
+    ) -> Callable[[Request], Awaitable[JSONResponse]]:
+        async def endpoint(request: Request) -> JSONResponse:
+            self.requests[request.url.path] += 1
+            try:
+                if not request.headers.get("Authorization", "").startswith("OAuth "):
+                    raise ApiError(403, "invalid_token", "Access is denied")
+                await self._inject_faults()
+                return JSONResponse(build(request))
+            except ApiError as exc:
+                headers = {}
+                if exc.status == 429:
+                    headers["Retry-After"] = f"{self.faults.retry_after:g}"
+                error = {"error_type": exc.error_type, "message": exc.message}
+                return JSONResponse(
+                    {
+                        "errors": [error],
+                        "code": exc.status,
+                        "message": exc.message,
+                    },
+                    status_code=exc.status,
+                    headers=headers,
+                )
+
+        return endpoint
+
+    async def _inject_faults(self) -> None:
+        faults = self.faults
+        delay = faults.latency_ms + faults.latency_jitter_ms * self._rng.random()
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if faults.max_rps > 0:
+            now = time.monotonic()
+            while self._recent and self._recent[0] <= now - 1:
+                self._recent.popleft()
+            if len(self._recent) >= faults.max_rps:
+                self.injected["429"] += 1
+                raise ApiError(
+                    429, "quota_requests_by_ip", "Too many requests per second"
+                )
+            self._recent.append(now)
+        roll = self._rng.random()
+        if roll < faults.throttle_rate:
+            self.injected["429"] += 1
+            raise ApiError(429, "quota_requests_by_uid", "Quota exceeded")
+        if roll < faults.throttle_rate + faults.error_rate:
+            status = self._rng.choice((500, 502, 503))
+            self.injected[str(status)] += 1
+            raise ApiError(status, "backend_error", "Injected server error")
+
+    async def stats(self, request: Request) -> JSONResponse:
+        return JSONResponse({
+            "requests": dict(self.requests),
+            "requests_total": sum(self.requests.values()),
+            "injected": dict(self.injected),
+        })
+
+    # -- report parameters -----------------------------------------------
+
+    def _counters(self, request: Request) -> list[int]:
+        raw = request.query_params.get("ids") or request.query_params.get("id")
+        if not raw:
+            raise _missing("ids")
+        try:
+            ids = [int(value) for value in _split(raw)]
+        except ValueError:
+            message = f"Wrong counter ids: {raw}"
+            raise ApiError(400, "invalid_parameter", message) from None
+        for counter_id in ids:
+            self.data.counter(counter_id)
+        return ids
+
+    def _days(self, request: Request) -> list[date]:
+        today = self.today or date.today()
+        start = resolve_date(request.query_params.get("date1", "6daysAgo"), today)
+        end = resolve_date(request.query_params.get("date2", "today"), today)
+        if start > end:
+            raise ApiError(400, "invalid_parameter", "date1 must not be after date2")
+        return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    @staticmethod
+    def _preset(request: Request) -> tuple[str, str]:
+        """Default ``(dimensions, metrics)`` of the request's preset, if any."""
+        name = request.query_params.get("preset")
+        if name is None:
+            return "", ""
+        if name not in PRESETS:
+            raise ApiError(400, "invalid_parameter", f"Unknown preset: {name}")
+        return PRESETS[name]
+
+    def _metrics(self, request: Request) -> list[str]:
+        metrics = _split(
+            request.query_params.get("metrics") or self._preset(request)[1]
+        )
+        if not metrics:
+            raise _missing("metrics")
+        if len(metrics) > 20:
+            raise ApiError(400, "invalid_parameter", "Maximum 20 metrics allowed")
+        return metrics
+
+    @staticmethod
+    def _page(request: Request, default_limit: int = 100) -> tuple[int, int]:
+        try:
+            offset = int(request.query_params.get("offset", "1"))
+            limit = int(request.query_params.get("limit", str(default_limit)))
+        except ValueError:
+            message = "offset and limit must be integers"
+            raise ApiError(400, "invalid_parameter", message) from None
+        if offset < 1 or not 1 <= limit <= _MAX_LIMIT:
+            raise ApiError(400, "invalid_parameter", f"limit must be 1..{_MAX_LIMIT}")
+        return offset, limit
+
+    def _query(self, request: Request, **extra: Any) -> dict[str, Any]:
+        params = request.query_params
+        days = self._days(request)
+        query: dict[str, Any] = {
+            "ids": self._counters(request),
+            "dimensions": _split(params.get("dimensions") or self._preset(request)[0]),
+            "metrics": self._metrics(request),
+            "date1": days[0].isoformat(),
+            "date2": days[-1].isoformat(),
+            **extra,
+        }
+        if "preset" in params:
+            query["preset"] = params["preset"]
+        return query
+
+    # -- row enumeration -------------------------------------------------
+
+    def _rows(
+        self, dimensions: list[str], start: int, count: int
+    ) -> list[tuple[list[Any], float]]:
+        """Rows ``start..start+count`` of the dimension cross product, with shares.
+
+        Rows are enumerated in mixed-radix order, which for one dimension is also
+        descending share order.
+        """
+        members = [self.data.members(d) for d in dimensions]
+        weights = [self.data.weights(len(m)) for m in members]
+        total = math.prod(len(m) for m in members)
+        rows = []
+        for index in range(start, min(start + count, total)):
+            picked, share = [], 1.0
+            pairs = zip(reversed(members), reversed(weights), strict=True)
+            for dim_members, dim_weights in pairs:
+                index, position = divmod(index, len(dim_members))
+                picked.append(dim_members[position])
+                share *= dim_weights[position]
+            rows.append((picked[::-1], share))
+        return rows
+
+    @staticmethod
+    def _total_rows(members: list[list[Any]]) -> int:
+        return math.prod(len(m) for m in members)
+
+    @staticmethod
+    def _dimension(member: tuple[str, str]) -> dict[str, str]:
+        return {"id": member[0], "name": member[1]}
+
+    @staticmethod
+    def _key(picked: list[tuple[str, str]]) -> str:
+        return "/".join(name for _, name in picked) or "total"
+
+    # -- report endpoints ------------------------------------------------
+
+    def report(self, request: Request) -> dict[str, Any]:
+        offset, limit = self._page(request)
+        query = self._query(request, offset=offset, limit=limit)
+        dimensions, metrics = query["dimensions"], query["metrics"]
+        visits = self.data.visits(query["ids"], self._days(request))
+        rows = self._rows(dimensions, offset - 1, limit)
+        return {
+            "query": query,
+            "data": [
+                {
+                    "dimensions": [self._dimension(m) for m in picked],
+                    "metrics": self.data.metric_values(
+                        metrics, visits * share, self._key(picked)
+                    ),
+                }
+                for picked, share in rows
+            ],
+            "total_rows": self._total_rows([self.data.members(d) for d in dimensions]),
+            "total_rows_rounded": False,
+            "sampled": False,
+            "contains_sensitive_data": False,
+            "data_lag": 0,
+            "totals": self.data.metric_values(metrics, visits, "total"),
+        }
+
+    def bytime(self, request: Request) -> dict[str, Any]:
+        group = request.query_params.get("group", "day")
+        if group not in GROUPS:
+            raise ApiError(400, "invalid_parameter", f"group must be one of {GROUPS}")
+        try:
+            top_keys = int(request.query_params.get("top_keys", "7"))
+        except ValueError:
+            message = "top_keys must be an integer"
+            raise ApiError(400, "invalid_parameter", message) from None
+        query = self._query(request, group=group, top_keys=top_keys)
+        dimensions, metrics = query["dimensions"], query["metrics"]
+        start, end = (date.fromisoformat(query[k]) for k in ("date1", "date2"))
+        intervals = split_intervals(start, end, group)
+        interval_visits = [self.data.visits(query["ids"], d) for d in intervals]
+        series_count = min(max(top_keys, 1), 30)
+
+        def series(share: float, key: str) -> list[list[float]]:
+            return [
+                [self.data.metric(m, v * share, key) for v in interval_visits]
+                for m in metrics
+            ]
+
+        return {
+            "query": query,
+            "data": [
+                {
+                    "dimensions": [self._dimension(m) for m in picked],
+                    "metrics": series(share, self._key(picked)),
+                }
+                for picked, share in self._rows(dimensions, 0, series_count)
+            ],
+            "total_rows": self._total_rows([self.data.members(d) for d in dimensions]),
+            "sampled": False,
+            "time_intervals": [
+                [days[0].isoformat(), days[-1].isoformat()] for days in intervals
+            ],
+            "totals": series(1.0, "total"),
+        }
+
+    def _drilldown_level(
+        self, request: Request, dimensions: list[str]
+    ) -> tuple[list[tuple[str, str]], float, list[tuple[str, str]], list[float]]:
+        """Parent path, its share, and the members and weights of the next level."""
+        if not dimensions:
+            raise _missing("dimensions")
+        parents = _parse_parent(request.query_params.get("parent_id"))
+        if len(parents) >= len(dimensions):
+            message = "parent_id is deeper than dimensions"
+            raise ApiError(400, "invalid_parameter", message)
+        path, share = [], 1.0
+        for dimension, parent in zip(dimensions[:len(parents)], parents, strict=True):
+            members = self.data.members(dimension)
+            ids = [member_id for member_id, _ in members]
+            if parent not in ids:
+                message = f"Unknown parent_id element: {parent}"
+                raise ApiError(400, "invalid_parameter", message)
+            position = ids.index(parent)
+            path.append(members[position])
+            share *= self.data.weights(len(members))[position]
+        members = self.data.members(dimensions[len(parents)])
+        return path, share, members, self.data.weights(len(members))
+
+    def drilldown(self, request: Request) -> dict[str, Any]:
+        offset, limit = self._page(request)
+        query = self._query(request, offset=offset, limit=limit)
+        dimensions, metrics = query["dimensions"], query["metrics"]
+        path, parent_share, members, weights = self._drilldown_level(
+            request, dimensions
+        )
+        visits = self.data.visits(query["ids"], self._days(request)) * parent_share
+        expand = len(path) + 1 < len(dimensions)
+        return {
+            "query": query,
+            "data": [
+                {
+                    "dimension": self._dimension(member),
+                    "metrics": self.data.metric_values(
+                        metrics, visits * weight, self._key(path + [member])
+                    ),
+                    "expand": expand,
+                }
+                for member, weight in _page_of(members, weights, offset, limit)
+            ],
+            "total_rows": len(members),
+            "sampled": False,
+            "totals": self.data.metric_values(metrics, visits, self._key(path)),
+        }
+
+    def _segment_shares(self, request: Request) -> dict[str, float]:
+        """Shares of visits in segments ``a`` and ``b``, stable per definition."""
+        definitions = request.query_params.get("segment_definitions", "")
+        a = 0.2 + 0.6 * _unit(self.data.scale.seed, definitions, "a")
+        return {"a": a, "b": 1 - a}
+
+    def comparison(self, request: Request) -> dict[str, Any]:
+        offset, limit = self._page(request)
+        query = self._query(request, offset=offset, limit=limit)
+        dimensions, metrics = query["dimensions"], query["metrics"]
+        visits = self.data.visits(query["ids"], self._days(request))
+        segments = self._segment_shares(request)
+
+        def values(share: float, key: str) -> dict[str, list[float]]:
+            return {
+                name: self.data.metric_values(
+                    metrics, visits * share * part, f"{name}:{key}"
+                )
+                for name, part in segments.items()
+            }
+
+        return {
+            "query": query,
+            "data": [
+                {
+                    "dimensions": [self._dimension(m) for m in picked],
+                    "metrics": values(share, self._key(picked)),
+                }
+                for picked, share in self._rows(dimensions, offset - 1, limit)
+            ],
+            "total_rows": self._total_rows([self.data.members(d) for d in dimensions]),
+            "sampled": False,
+            "totals": values(1.0, "total"),
+        }
+
+    def comparison_drilldown(self, request: Request) -> dict[str, Any]:
+        offset, limit = self._page(request)
+        query = self._query(request, offset=offset, limit=limit)
+        dimensions, metrics = query["dimensions"], query["metrics"]
+        path, parent_share, members, weights = self._drilldown_level(
+            request, dimensions
+        )
+        visits = self.data.visits(query["ids"], self._days(request)) * parent_share
+        segments = self._segment_shares(request)
+        expand = len(path) + 1 < len(dimensions)
+
+        def values(share: float, key: str) -> dict[str, list[float]]:
+            return {
+                name: self.data.metric_values(
+                    metrics, visits * share * part, f"{name}:{key}"
+                )
+                for name, part in segments.items()
+            }
+
+        return {
+            "query": query,
+            "data": [
+                {
+                    "dimension": self._dimension(member),
+                    "metrics": values(weight, self._key(path + [member])),
+                    "expand": expand,
+                }
+                for member, weight in _page_of(members, weights, offset, limit)
+            ],
+            "total_rows": len(members),
+            "sampled": False,
+            "totals": values(1.0, self._key(path)),
+        }
+
+    # -- management endpoints --------------------------------------------
+
+    def list_counters(self, request: Request) -> dict[str, Any]:
+        offset, per_page = self._page(request, default_limit=1000)
+        if "per_page" in request.query_params:
+            per_page = int(request.query_params["per_page"])
+        search = request.query_params.get("search", "").lower()
+        counters = [
+            c for c in self.data.counters
+            if not search or search in c["name"].lower() or search in c["site"]
+        ]
+        page = counters[offset - 1:offset - 1 + per_page]
+        return {"rows": len(counters), "counters": page}
+
+    def get_counter(self, request: Request) -> dict[str, Any]:
+        counter_id = request.path_params["counter_id"]
+        counter = self.data.counter(counter_id)
+        return {"counter": {**counter, "goals": self.data.goals(counter_id)}}
+
+    def list_goals(self, request: Request) -> dict[str, Any]:
+        return {"goals": self.data.goals(request.path_params["counter_id"])}
+
+
+def create_app(
+    scale: FakeScale | None = None, faults: FaultInjection | None = None
+) -> Starlette:
+    """ASGI app for ``uvicorn``; the :class:`FakeMetrika` is at ``app.state.fake``."""
+    fake = FakeMetrika(scale, faults)
+    fake.app.state.fake = fake
+    return fake.app
+
+
+def main() -> None:
+    import click
+    import uvicorn
+
+    @click.command()
+    @click.option("--host", default="127.0.0.1", help="Listen address")
+    @click.option("--port", default=8081, type=int, help="Listen port")
+    @click.option("--counters", default=3, type=int, help="Number of counters")
+    @click.option("--goals", default=5, type=int, help="Goals per counter")
+    @click.option("--urls", default=1_000, type=int, help="Distinct URLs")
+    @click.option("--search-phrases", default=500, type=int,
+                  help="Distinct search phrases")
+    @click.option("--daily-visits", default=10_000, type=int,
+                  help="Visits per day of the first counter")
+    @click.option("--seed", default=0, type=int, help="Seed for data and faults")
+    @click.option("--latency-ms", default=0.0, type=float,
+                  help="Added latency per request")
+    @click.option("--latency-jitter-ms", default=0.0, type=float,
+                  help="Random extra latency, up to this much")
+    @click.option("--error-rate", default=0.0, type=float,
+                  help="Fraction of requests answered with 5xx")
+    @click.option("--throttle-rate", default=0.0, type=float,
+                  help="Fraction of requests answered with 429")
+    @click.option("--max-rps", default=0.0, type=float,
+                  help="Answer 429 above this many requests per second")
+    def run(host: str, port: int, latency_ms: float, latency_jitter_ms: float,
+            error_rate: float, throttle_rate: float, max_rps: float, seed: int,
+            **scale: int) -> None:
+        """Fake Yandex Metrika API for load tests."""
+        app = create_app(
+            FakeScale(seed=seed, **scale),
+            FaultInjection(
+                latency_ms=latency_ms,
+                latency_jitter_ms=latency_jitter_ms,
+                error_rate=error_rate,
+                throttle_rate=throttle_rate,
+                max_rps=max_rps,
+                seed=seed,
+            ),
+        )
+        uvicorn.run(app, host=host, port=port, log_level="warning")
+
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,3 +22,63 @@ def default_date_range(days: int = 7) -> tuple[str, str]:
     today = date.today()
     date_from = today - timedelta(days=days)
     return date_from.isoformat(), today.isoformat()
+
+
+SHARD_UNITS = ("day", "week", "month")
+
+
+def split_date_range(date_from: str, date_to: str, unit: str) -> list[tuple[str, str]]:
+    """Split an inclusive YYYY-MM-DD range into day, week or month chunks.
+
+    Week chunks follow calendar weeks (Monday to Sunday) and month chunks follow
+    calendar months, so they line up with Metrika's own time grouping. The first
+    and last chunks are clipped to the requested range.
+    """
+    if unit not in SHARD_UNITS:
+        raise ValueError(f"unit must be one of {SHARD_UNITS}, got: {unit!r}")
+    start = date.fromisoformat(date_from)
+    end = date.fromisoformat(date_to)
+    if start > end:
+        raise ValueError(f"date_from {date_from} is after date_to {date_to}")
+    chunks: list[tuple[str, str]] = []
+    current = start
+    while current <= end:
+        if unit == "day":
+            chunk_end = current
+        elif unit == "week":
+            chunk_end = current + timedelta(days=6 - current.weekday())
+        else:
+            next_month = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+            chunk_end = next_month - timedelta(days=1)
+        chunk_end = min(chunk_end, end)
+        chunks.append((current.isoformat(), chunk_end.isoformat()))
+        current = chunk_end + timedelta(days=1)
+    return chunks
+
+
+COMPARISON_MODES = ("previous", "year_ago")
+
+
+def _year_earlier(day: date) -> date:
+    try:
+        return day.replace(year=day.year - 1)
+    except ValueError:  # 29 February
+        return day.replace(year=day.year - 1, day=28)
+
+
+def comparison_range(date_from: str, date_to: str, mode: str) -> tuple[str, str]:
+    """Return the range an inclusive YYYY-MM-DD range is compared against.
+
+    ``previous`` is the range of the same length ending the day before
+    ``date_from``; ``year_ago`` is the same calendar range one year earlier.
+    """
+    if mode not in COMPARISON_MODES:
+        raise ValueError(f"mode must be one of {COMPARISON_MODES}, got: {mode!r}")
+    start = date.fromisoformat(date_from)
+    end = date.fromisoformat(date_to)
+    if start > end:
+        raise ValueError(f"date_from {date_from} is after date_to {date_to}")
+    if mode == "previous":
+        length = end - start + timedelta(days=1)
+        return (start - length).isoformat(), (end - length).isoformat()
+    return _year_earlier(start).isoformat(), _year_earlier(end).isoformat()
@@ -2,28 +2,54 @@
 from __future__ import annotations
 
 import functools
+import inspect
 import logging
-from collections.abc import Callable
-from typing import Any
+from collections.abc import Awaitable, Callable
+from typing import Any, ParamSpec, TypeVar
 
 from ya_metrics_mcp.exceptions import MCPYaMetrikaError
+from ya_metrics_mcp.utils.tracing import span
 
 logger = logging.getLogger("ya-metrics")
 
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def _counter_id(
+    signature: inspect.Signature, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> Any:
+    try:
+        return signature.bind_partial(*args, **kwargs).arguments.get("counter_id")
+    except TypeError:  # reported by the call itself
+        return None
+
+
+def handle_api_errors(
+    service_name: str = "Yandex Metrika API",
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Decorator that catches API errors and re-raises as MCPYaMetrikaError.
+
+    Each call also runs in a ``tool.<name>`` tracing span.
+    """
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        signature = inspect.signature(func)
 
-def handle_api_errors(service_name: str = "Yandex Metrika API") -> Callable:
-    """Decorator that catches API errors and re-raises as MCPYaMetrikaError."""
-    def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
-        async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            try:
-                return await func(*args, **kwargs)
-            except MCPYaMetrikaError:
-                raise
-            except Exception as exc:
-                logger.error("%s error in %s: %s", service_name, func.__name__, exc)
-                raise MCPYaMetrikaError(
-                    f"{service_name} error in {func.__name__}: {exc}"
-                ) from exc
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            counter_id = _counter_id(signature, args, kwargs)
+            with span(f"tool.{func.__name__}", counter_id=counter_id) as current:
+                try:
+                    result = await func(*args, **kwargs)
+                except MCPYaMetrikaError:
+                    raise
+                except Exception as exc:
+                    logger.error("%s error in %s: %s", service_name, func.__name__, exc)
+                    raise MCPYaMetrikaError(
+                        f"{service_name} error in {func.__name__}: {exc}"
+                    ) from exc
+                if isinstance(result, str):
+                    current.set_attribute("response.size", len(result))
+                return result
         return wrapper
     return decorator
@@ -0,0 +1,142 @@
+"""Minimal Prometheus metrics: labelled counters and histograms in text format."""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from typing import Any
+
+# Upper bounds in seconds, from a cached hit to a slow report with retries.
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def path_template(path: str) -> str:
+    """Replace numeric path segments so that per-endpoint labels stay bounded.
+
+    ``/management/v1/counter/123/goals`` becomes ``/management/v1/counter/{id}/goals``.
+    """
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_family(
+    name: str,
+    kind: str,
+    help_text: str,
+    samples: Iterable[tuple[dict[str, str], float]],
+) -> list[str]:
+    """Render one metric family from ``(labels, value)`` samples."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(
+        f"{name}{format_labels(labels)} {_number(value)}" for labels, value in samples
+    )
+    return lines
+
+
+class Counter:
+    """Monotonic counter keyed by label values."""
+
+    def __init__(
+        self, name: str, help_text: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        return render_family(
+            self.name,
+            "counter",
+            self.help_text,
+            (
+                (dict(zip(self.labelnames, key, strict=True)), value)
+                for key, value in sorted(self._values.items())
+            ),
+        )
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> (per-bucket counts, +Inf count, sum)
+        self._series: dict[tuple[str, ...], list[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.setdefault(labels, [[0] * len(self.buckets), 0, 0.0])
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][i] += 1
+                break
+        series[1] += 1
+        series[2] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series[1] if series else 0
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for key, (counts, total, value_sum) in sorted(self._series.items()):
+            labels = dict(zip(self.labelnames, key, strict=True))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts, strict=True):
+                cumulative += count
+                bucket = format_labels({**labels, "le": _number(bound)})
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            lines.append(
+                f"{self.name}_bucket{format_labels({**labels, 'le': '+Inf'})} {total}"
+            )
+            lines.append(f"{self.name}_sum{format_labels(labels)} {_number(value_sum)}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {total}")
+        return lines
@@ -0,0 +1,10 @@
+"""Checks for optional dependencies installed through package extras."""
+from __future__ import annotations
+
+import importlib.util
+
+
+def require_numpy(feature: str = "Local log queries") -> None:
+    """Raise RuntimeError naming ``feature`` when numpy is not installed."""
+    if importlib.util.find_spec("numpy") is None:
+        raise RuntimeError(f"{feature} need numpy; install ya-metrics-mcp[analytics]")
@@ -0,0 +1,71 @@
+"""Response serialization with pluggable output formats and JSON backends."""
+from __future__ import annotations
+
+import json
+from typing import Any, Literal
+
+from ya_metrics_mcp.utils.tabular import is_report, to_delimited, to_table
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None  # type: ignore[assignment]
+
+OutputFormat = Literal["pretty", "compact", "table", "csv", "tsv"]
+OUTPUT_FORMATS: tuple[str, ...] = ("pretty", "compact", "table", "csv", "tsv")
+
+
+def validate_output_format(value: str) -> str:
+    if value not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"output_format must be one of {OUTPUT_FORMATS}, got: {value!r}"
+        )
+    return value
+
+
+def _dumps_stdlib(data: Any, pretty: bool) -> str:
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _dumps_orjson(data: Any, pretty: bool) -> str:
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    try:
+        return orjson.dumps(data, option=option).decode()
+    except TypeError:
+        # orjson rejects e.g. integers wider than 64 bits; the stdlib does not.
+        return _dumps_stdlib(data, pretty)
+
+
+def dumps_json(data: Any, pretty: bool = False, backend: str = "auto") -> str:
+    """Serialize to JSON text using orjson when available ("auto") or the stdlib."""
+    if backend == "orjson" or (backend == "auto" and orjson is not None):
+        if orjson is None:
+            raise ValueError("orjson backend requested but orjson is not installed")
+        return _dumps_orjson(data, pretty)
+    return _dumps_stdlib(data, pretty)
+
+
+def serialize(
+    data: Any,
+    output_format: str = "pretty",
+    backend: str = "auto",
+    csv_metadata: bool = False,
+) -> str:
+    """Render an API response in the requested output format.
+
+    ``pretty`` is indented JSON; ``compact`` is JSON without insignificant
+    whitespace, which is noticeably smaller and faster for large reports.
+    ``table`` is compact JSON with column names and row arrays, and ``csv`` /
+    ``tsv`` are delimited text; these apply to report responses only, anything
+    else falls back to ``compact``. ``csv_metadata`` writes report metadata as
+    leading ``#`` comment lines in delimited output.
+    """
+    validate_output_format(output_format)
+    if output_format in ("table", "csv", "tsv") and is_report(data):
+        if output_format == "table":
+            return dumps_json(to_table(data), backend=backend)
+        delimiter = "," if output_format == "csv" else "\t"
+        return to_delimited(data, delimiter, metadata=csv_metadata)
+    return dumps_json(data, pretty=output_format == "pretty", backend=backend)
@@ -0,0 +1,133 @@
+"""Columnar and delimited renderings of Metrika report responses."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any
+
+# Response metadata that CSV/TSV output can carry as ``# key: <json>`` lines.
+COMMENT_KEYS = ("sharding", "freshness", "sync")
+
+
+def is_report(data: Any) -> bool:
+    """True for /stat/v1/data-style responses (also bytime/drilldown/comparison)."""
+    if not isinstance(data, dict) or not isinstance(data.get("data"), list):
+        return False
+    return all(isinstance(row, dict) and "metrics" in row for row in data["data"])
+
+
+def _dimension_value(dimension: Any) -> Any:
+    if isinstance(dimension, dict):
+        return dimension.get("name", dimension.get("id"))
+    return dimension
+
+
+def _row_dimensions(row: dict[str, Any]) -> list[Any]:
+    if "dimensions" in row:
+        return [_dimension_value(d) for d in row["dimensions"]]
+    if "dimension" in row:  # drilldown rows carry a single dimension node
+        return [_dimension_value(row["dimension"])]
+    return []
+
+
+def _names(data: dict[str, Any], key: str, count: int, prefix: str) -> list[str]:
+    names = data.get("query", {}).get(key)
+    if isinstance(names, list) and len(names) == count:
+        return [str(n) for n in names]
+    if isinstance(names, str) and len(names.split(",")) == count:
+        return names.split(",")
+    return [f"{prefix}{i + 1}" for i in range(count)]
+
+
+def _segment_metric_names(data: dict[str, Any], row: dict[str, Any]) -> list[str]:
+    metrics = row["metrics"]
+    first: list[Any] = next(iter(metrics.values()), [])
+    names = _names(data, "metrics", len(first), "metric_")
+    return [f"{segment}:{name}" for segment in metrics for name in names]
+
+
+def to_table(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert a report into ``{"columns": [...], "rows": [[...], ...]}``.
+
+    Dimension values come first, then metric values. For bytime reports each
+    metric cell holds the series over ``time_intervals``; for comparison
+    reports metric columns are prefixed with the segment key (``a:``, ``b:``).
+    Report metadata such as totals and total_rows is preserved.
+    """
+    rows = data.get("data", [])
+    first = rows[0] if rows else {}
+    if first:
+        dim_count = len(_row_dimensions(first))
+    else:
+        dim_count = len(data.get("query", {}).get("dimensions") or [])
+    dim_names = _names(data, "dimensions", dim_count, "dimension_")
+
+    if isinstance(first.get("metrics"), dict):
+        metric_names = _segment_metric_names(data, first)
+
+        def metric_values(row: dict[str, Any]) -> list[Any]:
+            return [v for values in row["metrics"].values() for v in values]
+    else:
+        metric_count = len(first.get("metrics", [])) if first else 0
+        metric_names = _names(data, "metrics", metric_count, "metric_")
+
+        def metric_values(row: dict[str, Any]) -> list[Any]:
+            return list(row["metrics"])
+
+    has_expand = any("expand" in row for row in rows)
+    columns = dim_names + metric_names + (["expand"] if has_expand else [])
+    table_rows = [
+        _row_dimensions(row)
+        + metric_values(row)
+        + ([row.get("expand")] if has_expand else [])
+        for row in rows
+    ]
+    table: dict[str, Any] = {"columns": columns, "rows": table_rows}
+    for key in (
+        "time_intervals",
+        "totals",
+        "total_rows",
+        "sampled",
+        "sharding",
+        "freshness",
+        "sync",
+    ):
+        if key in data:
+            table[key] = data[key]
+    return table
+
+
+def to_delimited(
+    data: dict[str, Any], delimiter: str = ",", metadata: bool = False
+) -> str:
+    """Render a report as CSV/TSV with a header row.
+
+    Bytime reports are written in long form: one line per row and time interval,
+    with the interval start date in a leading ``period`` column. With
+    ``metadata``, sharding, freshness (stale cache) and sync metadata precede
+    the header as ``# key: <json>`` comment lines; off by default, since plain
+    CSV readers do not skip them.
+    """
+    table = to_table(data)
+    buffer = io.StringIO()
+    for key in COMMENT_KEYS if metadata else ():
+        if key in data:
+            value = json.dumps(data[key], ensure_ascii=False, separators=(",", ":"))
+            buffer.write(f"# {key}: {value}\n")
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\n")
+    intervals = table.get("time_intervals")
+    if intervals:
+        dim_count = len(_row_dimensions(data["data"][0])) if data["data"] else 0
+        writer.writerow(["period"] + table["columns"])
+        for row in table["rows"]:
+            dims, series = row[:dim_count], row[dim_count:]
+            for i, interval in enumerate(intervals):
+                period = interval[0] if isinstance(interval, list) else interval
+                writer.writerow(
+                    [period] + dims + [s[i] if i < len(s) else None for s in series]
+                )
+    else:
+        writer.writerow(table["columns"])
+        writer.writerows(table["rows"])
+    return buffer.getvalue()
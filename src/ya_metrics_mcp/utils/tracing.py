@@ -0,0 +1,173 @@
+"""Lightweight tracing of tool calls and upstream requests.
+
+Spans nest through a context variable, so a tool-call span collects child spans
+for every upstream attempt, rate limiter wait, retry sleep and serialization it
+causes, including those in tasks started with ``asyncio.gather``.
+
+Modes (YANDEX_TRACING):
+
+* ``memory`` (default): finished traces are kept in an in-process ring buffer
+  and can be read back with :func:`recent_traces`;
+* ``otel``: spans are created with the OpenTelemetry API, to be exported by
+  whatever SDK and exporter the process configures;
+* ``off``: spans are no-ops.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - exercised when opentelemetry is not installed
+    otel_trace = None  # type: ignore[assignment]
+
+logger = logging.getLogger("ya-metrics")
+
+TRACING_MODES = ("off", "memory", "otel")
+
+
+def validate_tracing_mode(value: str) -> str:
+    if value not in TRACING_MODES:
+        raise ValueError(f"tracing must be one of {TRACING_MODES}, got: {value!r}")
+    return value
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    attributes: dict[str, Any]
+    started_at: float = field(default_factory=time.time)
+    duration: float | None = None
+    error: str | None = None
+    children: list[Span] = field(default_factory=list)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def as_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "name": self.name,
+            "duration_ms": round(self.duration * 1000, 2)
+            if self.duration is not None
+            else None,
+        }
+        if self.attributes:
+            data["attributes"] = self.attributes
+        if self.error:
+            data["error"] = self.error
+        if self.children:
+            data["children"] = [child.as_dict() for child in self.children]
+        return data
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+class _OtelSpan:
+    def __init__(self, span: Any) -> None:
+        self._span = span
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self._span.set_attribute(key, value)
+
+
+class TraceBuffer:
+    """Ring buffer of the most recently finished root spans."""
+
+    def __init__(self, max_traces: int = 100) -> None:
+        self._traces: deque[Span] = deque(maxlen=max(1, max_traces))
+
+    def export(self, span: Span) -> None:
+        self._traces.append(span)
+
+    def recent(
+        self, limit: int = 20, min_duration_ms: float = 0
+    ) -> list[dict[str, Any]]:
+        """Newest first, optionally only traces at least ``min_duration_ms`` long."""
+        traces = [
+            span for span in reversed(self._traces)
+            if (span.duration or 0) * 1000 >= min_duration_ms
+        ]
+        return [
+            {
+                "trace_id": span.trace_id,
+                "started_at": round(span.started_at, 3),
+                **span.as_dict(),
+            }
+            for span in traces[:limit]
+        ]
+
+    def clear(self) -> None:
+        self._traces.clear()
+
+
+_current: ContextVar[Span | None] = ContextVar("ya_metrics_span", default=None)
+_mode = "memory"
+_buffer = TraceBuffer()
+_NOOP = _NoopSpan()
+
+
+def configure_tracing(mode: str = "memory", max_traces: int = 100) -> None:
+    """Select the tracing mode; ``otel`` falls back to ``memory`` without the API."""
+    global _mode, _buffer
+    validate_tracing_mode(mode)
+    if mode == "otel" and otel_trace is None:
+        logger.warning(
+            "YANDEX_TRACING=otel but opentelemetry-api is not installed; "
+            "keeping traces in memory instead"
+        )
+        mode = "memory"
+    _mode = mode
+    _buffer = TraceBuffer(max_traces)
+
+
+def recent_traces(limit: int = 20, min_duration_ms: float = 0) -> list[dict[str, Any]]:
+    return _buffer.recent(limit, min_duration_ms)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | _NoopSpan | _OtelSpan]:
+    """Open a span named ``name`` as a child of the current one, if any."""
+    if _mode == "off":
+        yield _NOOP
+        return
+    attributes = {k: v for k, v in attributes.items() if v is not None}
+    if _mode == "otel":
+        tracer = otel_trace.get_tracer("ya-metrics-mcp")
+        with tracer.start_as_current_span(name, attributes=attributes) as otel_span:
+            yield _OtelSpan(otel_span)
+        return
+
+    parent = _current.get()
+    current = Span(
+        name,
+        trace_id=parent.trace_id if parent else os.urandom(8).hex(),
+        attributes=attributes,
+    )
+    if parent is not None:
+        parent.children.append(current)
+    token = _current.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _current.reset(token)
+        if parent is None:
+            _buffer.export(current)
@@ -0,0 +1,100 @@
+import json
+import re
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ya_metrics_mcp.analysis.anomalies import (  # noqa: E402
+    change_points,
+    detect_anomalies,
+    rolling_zscores,
+    seasonal_zscores,
+    trend_slopes,
+)
+from ya_metrics_mcp.metrika.client import YaMetrikaClient  # noqa: E402
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig  # noqa: E402
+from ya_metrics_mcp.metrika.fetchers.advanced import AdvancedMixin  # noqa: E402
+from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher  # noqa: E402
+
+DATES = [f"2024-01-{day:02d}" for day in range(1, 29)]
+NOISE = [100, 103, 98, 101, 99, 102, 97] * 4
+
+
+def _bytime(series: list[list[float]]) -> dict:
+    return {
+        "data": [{"dimensions": [{"name": f"s{i}"}], "metrics": [values]}
+                 for i, values in enumerate(series)],
+        "time_intervals": [[d, d] for d in DATES],
+    }
+
+
+def test_rolling_zscores_match_direct_computation():
+    values = np.array([[NOISE[:10]]], dtype=np.float64)
+    z = rolling_zscores(values, 4)
+    assert np.isnan(z[0, 0, :4]).all()
+    history = values[0, 0, 5:9]
+    expected = (values[0, 0, 9] - history.mean()) / history.std(ddof=1)
+    assert z[0, 0, 9] == pytest.approx(expected)
+
+
+def test_seasonal_zscores_ignore_weekly_pattern():
+    values = np.array([[NOISE]], dtype=np.float64)
+    assert np.isnan(seasonal_zscores(values, 7)).all()  # residuals are all zero
+
+
+def test_change_point_and_trend():
+    values = np.array([[[10.0] * 10 + [20.0] * 10]])
+    split, score, before, after = change_points(values)
+    assert split[0, 0] == 10
+    assert (before[0, 0], after[0, 0]) == (10.0, 20.0)
+    assert trend_slopes(np.array([[1.0, 2.0, 3.0, 4.0]]))[0] == pytest.approx(1.0)
+
+
+def test_detect_anomalies_flags_only_the_spike():
+    spiky = list(NOISE)
+    spiky[20] = 300
+    result = detect_anomalies(_bytime([spiky, NOISE]), ["ym:s:visits"], 7, 7, 3.0)
+    assert [(a["series"], a["date"]) for a in result["anomalies"]] == [
+        ("s0", "2024-01-21")
+    ]
+    assert result["total_anomalies"] == 1
+    assert result["change_points"] == []
+    assert [t["anomalies"] for t in result["trends"]] == [1, 0]
+
+
+def test_detect_anomalies_reports_level_shift():
+    shifted = NOISE[:14] + [v * 2 for v in NOISE[14:]]
+    result = detect_anomalies(_bytime([shifted]), ["ym:s:visits"], 7, 0, 3.0)
+    (point,) = result["change_points"]
+    assert point["date"] == "2024-01-15"
+    assert point["change_pct"] == pytest.approx(100.0)
+
+
+class AdvFetcher(AdvancedMixin, BaseFetcher):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_detect_anomalies_tool_fetches_bytime(httpx_mock):
+    httpx_mock.add_response(
+        url=re.compile(r".*stat/v1/data/bytime.*"), json=_bytime([NOISE])
+    )
+    fetcher = AdvFetcher(YaMetrikaClient(YaMetrikaConfig(api_key="tok")))
+    result = json.loads(await fetcher.detect_anomalies(
+        "1", ["ym:s:visits"], "2024-01-01", "2024-01-28",
+    ))
+    assert result["query"]["season"] == 7
+    assert result["anomalies"] == []
+    assert result["trends"][0]["series"] == "s0"
+
+
+@pytest.mark.asyncio
+async def test_detect_anomalies_checks_numpy_before_fetching(httpx_mock, monkeypatch):
+    monkeypatch.setattr(
+        "ya_metrics_mcp.utils.optional.importlib.util.find_spec", lambda name: None
+    )
+    fetcher = AdvFetcher(YaMetrikaClient(YaMetrikaConfig(api_key="tok", retries=0)))
+    with pytest.raises(Exception, match="need numpy"):
+        await fetcher.detect_anomalies("1", ["ym:s:visits"], "2024-01-01", "2024-01-28")
+    assert not httpx_mock.get_requests()
@@ -0,0 +1,135 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from ya_metrics_mcp.metrika.cache import ResponseCache, make_cache_key, ttl_for_params
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_is_order_independent():
+    a = make_cache_key("/stat/v1/data", {"ids": "1", "metrics": "ym:s:visits"}, "tok")
+    b = make_cache_key("/stat/v1/data", {"metrics": "ym:s:visits", "ids": "1"}, "tok")
+    assert a == b
+
+
+def test_cache_key_depends_on_token():
+    a = make_cache_key("/stat/v1/data", {"ids": "1"}, "tok-a")
+    b = make_cache_key("/stat/v1/data", {"ids": "1"}, "tok-b")
+    assert a != b
+    assert "tok-a" not in a
+
+
+def test_ttl_for_params_historical_vs_live():
+    today = date(2024, 6, 10)
+    assert ttl_for_params({"date2": "2024-06-09"}, 60, 3600, today) == 3600
+    assert ttl_for_params({"date2": "2024-06-10"}, 60, 3600, today) == 60
+    assert ttl_for_params({"date2": "yesterday"}, 60, 3600, today) == 3600
+    assert ttl_for_params({"date2": "3daysAgo"}, 60, 3600, today) == 3600
+    assert ttl_for_params({}, 60, 3600, today) == 60
+
+
+def test_cache_expires_entries():
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=10, clock=clock)
+    cache.set("k", {"v": 1}, ttl=5)
+    assert cache.lookup("k") == ({"v": 1}, False, 0)
+    clock.now = 6
+    assert cache.lookup("k") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.lookup("a")
+    cache.set("c", 3, ttl=60)
+    assert cache.lookup("b") is None
+    assert cache.lookup("a")[0] == 1
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_client_serves_repeated_get_from_cache(httpx_mock):
+    httpx_mock.add_response(
+        url="https://api-metrika.yandex.net/stat/v1/data?ids=123",
+        json={"data": []},
+    )
+    client = YaMetrikaClient(YaMetrikaConfig(api_key="tok"))
+    assert await client.get("/stat/v1/data", {"ids": "123"}) == {"data": []}
+    assert await client.get("/stat/v1/data", {"ids": "123", "limit": None}) == {
+        "data": []
+    }
+    assert len(httpx_mock.get_requests()) == 1
+    assert client.stats()["cache"]["hits"] == 1
+
+
+def test_cache_serves_stale_entries_through_lookup():
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=10, clock=clock)
+    cache.set("k", 1, ttl=5, stale_ttl=10)
+    assert cache.lookup("k") == (1, False, 0)
+    clock.now = 6
+    assert cache.peek("k") is None
+    assert cache.lookup("k") == (1, True, 6)
+    clock.now = 16
+    assert cache.lookup("k") is None
+    assert cache.stats.stale_hits == 1
+
+
+def test_cache_invalidate_by_predicate():
+    cache = ResponseCache()
+    cache.set("a:/x", 1, ttl=60)
+    cache.set("a:/y", 2, ttl=60)
+    assert cache.invalidate(lambda key: key.endswith("/x")) == 1
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_client_serves_stale_report_with_freshness_marker(httpx_mock):
+    url = "https://api-metrika.yandex.net/stat/v1/data?ids=123"
+    httpx_mock.add_response(url=url, json={"data": [1]})
+    httpx_mock.add_response(url=url, json={"data": [2]})
+    client = YaMetrikaClient(
+        YaMetrikaConfig(api_key="tok", cache_ttl=60, report_stale_ttl=600)
+    )
+    clock = FakeClock()
+    client.cache._clock = clock
+    assert await client.get("/stat/v1/data", {"ids": "123"}) == {"data": [1]}
+    clock.now = 90
+    stale = await client.get("/stat/v1/data", {"ids": "123"})
+    assert stale["data"] == [1]
+    assert stale["freshness"] == {
+        "stale": True,
+        "age_seconds": 90.0,
+        "refreshing": True,
+    }
+    await asyncio.sleep(0.01)
+    assert await client.get("/stat/v1/data", {"ids": "123"}) == {"data": [2]}
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_client_without_report_stale_ttl_refetches_expired(httpx_mock):
+    url = "https://api-metrika.yandex.net/stat/v1/data?ids=123"
+    httpx_mock.add_response(url=url, json={"data": []}, is_reusable=True)
+    client = YaMetrikaClient(
+        YaMetrikaConfig(api_key="tok", cache_ttl=60, report_stale_ttl=0)
+    )
+    clock = FakeClock()
+    client.cache._clock = clock
+    await client.get("/stat/v1/data", {"ids": "123"})
+    clock.now = 90
+    assert await client.get("/stat/v1/data", {"ids": "123"}) == {"data": []}
+    assert len(httpx_mock.get_requests()) == 2
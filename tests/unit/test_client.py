@@ -1,8 +1,11 @@
-import pytest
+import asyncio
+
 import httpx
+import pytest
+
+from ya_metrics_mcp.exceptions import AuthenticationError, MCPYaMetrikaError
 from ya_metrics_mcp.metrika.client import YaMetrikaClient
 from ya_metrics_mcp.metrika.config import YaMetrikaConfig
-from ya_metrics_mcp.exceptions import MCPYaMetrikaError, AuthenticationError
 
 
 @pytest.fixture
@@ -56,3 +59,79 @@ async def test_get_raises_on_500(httpx_mock, client):
 @pytest.mark.asyncio
 async def test_close(client):
     await client.close()  # should not raise
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_gets_share_one_request(httpx_mock, client):
+    httpx_mock.add_response(
+        url="https://api-metrika.yandex.net/stat/v1/data?ids=123",
+        json={"data": [1]},
+    )
+    results = await asyncio.gather(
+        *(client.get("/stat/v1/data", {"ids": "123"}) for _ in range(5))
+    )
+    assert all(r == {"data": [1]} for r in results)
+    assert len(httpx_mock.get_requests()) == 1
+    assert client.stats()["inflight"]["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_request(httpx_mock, client):
+    async def slow_response(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"data": [1]})
+
+    httpx_mock.add_callback(slow_response, url="https://api-metrika.yandex.net/stat/v1/data?ids=123")
+    first = asyncio.ensure_future(client.get("/stat/v1/data", {"ids": "123"}))
+    second = asyncio.ensure_future(client.get("/stat/v1/data", {"ids": "123"}))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await second == {"data": [1]}
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_get_retries_429_honouring_retry_after(httpx_mock, client):
+    url = "https://api-metrika.yandex.net/stat/v1/data?ids=123"
+    httpx_mock.add_response(url=url, status_code=429, headers={"Retry-After": "0"})
+    httpx_mock.add_response(url=url, json={"data": []})
+    client.config.retry_delay = 30.0
+    assert await client.get("/stat/v1/data", {"ids": "123"}) == {"data": []}
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_client_applies_pool_and_timeout_settings():
+    config = YaMetrikaConfig(
+        api_key="tok",
+        connect_timeout=2.5,
+        max_connections=7,
+        max_keepalive_connections=3,
+    )
+    http = YaMetrikaClient(config)._http
+    assert http.timeout.connect == 2.5
+    assert http.timeout.read == 30
+    pool = http._transport._pool
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+
+
+@pytest.mark.asyncio
+async def test_warmup_ignores_connection_errors(httpx_mock, client):
+    httpx_mock.add_exception(httpx.ConnectError("offline"))
+    await client.warmup()  # should not raise
+
+
+@pytest.mark.asyncio
+async def test_custom_transport_replaces_network():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Authorization"] == "OAuth tok"
+        return httpx.Response(200, json={"data": [], "path": request.url.path})
+
+    client = YaMetrikaClient(
+        YaMetrikaConfig(api_key="tok"), transport=httpx.MockTransport(handler)
+    )
+    assert await client.get("/stat/v1/data", {"ids": "1"}) == {
+        "data": [],
+        "path": "/stat/v1/data",
+    }
+    await client.close()
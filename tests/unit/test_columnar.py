@@ -0,0 +1,155 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ya_metrics_mcp.metrika.client import YaMetrikaClient  # noqa: E402
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig  # noqa: E402
+from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher  # noqa: E402
+from ya_metrics_mcp.metrika.fetchers.logs import LogsMixin  # noqa: E402
+from ya_metrics_mcp.metrika.logs import save_manifest  # noqa: E402
+from ya_metrics_mcp.store import columnar  # noqa: E402
+from ya_metrics_mcp.store.columnar import (  # noqa: E402
+    ColumnStore,
+    build_store,
+    parse_aggregate,
+    parse_filter,
+    query_store,
+)
+
+ROWS = [
+    ("1", "2024-01-01", "https://a.ru/", "3", "10"),
+    ("2", "2024-01-01", "https://a.ru/blog", "1", "11"),
+    ("3", "2024-01-02", "https://a.ru/", "5", "10"),
+    ("4", "2024-01-02", "https://a.ru/", "", "12"),
+]
+
+
+@pytest.fixture
+def export_dir(tmp_path):
+    header = "ym:s:visitID\tym:s:date\tym:s:startURL\tym:s:pageViews\tym:s:clientID\n"
+    for part, rows in enumerate((ROWS[:2], ROWS[2:])):
+        lines = "".join("\t".join(row) + "\n" for row in rows)
+        (tmp_path / f"part-{part:04d}.tsv").write_text(header + lines)
+    return tmp_path
+
+
+def test_build_store_infers_types_and_dictionary_encodes(export_dir):
+    schema = build_store(export_dir)
+    columns = schema["columns"]
+    assert schema["rows"] == 4
+    assert columns["ym:s:visitID"]["type"] == "int"
+    assert columns["ym:s:date"]["type"] == "date"
+    assert columns["ym:s:pageViews"]["type"] == "float"
+    assert columns["ym:s:startURL"] == {
+        "type": "string",
+        "file": "ym_s_startURL",
+        "distinct": 2,
+    }
+
+
+def test_build_store_widens_column_types_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, "CHUNK_ROWS", 1)
+    header = "ym:s:visitID\tym:s:bounce\tym:s:region\n"
+    (tmp_path / "part-0000.tsv").write_text(header + "1\t0\t1\n2\t1\t2\n")
+    (tmp_path / "part-0001.tsv").write_text(header + "3\t0.5\tMoscow\n")
+    columns = build_store(tmp_path)["columns"]
+    assert columns["ym:s:visitID"] == {"type": "int", "file": "ym_s_visitID"}
+    assert columns["ym:s:bounce"]["type"] == "float"
+    assert columns["ym:s:region"]["type"] == "string"
+    store = ColumnStore(tmp_path)
+    assert store.array("ym:s:bounce").tolist() == [0.0, 1.0, 0.5]
+    regions = store.dictionary("ym:s:region")
+    assert [regions[c] for c in store.array("ym:s:region")] == ["1", "2", "Moscow"]
+
+
+def test_build_store_keeps_64_bit_ids_exact(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, "CHUNK_ROWS", 1)
+    ids = ["15329417846218015001", "15329417846218015002", "15329417846218015003"]
+    lines = ["ym:s:visitID\tym:s:watchID\n", f"7\t1\n{ids[0]}\t2\n"]
+    lines += [f"{i}\t{i}\n" for i in ids[1:]]
+    (tmp_path / "part-0000.tsv").write_text("".join(lines))
+    columns = build_store(tmp_path)["columns"]
+    assert columns["ym:s:visitID"]["type"] == "uint"
+    assert columns["ym:s:watchID"]["type"] == "uint"
+    store = ColumnStore(tmp_path)
+    result = query_store(
+        store,
+        group_by=["ym:s:visitID"],
+        aggregates=["count", "uniq:ym:s:watchID"],
+        filters=[f"ym:s:visitID>={ids[0]}"],
+    )
+    assert sorted(row["dimensions"][0]["name"] for row in result["data"]) == [
+        int(i) for i in ids
+    ]
+    total = query_store(store, aggregates=["uniq:ym:s:visitID"])
+    assert total["data"][0]["metrics"] == [4]
+
+
+def test_query_groups_filters_and_aggregates(export_dir):
+    store = ColumnStore.open(export_dir)
+    result = query_store(
+        store,
+        group_by=["ym:s:startURL"],
+        aggregates=[
+            "count",
+            "sum:ym:s:pageViews",
+            "avg:ym:s:pageViews",
+            "uniq:ym:s:clientID",
+        ],
+        filters=["ym:s:visitID!=2"],
+    )
+    assert result["rows_matched"] == 3
+    assert result["data"] == [
+        {"dimensions": [{"name": "https://a.ru/"}], "metrics": [3, 8, 4, 2]},
+    ]
+
+
+def test_query_without_group_by_and_with_string_filter(export_dir):
+    store = ColumnStore.open(export_dir)
+    result = query_store(
+        store,
+        aggregates=["count", "max:ym:s:pageViews"],
+        filters=["ym:s:startURL=@blog"],
+    )
+    assert result["data"] == [{"dimensions": [], "metrics": [1, 1]}]
+
+
+def test_query_orders_by_date_groups(export_dir):
+    store = ColumnStore.open(export_dir)
+    result = query_store(
+        store, group_by=["ym:s:date"], aggregates=["count"], order_by="count"
+    )
+    dates = [row["dimensions"][0]["name"] for row in result["data"]]
+    assert dates == ["2024-01-01", "2024-01-02"]
+
+
+def test_parse_helpers_validate_input():
+    assert parse_filter("ym:s:startURL == 'https://a.ru/'") == ("ym:s:startURL", "==", "https://a.ru/")
+    assert parse_aggregate("uniq:ym:s:clientID") == ("uniq", "ym:s:clientID")
+    with pytest.raises(ValueError):
+        parse_aggregate("median:ym:s:pageViews")
+    with pytest.raises(ValueError):
+        parse_filter("no operator")
+
+
+class LogsFetcher(LogsMixin, BaseFetcher):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_query_logs_tool_reads_downloaded_export(tmp_path):
+    directory = tmp_path / "42" / "abc"
+    directory.mkdir(parents=True)
+    (directory / "part-0000.tsv").write_text("ym:s:date\n2024-01-01\n2024-01-01\n")
+    save_manifest(directory, {"counter_id": "42", "status": "downloaded"})
+    config = YaMetrikaConfig(api_key="tok", logs_dir=str(tmp_path))
+    fetcher = LogsFetcher(YaMetrikaClient(config))
+
+    result = json.loads(await fetcher.query_logs("42/abc", group_by=["ym:s:date"]))
+    assert result["data"] == [{"dimensions": [{"name": "2024-01-01"}], "metrics": [2]}]
+    exports = json.loads(await fetcher.list_log_exports())["exports"]
+    assert exports[0]["export_id"] == "42/abc" and exports[0]["columnar"] is True
+    with pytest.raises(Exception, match="Unknown log export"):
+        await fetcher.query_logs("../../etc")
@@ -39,3 +39,52 @@ def test_is_auth_configured():
 
     config_empty = YaMetrikaConfig(api_key="")
     assert config_empty.is_auth_configured() is False
+
+
+def test_config_disk_cache_from_env(monkeypatch):
+    monkeypatch.setenv("YANDEX_API_KEY", "tok")
+    monkeypatch.setenv("YANDEX_DISK_CACHE_PATH", "/tmp/ya-cache.sqlite")
+    monkeypatch.setenv("YANDEX_DISK_CACHE_MAX_MB", "64")
+    config = YaMetrikaConfig.from_env()
+    assert config.disk_cache_path == "/tmp/ya-cache.sqlite"
+    assert config.disk_cache_max_mb == 64
+
+
+def test_config_connection_settings_from_env(monkeypatch):
+    monkeypatch.setenv("YANDEX_API_KEY", "tok")
+    monkeypatch.setenv("YANDEX_CONNECT_TIMEOUT", "3.5")
+    monkeypatch.setenv("YANDEX_MAX_CONNECTIONS", "200")
+    monkeypatch.setenv("YANDEX_HTTP2", "true")
+    config = YaMetrikaConfig.from_env()
+    assert config.connect_timeout == 3.5
+    assert config.read_timeout is None
+    assert config.max_connections == 200
+    assert config.http2 is True
+
+
+def test_config_rejects_unknown_output_format(monkeypatch):
+    monkeypatch.setenv("YANDEX_API_KEY", "tok")
+    monkeypatch.setenv("YANDEX_OUTPUT_FORMAT", "yaml")
+    with pytest.raises(ValueError, match="output_format"):
+        YaMetrikaConfig.from_env()
+
+
+def test_config_sync_metrics_from_env(monkeypatch):
+    monkeypatch.setenv("YANDEX_API_KEY", "tok")
+    monkeypatch.setenv("YANDEX_SYNC_METRICS", "ym:s:visits, ym:s:users,")
+    config = YaMetrikaConfig.from_env()
+    assert config.sync_metrics == ("ym:s:visits", "ym:s:users")
+
+
+def test_config_rejects_unknown_tracing_mode(monkeypatch):
+    monkeypatch.setenv("YANDEX_API_KEY", "tok")
+    monkeypatch.setenv("YANDEX_TRACING", "zipkin")
+    with pytest.raises(ValueError, match="tracing"):
+        YaMetrikaConfig.from_env()
+
+
+def test_config_api_base_from_env(monkeypatch):
+    monkeypatch.setenv("YANDEX_API_KEY", "tok")
+    assert YaMetrikaConfig.from_env().api_base == "https://api-metrika.yandex.net"
+    monkeypatch.setenv("YANDEX_API_BASE", "http://127.0.0.1:8081/")
+    assert YaMetrikaConfig.from_env().api_base == "http://127.0.0.1:8081"
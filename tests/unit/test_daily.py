@@ -0,0 +1,86 @@
+from datetime import date
+
+import pytest
+
+from ya_metrics_mcp.store.daily import (
+    DailyStore,
+    bytime_to_daily,
+    daily_report,
+    missing_ranges,
+    series_key,
+)
+
+TODAY = date(2024, 3, 10)
+
+
+def test_missing_ranges_without_sync_state_fetches_window():
+    assert missing_ranges(date(2024, 3, 1), TODAY, None) == [(date(2024, 3, 1), TODAY)]
+
+
+def test_missing_ranges_refreshes_only_recent_days():
+    synced = (date(2024, 3, 1), TODAY)
+    assert missing_ranges(date(2024, 3, 1), TODAY, synced) == [
+        (date(2024, 3, 9), TODAY)
+    ]
+
+
+def test_missing_ranges_extends_backwards_and_forwards():
+    synced = (date(2024, 3, 5), date(2024, 3, 7))
+    assert missing_ranges(date(2024, 3, 1), TODAY, synced) == [
+        (date(2024, 3, 1), date(2024, 3, 4)),
+        (date(2024, 3, 8), TODAY),
+    ]
+
+
+def test_missing_ranges_keeps_synced_span_contiguous():
+    # The window starts after the high-water mark: fetch from it, not the window.
+    synced = (date(2024, 2, 1), date(2024, 2, 20))
+    assert missing_ranges(date(2024, 3, 8), TODAY, synced) == [
+        (date(2024, 2, 21), TODAY)
+    ]
+
+
+def test_bytime_to_daily_flattens_intervals():
+    report = {
+        "time_intervals": [["2024-03-01", "2024-03-01"], ["2024-03-02", "2024-03-02"]],
+        "data": [{"dimensions": [{"name": "organic", "id": "organic"}],
+                  "metrics": [[1, 2], [10, 20]]}],
+    }
+    assert bytime_to_daily(report) == [
+        ("2024-03-01", [{"name": "organic", "id": "organic"}], [1, 10]),
+        ("2024-03-02", [{"name": "organic", "id": "organic"}], [2, 20]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_store_round_trip_replaces_range(tmp_path):
+    store = DailyStore(tmp_path / "daily.sqlite")
+    series = series_key(["ym:s:visits"], [])
+    try:
+        await store.store_range("1", series, date(2024, 3, 1), date(2024, 3, 2),
+                                [("2024-03-01", [], [5]), ("2024-03-02", [], [6])])
+        await store.store_range("1", series, date(2024, 3, 2), date(2024, 3, 3),
+                                [("2024-03-02", [], [7])])
+        assert await store.synced_range("1", series) == (
+            date(2024, 3, 1),
+            date(2024, 3, 3),
+        )
+        rows = await store.read("1", series, date(2024, 3, 1), date(2024, 3, 3))
+        assert rows == [("2024-03-01", [], [5]), ("2024-03-02", [], [7])]
+    finally:
+        store.close()
+
+
+def test_daily_report_leaves_missing_days_empty():
+    report = daily_report(
+        [("2024-03-01", [], [5])],
+        date(2024, 3, 1),
+        date(2024, 3, 2),
+        ["ym:s:visits"],
+        [],
+    )
+    assert report["data"] == [{"dimensions": [], "metrics": [[5, None]]}]
+    assert report["time_intervals"] == [
+        ["2024-03-01", "2024-03-01"],
+        ["2024-03-02", "2024-03-02"],
+    ]
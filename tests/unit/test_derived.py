@@ -0,0 +1,92 @@
+import json
+import re
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ya_metrics_mcp.analysis.derived import add_derived, parse_derived  # noqa: E402
+from ya_metrics_mcp.metrika.client import YaMetrikaClient  # noqa: E402
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig  # noqa: E402
+from ya_metrics_mcp.metrika.fetchers.advanced import AdvancedMixin  # noqa: E402
+from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher  # noqa: E402
+
+FLAT = {
+    "query": {
+        "dimensions": ["ym:s:URLPath"],
+        "metrics": ["ym:s:pageviews", "ym:s:users"],
+    },
+    "data": [
+        {"dimensions": [{"name": "/a"}], "metrics": [50, 10]},
+        {"dimensions": [{"name": "/b"}], "metrics": [30, 0]},
+        {"dimensions": [{"name": "/c"}], "metrics": [30, 5]},
+    ],
+    "totals": [200, 40],
+}
+
+BYTIME = {
+    "query": {"dimensions": [], "metrics": ["ym:s:visits"]},
+    "data": [{"dimensions": [], "metrics": [[10, 20, 30, 15]]}],
+    "time_intervals": [["2024-01-01", "2024-01-01"], ["2024-01-02", "2024-01-02"],
+                       ["2024-01-03", "2024-01-03"], ["2024-01-04", "2024-01-04"]],
+}
+
+
+def test_parse_derived():
+    assert parse_derived("share:ym:s:visits") == ("share", 0, ["ym:s:visits"])
+    assert parse_derived("rolling7:ym:s:visits") == ("rolling", 7, ["ym:s:visits"])
+    assert parse_derived("ratio:ym:s:pageviews/ym:s:users") == (
+        "ratio", 0, ["ym:s:pageviews", "ym:s:users"]
+    )
+    with pytest.raises(ValueError, match="Unknown derived function"):
+        parse_derived("median:ym:s:visits")
+    with pytest.raises(ValueError, match="two metrics"):
+        parse_derived("ratio:ym:s:pageviews")
+
+
+def test_flat_report_share_rank_ratio_cumsum():
+    result = add_derived(FLAT, [
+        "share:ym:s:pageviews", "rank:ym:s:pageviews",
+        "ratio:ym:s:pageviews/ym:s:users", "cumsum:ym:s:pageviews",
+    ])
+    assert [row["metrics"][2:] for row in result["data"]] == [
+        [25.0, 1, 5.0, 50.0],
+        [15.0, 2, None, 80.0],
+        [15.0, 2, 6.0, 110.0],
+    ]
+    assert result["query"]["metrics"][-1] == "cumsum:ym:s:pageviews"
+    # The (possibly cached) input report is not modified.
+    assert FLAT["data"][0]["metrics"] == [50, 10]
+
+
+def test_bytime_growth_and_rolling():
+    result = add_derived(BYTIME, ["growth:ym:s:visits", "rolling2:ym:s:visits"])
+    assert result["data"][0]["metrics"][1:] == [
+        [None, 100.0, 50.0, -50.0],
+        [None, 15.0, 25.0, 22.5],
+    ]
+
+
+def test_series_functions_need_bytime_report():
+    with pytest.raises(ValueError, match="bytime"):
+        add_derived(FLAT, ["growth:ym:s:pageviews"])
+
+
+def test_unknown_metric_is_rejected():
+    with pytest.raises(ValueError, match="not in the report"):
+        add_derived(FLAT, ["share:ym:s:visits"])
+
+
+class AdvFetcher(AdvancedMixin, BaseFetcher):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_data_by_time_with_derived_table_output(httpx_mock):
+    httpx_mock.add_response(url=re.compile(r".*stat/v1/data/bytime.*"), json=BYTIME)
+    fetcher = AdvFetcher(YaMetrikaClient(YaMetrikaConfig(api_key="tok")))
+    result = json.loads(await fetcher.get_data_by_time(
+        "1", ["ym:s:visits"], derived=["cumsum:ym:s:visits"], output_format="table",
+    ))
+    assert result["columns"] == ["ym:s:visits", "cumsum:ym:s:visits"]
+    assert result["rows"][0][1] == [10.0, 30.0, 60.0, 75.0]
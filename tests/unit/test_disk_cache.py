@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.disk_cache import DiskCache, is_disk_cacheable
+
+
+def test_is_disk_cacheable():
+    assert is_disk_cacheable("/stat/v1/data/bytime")
+    assert is_disk_cacheable("/management/v1/counters")
+    assert not is_disk_cacheable("/other")
+
+
+def test_disk_cache_survives_reopen(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = DiskCache(path)
+    cache.set_sync("k", {"data": ["Москва"]}, ttl=60)
+    cache.close()
+
+    reopened = DiskCache(path)
+    value, remaining = reopened.get_sync("k")
+    assert value == {"data": ["Москва"]}
+    assert 0 < remaining <= 60
+
+
+def test_disk_cache_expires_entries(tmp_path):
+    now = [1000.0]
+    cache = DiskCache(tmp_path / "cache.sqlite", clock=lambda: now[0])
+    cache.set_sync("k", {"v": 1}, ttl=5)
+    now[0] += 10
+    assert cache.get_sync("k") is None
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    now = [1000.0]
+    cache = DiskCache(tmp_path / "cache.sqlite", max_bytes=8_000, clock=lambda: now[0])
+    payload = {"blob": os.urandom(3000).hex()}
+    for key in ("a", "b", "c"):
+        now[0] += 1
+        cache.set_sync(key, payload, ttl=600)
+    assert cache.size_bytes() <= 8_000
+    assert cache.get_sync("a") is None
+    assert cache.get_sync("c") is not None
+    assert cache.stats.evictions >= 1
+
+
+@pytest.mark.asyncio
+async def test_client_reads_disk_cache_written_by_previous_instance(
+    httpx_mock, tmp_path
+):
+    httpx_mock.add_response(
+        url="https://api-metrika.yandex.net/stat/v1/data?ids=123",
+        json={"data": [1]},
+    )
+    config = YaMetrikaConfig(api_key="tok", disk_cache_path=str(tmp_path / "c.sqlite"))
+    first = YaMetrikaClient(config)
+    await first.get("/stat/v1/data", {"ids": "123"})
+    await first.close()
+
+    second = YaMetrikaClient(config)
+    assert await second.get("/stat/v1/data", {"ids": "123"}) == {"data": [1]}
+    assert second.stats()["disk_cache"]["hits"] == 1
+    assert len(httpx_mock.get_requests()) == 1
+    await second.close()
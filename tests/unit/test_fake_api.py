@@ -0,0 +1,165 @@
+import json
+from datetime import date
+
+import httpx
+import pytest
+
+from ya_metrics_mcp.exceptions import MCPYaMetrikaError
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.fetchers.fetcher import YaMetrikaFetcher
+from ya_metrics_mcp.testing.fake_api import FakeMetrika, FakeScale, FaultInjection
+
+COUNTER = 10_000_001
+TODAY = date(2024, 6, 30)
+
+
+def make_client(fake: FakeMetrika, **config) -> YaMetrikaClient:
+    settings = YaMetrikaConfig(
+        api_key="tok", api_base="http://fake", retry_delay=0, **config
+    )
+    return YaMetrikaClient(settings, transport=httpx.ASGITransport(fake.app))
+
+
+@pytest.fixture
+def fake():
+    return FakeMetrika(FakeScale(urls=40, search_phrases=30), today=TODAY)
+
+
+@pytest.fixture
+def client(fake):
+    return make_client(fake, cache_max_entries=0, planner_window_ms=0)
+
+
+async def test_report_rows_sum_to_totals_across_pages(client):
+    params = {
+        "ids": COUNTER, "dimensions": "ym:s:URLPath",
+        "metrics": "ym:s:visits,ym:s:pageviews,ym:s:bounceRate",
+        "date1": "2024-06-01", "date2": "2024-06-30",
+    }
+    whole = await client.get("/stat/v1/data", {**params, "limit": 100})
+    first = await client.get("/stat/v1/data", {**params, "limit": 25})
+    second = await client.get("/stat/v1/data", {**params, "limit": 25, "offset": 26})
+    assert whole["total_rows"] == 40
+    assert whole["data"] == first["data"] + second["data"]
+    visits = [row["metrics"][0] for row in whole["data"]]
+    assert visits == sorted(visits, reverse=True)
+    assert sum(visits) == pytest.approx(whole["totals"][0], rel=1e-6)
+    pageviews = sum(r["metrics"][1] for r in whole["data"])
+    assert pageviews == pytest.approx(whole["totals"][1], rel=1e-6)
+    assert all(15 <= r["metrics"][2] <= 45 for r in whole["data"])
+
+
+async def test_bytime_intervals_add_up_to_range_totals(client):
+    params = {
+        "ids": COUNTER, "metrics": "ym:s:visits",
+        "date1": "2024-04-01", "date2": "2024-06-30",
+    }
+    report = await client.get("/stat/v1/data", params)
+    bytime = await client.get(
+        "/stat/v1/data/bytime",
+        {**params, "group": "month", "dimensions": "ym:s:trafficSource", "top_keys": 3},
+    )
+    assert bytime["time_intervals"] == [
+        ["2024-04-01", "2024-04-30"],
+        ["2024-05-01", "2024-05-31"],
+        ["2024-06-01", "2024-06-30"],
+    ]
+    sources = [row["dimensions"][0]["name"] for row in bytime["data"]]
+    assert sources == ["organic", "direct", "ad"]
+    assert sum(bytime["totals"][0]) == pytest.approx(report["totals"][0], rel=1e-6)
+
+
+async def test_drilldown_children_add_up_to_parent(client):
+    params = {
+        "id": COUNTER, "metrics": "ym:s:users",
+        "dimensions": "ym:s:regionCountry,ym:s:regionCity",
+    }
+    root = await client.get("/stat/v1/data/drilldown", params)
+    assert root["data"][0]["dimension"]["name"] == "Россия"
+    assert root["data"][0]["expand"] is True
+    children = await client.get(
+        "/stat/v1/data/drilldown", {**params, "parent_id": json.dumps(["0"])}
+    )
+    assert children["data"][0]["expand"] is False
+    assert sum(r["metrics"][0] for r in children["data"]) == pytest.approx(
+        root["data"][0]["metrics"][0], rel=1e-6
+    )
+
+
+async def test_comparison_segments_split_the_totals(client):
+    params = {
+        "ids": COUNTER, "metrics": "ym:s:visits", "dimensions": "ym:s:deviceCategory"
+    }
+    report = await client.get("/stat/v1/data", params)
+    comparison = await client.get(
+        "/stat/v1/data/comparison", {**params, "segment_definitions": '{"0": "a"}'}
+    )
+    totals = comparison["totals"]
+    total = report["totals"][0]
+    assert totals["a"][0] + totals["b"][0] == pytest.approx(total, rel=1e-6)
+    assert set(comparison["data"][0]["metrics"]) == {"a", "b"}
+
+
+async def test_management_endpoints(client):
+    page = await client.get(
+        "/management/v1/counters", {"per_page": 2, "search": "site"}
+    )
+    assert page["rows"] == 3
+    assert [c["id"] for c in page["counters"]] == [COUNTER, COUNTER + 1]
+    goals = (await client.get(f"/management/v1/counter/{COUNTER}/goals", {}))["goals"]
+    assert len(goals) == 5
+    with pytest.raises(MCPYaMetrikaError, match="404"):
+        await client.get("/management/v1/counter/1", {})
+
+
+async def test_injected_throttling_and_errors(fake):
+    fake.faults = FaultInjection(throttle_rate=1.0)
+    client = make_client(fake, retries=2)
+    with pytest.raises(MCPYaMetrikaError, match="429"):
+        await client.get("/management/v1/counters", {})
+    assert fake.injected["429"] == 2
+    assert client.stats()["retries"] == 1
+
+    fake.faults = FaultInjection(max_rps=1)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(fake.app), base_url="http://fake",
+        headers={"Authorization": "OAuth tok"},
+    ) as http:
+        assert (await http.get("/management/v1/counters")).status_code == 200
+        throttled = await http.get("/management/v1/counters")
+        assert throttled.status_code == 429
+        assert throttled.headers["Retry-After"] == "1"
+        stats = (await http.get("/_fake/stats")).json()
+    assert stats["injected"]["429"] == 3
+
+
+async def test_fetcher_runs_against_fake_api(fake):
+    fetcher = YaMetrikaFetcher(make_client(fake))
+    result = json.loads(await fetcher.get_goals_conversion(str(COUNTER)))
+    assert len(result["query"]["metrics"]) == 6
+    assert result["data"][0]["metrics"][0] > 0
+
+
+@pytest.mark.parametrize(
+    ("method", "dimension"),
+    [
+        ("sources_summary", "ym:s:lastTrafficSource"),
+        ("sources_search_phrases", "ym:s:lastSearchPhrase"),
+        ("get_browsers_report", "ym:s:browser"),
+        ("get_content_analytics_sources", "ym:s:publisherTrafficSource"),
+        ("get_content_analytics_categories", "ym:s:publisherArticleRubric"),
+        ("get_content_analytics_authors", "ym:s:publisherArticleAuthor"),
+        ("get_content_analytics_topics", "ym:s:publisherArticleThematic"),
+    ],
+)
+async def test_preset_tools_run_against_fake_api(fake, method, dimension):
+    fetcher = YaMetrikaFetcher(make_client(fake))
+    result = json.loads(await getattr(fetcher, method)(str(COUNTER)))
+    assert result["query"]["dimensions"][0] == dimension
+    assert result["data"] and result["totals"][0] > 0
+
+
+async def test_unknown_preset_is_rejected(client):
+    with pytest.raises(MCPYaMetrikaError, match="Unknown preset"):
+        await client.get("/stat/v1/data", {"ids": COUNTER, "preset": "nope"})
@@ -1,9 +1,11 @@
 import re
+
 import pytest
+
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
 from ya_metrics_mcp.metrika.fetchers.advanced import AdvancedMixin
 from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher
-from ya_metrics_mcp.metrika.config import YaMetrikaConfig
-from ya_metrics_mcp.metrika.client import YaMetrikaClient
 
 
 class AdvFetcher(AdvancedMixin, BaseFetcher):
@@ -98,3 +100,45 @@ async def test_get_drilldown_without_parent(httpx_mock, fetcher):
         metrics=["ym:s:visits"],
     )
     assert isinstance(result, str)
+
+
+@pytest.mark.asyncio
+async def test_compare_periods_aligns_rows(httpx_mock, fetcher):
+    import json
+
+    httpx_mock.add_response(
+        url=re.compile(r".*stat/v1/data\?.*date1=2024-03-11.*"),
+        json={"data": [
+            {"dimensions": [{"name": "organic", "id": "organic"}], "metrics": [120]},
+            {"dimensions": [{"name": "ad", "id": "ad"}], "metrics": [30]},
+        ], "totals": [150]},
+    )
+    httpx_mock.add_response(
+        url=re.compile(r".*stat/v1/data\?.*date1=2024-03-04.*"),
+        json={"data": [
+            {"dimensions": [{"name": "organic", "id": "organic"}], "metrics": [100]},
+            {"dimensions": [{"name": "direct", "id": "direct"}], "metrics": [10]},
+        ], "totals": [110]},
+    )
+    result = json.loads(await fetcher.compare_periods(
+        "1", ["ym:s:visits"], ["ym:s:trafficSource"], "2024-03-11", "2024-03-17",
+    ))
+    assert result["query"]["compare_date1"] == "2024-03-04"
+    assert result["query"]["metrics"] == [
+        "ym:s:visits",
+        "previous:ym:s:visits",
+        "delta:ym:s:visits",
+        "delta_pct:ym:s:visits",
+    ]
+    assert [row["metrics"] for row in result["data"]] == [
+        [120, 100, 20, 20.0],
+        [30, None, None, None],
+        [None, 10, None, None],
+    ]
+    assert result["totals"] == [150, 110, 40, 36.36]
+
+
+@pytest.mark.asyncio
+async def test_compare_periods_needs_both_dates(fetcher):
+    with pytest.raises(Exception, match="both date_from and date_to"):
+        await fetcher.compare_periods("1", ["ym:s:visits"], date_from="2024-03-11")
@@ -0,0 +1,78 @@
+import json
+import re
+
+import pytest
+
+from ya_metrics_mcp.exceptions import MCPYaMetrikaError
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.fetchers.fetcher import YaMetrikaFetcher
+
+
+@pytest.fixture
+def fetcher():
+    config = YaMetrikaConfig(api_key="test-token", retries=0)
+    return YaMetrikaFetcher(YaMetrikaClient(config))
+
+
+@pytest.mark.asyncio
+async def test_batch_query_runs_all_queries(httpx_mock, fetcher):
+    httpx_mock.add_response(
+        url=re.compile(r".*stat/v1/data.*"),
+        json={"data": [{"dimensions": [], "metrics": [100]}]},
+        is_reusable=True,
+    )
+    result = json.loads(
+        await fetcher.batch_query(
+            [
+                {"tool": "get_visits", "arguments": {"counter_id": "1"}},
+                {
+                    "tool": "get_visits",
+                    "arguments": {"counter_id": "2", "output_format": "csv"},
+                },
+            ]
+        )
+    )
+    assert result["failed"] == 0
+    assert result["results"][0]["result"]["data"][0]["metrics"] == [100]
+    assert isinstance(result["results"][1]["result"], str)
+
+
+@pytest.mark.asyncio
+async def test_batch_query_isolates_failures(httpx_mock, fetcher):
+    httpx_mock.add_response(
+        url=re.compile(r".*stat/v1/data.*"),
+        json={"data": []},
+    )
+    result = json.loads(await fetcher.batch_query([
+        {"tool": "get_visits", "arguments": {"counter_id": "1"}},
+        {"tool": "get_visits", "arguments": {"counter_id": "1", "date_from": "bad"}},
+        {"tool": "get_visits", "arguments": {"counter": "1"}},
+        {"tool": "batch_query", "arguments": {}},
+    ]))
+    assert result["failed"] == 3
+    assert "result" in result["results"][0]
+    assert "non-batchable" in result["results"][3]["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_query_rejects_empty(fetcher):
+    with pytest.raises(MCPYaMetrikaError):
+        await fetcher.batch_query([])
+
+
+@pytest.mark.asyncio
+async def test_batch_query_reports_malformed_items_per_item(httpx_mock, fetcher):
+    httpx_mock.add_response(
+        url=re.compile(r".*stat/v1/data.*"),
+        json={"data": [{"dimensions": [], "metrics": [100]}]},
+    )
+    result = json.loads(await fetcher.batch_query([
+        {"tool": "get_visits", "arguments": ["1"]},
+        "get_visits",
+        {"tool": "get_visits", "arguments": {"counter_id": "1", "output_format": None}},
+    ]))
+    assert result["failed"] == 2
+    assert result["results"][0]["error"] == "arguments must be an object"
+    assert result["results"][1]["error"] == "Each query must be an object"
+    assert result["results"][2]["result"]["data"][0]["metrics"] == [100]
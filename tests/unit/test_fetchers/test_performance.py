@@ -1,9 +1,11 @@
 import re
+
 import pytest
-from ya_metrics_mcp.metrika.fetchers.performance import PerformanceMixin
-from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher
-from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+
 from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher
+from ya_metrics_mcp.metrika.fetchers.performance import PerformanceMixin
 
 
 class PerfFetcher(PerformanceMixin, BaseFetcher):
@@ -20,3 +22,38 @@ async def test_get_page_performance(httpx_mock, fetcher):
     httpx_mock.add_response(url=re.compile(r".*stat/v1/data.*"), json={"data": []})
     result = await fetcher.get_page_performance("12345")
     assert isinstance(result, str)
+
+
+@pytest.mark.asyncio
+async def test_get_page_performance_reads_all_pages(httpx_mock, fetcher):
+    httpx_mock.add_response(
+        url=re.compile(r".*stat/v1/data.*offset=1.*"),
+        json={
+            "data": [{"dimensions": [{"name": "/a"}], "metrics": [1]}],
+            "total_rows": 2,
+        },
+    )
+    httpx_mock.add_response(
+        url=re.compile(r".*stat/v1/data.*offset=2.*"),
+        json={
+            "data": [{"dimensions": [{"name": "/b"}], "metrics": [2]}],
+            "total_rows": 2,
+        },
+    )
+    fetcher.client.config.page_size = 1
+    result = await fetcher.get_page_performance("12345", max_rows=0)
+    assert "/a" in result and "/b" in result
+
+
+@pytest.mark.asyncio
+async def test_get_goals_conversion_defaults_to_counter_goals(httpx_mock, fetcher):
+    httpx_mock.add_response(
+        url="https://api-metrika.yandex.net/management/v1/counter/12345/goals",
+        json={"goals": [{"id": 7}, {"id": 9}]},
+    )
+    httpx_mock.add_response(url=re.compile(r".*stat/v1/data.*"), json={"data": []})
+    await fetcher.get_goals_conversion("12345")
+    stat_request = httpx_mock.get_requests()[-1]
+    assert stat_request.url.params["metrics"] == (
+        "ym:s:users,ym:s:goal7conversionRate,ym:s:goal9conversionRate"
+    )
@@ -0,0 +1,81 @@
+import json
+import re
+
+import httpx
+import pytest
+
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher
+from ya_metrics_mcp.metrika.fetchers.portfolio import PortfolioMixin
+
+
+class TestFetcher(PortfolioMixin, BaseFetcher):
+    pass
+
+
+@pytest.fixture
+def fetcher():
+    config = YaMetrikaConfig(api_key="test-token", retries=0)
+    return TestFetcher(YaMetrikaClient(config))
+
+
+def _report(request):
+    counter = int(request.url.params["ids"])
+    if counter == 3:
+        return {"errors": [{"message": "access denied"}]}, 400
+    return {
+        "data": [{"dimensions": [], "metrics": [counter * 10, 50.0]}],
+        "totals": [counter * 10, 50.0],
+    }, 200
+
+
+@pytest.mark.asyncio
+async def test_counters_report_fans_out_and_merges(httpx_mock, fetcher):
+    httpx_mock.add_response(
+        url=re.compile(r".*management/v1/counters.*"),
+        json={
+            "rows": 3,
+            "counters": [
+                {"id": 1, "name": "One"},
+                {"id": 2, "name": "Two"},
+                {"id": 3, "name": "Three"},
+            ],
+        },
+    )
+
+    def callback(request):
+        body, status = _report(request)
+        return httpx.Response(status, json=body)
+
+    httpx_mock.add_callback(
+        callback, url=re.compile(r".*stat/v1/data.*"), is_reusable=True
+    )
+    result = json.loads(
+        await fetcher.get_counters_report(
+            ["ym:s:visits", "ym:s:bounceRate"],
+            date_from="2024-01-01",
+            date_to="2024-01-07",
+        )
+    )
+    assert result["counters"] == 3
+    assert [row["dimensions"][0]["name"] for row in result["data"]] == ["One", "Two"]
+    assert result["totals"][0] == 30
+    assert result["errors"][0]["counter_id"] == "3"
+    assert result["query"]["dimensions"] == ["counter"]
+
+
+@pytest.mark.asyncio
+async def test_counters_report_with_explicit_ids_skips_lookup(httpx_mock, fetcher):
+    httpx_mock.add_response(
+        url=re.compile(r".*stat/v1/data.*"),
+        json={"data": [{"dimensions": [{"name": "organic"}], "metrics": [5]}]},
+        is_reusable=True,
+    )
+    result = await fetcher.get_counters_report(
+        ["ym:s:visits"], dimensions=["ym:s:lastTrafficSource"],
+        counter_ids=["7", "8"], output_format="csv",
+    )
+    assert result.splitlines() == [
+        "counter,ym:s:lastTrafficSource,ym:s:visits", "7,organic,5", "8,organic,5",
+    ]
@@ -0,0 +1,140 @@
+import json
+import re
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from ya_metrics_mcp.metrika.cache import make_cache_key
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher
+from ya_metrics_mcp.metrika.fetchers.sync import SyncMixin
+
+
+class SyncFetcher(SyncMixin, BaseFetcher):
+    pass
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    config = YaMetrikaConfig(
+        api_key="test-token", retries=0, cache_max_entries=0,
+        sync_db_path=str(tmp_path / "daily.sqlite"),
+    )
+    return SyncFetcher(YaMetrikaClient(config))
+
+
+def _bytime(request):
+    date1 = datetime.fromisoformat(request.url.params["date1"]).date()
+    date2 = datetime.fromisoformat(request.url.params["date2"]).date()
+    days = [
+        (date1 + timedelta(days=i)).isoformat() for i in range((date2 - date1).days + 1)
+    ]
+    return httpx.Response(200, json={
+        "time_intervals": [[day, day] for day in days],
+        "data": [{"dimensions": [], "metrics": [[1] * len(days)]}],
+    })
+
+
+@pytest.mark.asyncio
+async def test_daily_series_fetches_only_new_days(httpx_mock, fetcher):
+    httpx_mock.add_response(
+        url=re.compile(r".*management/v1/counter/1$"),
+        json={"counter": {"id": 1, "time_zone_name": "UTC"}},
+        is_reusable=True,
+    )
+    httpx_mock.add_callback(
+        _bytime, url=re.compile(r".*stat/v1/data/bytime.*"), is_reusable=True
+    )
+
+    first = json.loads(
+        await fetcher.get_daily_series("1", days=10, metrics=["ym:s:visits"])
+    )
+    second = json.loads(
+        await fetcher.get_daily_series("1", days=10, metrics=["ym:s:visits"])
+    )
+    await fetcher.client.close()
+
+    today = datetime.now(timezone.utc).date()
+    assert first["sync"]["fetched_days"] == 10
+    assert second["sync"]["fetched_days"] == 2
+    assert second["sync"]["fetched_ranges"] == [
+        [(today - timedelta(days=1)).isoformat(), today.isoformat()]
+    ]
+    assert second["data"][0]["metrics"] == [[1] * 10]
+    assert second["time_intervals"][-1] == [today.isoformat(), today.isoformat()]
+
+
+@pytest.mark.asyncio
+async def test_daily_series_validates_days(fetcher):
+    with pytest.raises(Exception, match="days must be between"):
+        await fetcher.get_daily_series("1", days=0)
+
+
+@pytest.mark.asyncio
+async def test_daily_series_refetches_span_when_top_keys_change(httpx_mock, fetcher):
+    httpx_mock.add_response(
+        url=re.compile(r".*management/v1/counter/1$"),
+        json={"counter": {"id": 1, "time_zone_name": "UTC"}},
+        is_reusable=True,
+    )
+    a = {"dimensions": [{"name": "A", "id": "a"}], "metrics": [[5, 5, 3, 1]]}
+    b = {"dimensions": [{"name": "B", "id": "b"}], "metrics": [[0, 0, 9, 9]]}
+    tail_b = {**b, "metrics": [[9, 9]]}
+    # First sync ranks A on top, the tail refresh ranks B, the full refetch both.
+    responses = iter([[a], [tail_b], [b, a]])
+
+    def respond(request):
+        data = next(responses)
+        date1 = datetime.fromisoformat(request.url.params["date1"]).date()
+        days = len(data[0]["metrics"][0])
+        intervals = [[(date1 + timedelta(days=i)).isoformat()] * 2 for i in range(days)]
+        return httpx.Response(200, json={
+            "time_intervals": intervals, "data": data, "total_rows": 2,
+        })
+
+    httpx_mock.add_callback(
+        respond, url=re.compile(r".*stat/v1/data/bytime.*"), is_reusable=True
+    )
+    await fetcher.get_daily_series("1", days=4, dimensions=["ym:s:trafficSource"])
+    result = json.loads(
+        await fetcher.get_daily_series("1", days=4, dimensions=["ym:s:trafficSource"])
+    )
+    await fetcher.client.close()
+
+    series = {row["dimensions"][0]["id"]: row["metrics"][0] for row in result["data"]}
+    assert series == {"a": [5, 5, 3, 1], "b": [0, 0, 9, 9]}
+    assert result["sync"]["full_refresh"] is True
+    assert len(httpx_mock.get_requests(url=re.compile(r".*bytime.*"))) == 3
+
+
+@pytest.mark.asyncio
+async def test_daily_series_bypasses_response_cache(httpx_mock, tmp_path):
+    httpx_mock.add_response(
+        url=re.compile(r".*management/v1/counter/1$"),
+        json={"counter": {"id": 1, "time_zone_name": "UTC"}},
+    )
+    httpx_mock.add_callback(_bytime, url=re.compile(r".*stat/v1/data/bytime.*"))
+    config = YaMetrikaConfig(
+        api_key="test-token", retries=0, sync_db_path=str(tmp_path / "daily.sqlite")
+    )
+    fetcher = SyncFetcher(YaMetrikaClient(config))
+
+    def _row(series):
+        return {"dimensions": [], "metrics": [series]}
+
+    today = datetime.now(timezone.utc).date().isoformat()
+    params = {
+        "ids": "1", "metrics": "ym:s:visits", "group": "day",
+        "date1": today, "date2": today,
+    }
+    key = make_cache_key("/stat/v1/data/bytime", params, fetcher.client._cache_token)
+    cached = {"time_intervals": [[today, today]], "data": [_row([99])]}
+    fetcher.client.cache.set(key, cached, ttl=60)
+
+    result = json.loads(
+        await fetcher.get_daily_series("1", days=1, metrics=["ym:s:visits"])
+    )
+    await fetcher.client.close()
+    assert result["data"][0]["metrics"] == [[1]]
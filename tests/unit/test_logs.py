@@ -0,0 +1,110 @@
+import json
+import re
+
+import pytest
+
+from ya_metrics_mcp.exceptions import MCPYaMetrikaError
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher
+from ya_metrics_mcp.metrika.fetchers.logs import LogsMixin
+from ya_metrics_mcp.metrika.logs import export_key, save_manifest
+
+BASE = "https://api-metrika.yandex.net/management/v1/counter/42"
+FIELDS = ["ym:s:visitID", "ym:s:date"]
+
+
+class LogsFetcher(LogsMixin, BaseFetcher):
+    pass
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    config = YaMetrikaConfig(
+        api_key="tok", logs_dir=str(tmp_path), logs_poll_interval=0
+    )
+    return LogsFetcher(YaMetrikaClient(config))
+
+
+def _export_dir(tmp_path):
+    return (
+        tmp_path / "42" / export_key("42", "2024-01-01", "2024-01-02", FIELDS, "visits")
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_logs_creates_polls_and_downloads(httpx_mock, fetcher, tmp_path):
+    httpx_mock.add_response(
+        url=re.compile(r".*/logrequests/evaluate.*"),
+        json={"log_request_evaluation": {"possible": True}},
+    )
+    httpx_mock.add_response(
+        method="POST", url=re.compile(r".*/logrequests\?.*"),
+        json={"log_request": {"request_id": 7, "status": "created"}},
+    )
+    httpx_mock.add_response(
+        url=f"{BASE}/logrequest/7", json={"log_request": {"status": "created"}}
+    )
+    httpx_mock.add_response(url=f"{BASE}/logrequest/7", json={"log_request": {
+        "status": "processed", "parts": [{"part_number": 0}, {"part_number": 1}],
+    }})
+    httpx_mock.add_response(
+        url=f"{BASE}/logrequest/7/part/0/download", content=b"a\tb\n1\t2\n"
+    )
+    httpx_mock.add_response(
+        url=f"{BASE}/logrequest/7/part/1/download", content=b"a\tb\n3\t4\n"
+    )
+    httpx_mock.add_response(method="POST", url=f"{BASE}/logrequest/7/clean", json={})
+
+    result = json.loads(
+        await fetcher.export_logs("42", "2024-01-01", "2024-01-02", FIELDS)
+    )
+    assert result["status"] == "downloaded"
+    assert result["total_bytes"] == 16
+    assert (_export_dir(tmp_path) / "part-0001.tsv").read_bytes() == b"a\tb\n3\t4\n"
+
+
+@pytest.mark.asyncio
+async def test_export_logs_resumes_partial_download(httpx_mock, fetcher, tmp_path):
+    directory = _export_dir(tmp_path)
+    save_manifest(directory, {
+        "counter_id": "42", "request_id": 7, "status": "processed",
+        "parts": [{"part_number": 0}, {"part_number": 1}],
+    })
+    (directory / "part-0000.tsv").write_bytes(b"done\n")
+    (directory / "part-0001.tsv.partial").write_bytes(b"trunc")
+    httpx_mock.add_response(
+        url=f"{BASE}/logrequest/7/part/1/download", content=b"full\n"
+    )
+
+    result = json.loads(await fetcher.export_logs(
+        "42", "2024-01-01", "2024-01-02", FIELDS, clean_after=False
+    ))
+    assert [f["resumed"] for f in result["files"]] == [True, False]
+    assert (directory / "part-0001.tsv").read_bytes() == b"full\n"
+    assert not (directory / "part-0001.tsv.partial").exists()
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_export_logs_rejects_impossible_request(httpx_mock, fetcher):
+    httpx_mock.add_response(
+        url=re.compile(r".*/logrequests/evaluate.*"),
+        json={
+            "log_request_evaluation": {
+                "possible": False,
+                "max_possible_day_quantity": 3,
+            }
+        },
+    )
+    with pytest.raises(MCPYaMetrikaError, match="at most 3 days"):
+        await fetcher.export_logs("42", "2024-01-01", "2024-01-02", FIELDS)
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried_on_server_error(httpx_mock):
+    httpx_mock.add_response(method="POST", status_code=500)
+    client = YaMetrikaClient(YaMetrikaConfig(api_key="tok", retry_delay=0))
+    with pytest.raises(MCPYaMetrikaError):
+        await client.post("/management/v1/counter/42/logrequests", {})
+    assert len(httpx_mock.get_requests()) == 1
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from ya_metrics_mcp.metrika.cache import make_cache_key
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher
+from ya_metrics_mcp.metrika.metadata import is_metadata_path, metadata_key_matcher
+
+COUNTER_URL = "https://api-metrika.yandex.net/management/v1/counter/42"
+
+
+def test_is_metadata_path():
+    assert is_metadata_path("/management/v1/counters")
+    assert is_metadata_path("/management/v1/counter/42")
+    assert is_metadata_path("/management/v1/counter/42/goals")
+    assert not is_metadata_path("/management/v1/counter/42/filters")
+    assert not is_metadata_path("/stat/v1/data")
+
+
+def test_metadata_key_matcher_for_one_counter():
+    matches = metadata_key_matcher("42")
+    assert matches(make_cache_key("/management/v1/counter/42/goals", {}, "t"))
+    assert matches(make_cache_key("/management/v1/counters", {"per_page": 100}, "t"))
+    assert not matches(make_cache_key("/management/v1/counter/7", {}, "t"))
+    assert not matches(make_cache_key("/stat/v1/data", {"ids": "42"}, "t"))
+
+
+@pytest.mark.asyncio
+async def test_stale_metadata_is_served_and_refreshed_in_background(httpx_mock):
+    httpx_mock.add_response(
+        url=COUNTER_URL, json={"counter": {"id": 42, "name": "old"}}
+    )
+    httpx_mock.add_response(
+        url=COUNTER_URL, json={"counter": {"id": 42, "name": "new"}}
+    )
+    client = YaMetrikaClient(
+        YaMetrikaConfig(api_key="tok", metadata_ttl=1, metadata_stale_ttl=3600)
+    )
+    clock = [0.0]
+    client.cache._clock = lambda: clock[0]
+    fetcher = BaseFetcher(client)
+
+    assert (await fetcher.get_counter("42"))["name"] == "old"
+    clock[0] = 5.0
+    assert (await fetcher.get_counter("42"))["name"] == "old"
+    assert (await fetcher.get_counter("42"))["name"] == "old"
+    await asyncio.sleep(0.01)
+    assert (await fetcher.get_counter("42"))["name"] == "new"
+    assert len(httpx_mock.get_requests()) == 2
+    assert client.stats()["inflight"]["background_refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_metadata_forces_refetch(httpx_mock):
+    httpx_mock.add_response(
+        url=COUNTER_URL + "/goals",
+        json={"goals": [{"id": 1}, {"id": 2}]},
+        is_reusable=True,
+    )
+    client = YaMetrikaClient(YaMetrikaConfig(api_key="tok"))
+    fetcher = BaseFetcher(client)
+    assert await fetcher.get_goal_ids("42") == [1, 2]
+    assert await fetcher.get_goal_ids("42") == [1, 2]
+    assert '"invalidated": 1' in await fetcher.invalidate_metadata_cache("42")
+    await fetcher.get_goal_ids("42")
+    assert len(httpx_mock.get_requests()) == 2
@@ -0,0 +1,78 @@
+import re
+
+import httpx
+import pytest
+from fastmcp import Client
+
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.servers.metrics import ServerMetrics
+from ya_metrics_mcp.utils.metrics import Counter, Histogram, path_template
+
+
+def test_path_template_replaces_ids():
+    assert (
+        path_template("/management/v1/counter/123/goals")
+        == "/management/v1/counter/{id}/goals"
+    )
+    assert path_template("/stat/v1/data/bytime") == "/stat/v1/data/bytime"
+
+
+def test_counter_and_histogram_render_prometheus_text():
+    counter = Counter("calls_total", "Calls.", ("tool",))
+    counter.inc("a")
+    counter.inc("a")
+    histogram = Histogram("latency_seconds", "Latency.", ("tool",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "a")
+    histogram.observe(0.5, "a")
+    text = "\n".join(counter.render() + histogram.render())
+    assert 'calls_total{tool="a"} 2' in text
+    assert 'latency_seconds_bucket{tool="a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{tool="a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{tool="a",le="+Inf"} 2' in text
+    assert 'latency_seconds_count{tool="a"} 2' in text
+
+
+@pytest.mark.asyncio
+async def test_render_includes_client_metrics(httpx_mock):
+    httpx_mock.add_response(
+        url=re.compile(r".*management/v1/counter/42.*"), json={"counter": {}}
+    )
+    client = YaMetrikaClient(YaMetrikaConfig(api_key="tok"))
+    await client.get("/management/v1/counter/42", {})
+    await client.get("/management/v1/counter/42", {})
+    metrics = ServerMetrics()
+    metrics.client = client
+    text = metrics.render()
+    await client.close()
+    assert (
+        'ya_metrics_upstream_request_duration_seconds_count'
+        '{endpoint="/management/v1/counter/{id}",method="GET",status="200"} 1'
+    ) in text
+    assert 'ya_metrics_cache_hits_total{cache="memory"} 1' in text
+    assert "ya_metrics_rate_limiter_queue_depth 0" in text
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_are_counted(monkeypatch):
+    monkeypatch.setenv("YANDEX_API_KEY", "tok")
+    import ya_metrics_mcp.servers.tools  # noqa: F401
+    from ya_metrics_mcp.servers.main import mcp, server_metrics
+
+    before = server_metrics.tool_calls.value("get_client_stats", "success")
+    async with Client(mcp) as client:
+        await client.call_tool("get_client_stats", {})
+    assert server_metrics.tool_calls.value("get_client_stats", "success") == before + 1
+    assert server_metrics.tool_latency.count("get_client_stats") >= 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_route_is_served():
+    from ya_metrics_mcp.servers.main import mcp
+
+    transport = httpx.ASGITransport(app=mcp.http_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        response = await http.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "ya_metrics_tool_calls_in_progress" in response.text
@@ -0,0 +1,60 @@
+import httpx
+import pytest
+
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.pagination import fetch_report_rows, iter_report_rows
+
+TOTAL_ROWS = 25
+
+
+def _paged_report(request: httpx.Request) -> httpx.Response:
+    offset = int(request.url.params["offset"])
+    limit = int(request.url.params["limit"])
+    rows = [
+        {"dimensions": [{"name": f"/page-{i}"}], "metrics": [i]}
+        for i in range(offset, min(offset + limit, TOTAL_ROWS + 1))
+    ]
+    return httpx.Response(200, json={"data": rows, "total_rows": TOTAL_ROWS})
+
+
+@pytest.fixture
+def client():
+    config = YaMetrikaConfig(
+        api_key="tok", rate_limit=0, rate_limit_per_token=0, rate_limit_per_counter=0
+    )
+    return YaMetrikaClient(config)
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_rows_across_pages(httpx_mock, client):
+    httpx_mock.add_callback(_paged_report, is_reusable=True)
+    report = await fetch_report_rows(
+        client, "/stat/v1/data", {"ids": "1"}, page_size=10
+    )
+    assert [row["metrics"][0] for row in report["data"]] == list(range(1, 26))
+    assert report["total_rows"] == TOTAL_ROWS
+    assert len(httpx_mock.get_requests()) == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_top_n_rows(httpx_mock, client):
+    httpx_mock.add_callback(_paged_report, is_reusable=True)
+    report = await fetch_report_rows(
+        client, "/stat/v1/data", {"ids": "1"}, max_rows=12, page_size=10
+    )
+    assert len(report["data"]) == 12
+    limits = sorted(int(r.url.params["limit"]) for r in httpx_mock.get_requests())
+    assert limits == [2, 10]
+
+
+@pytest.mark.asyncio
+async def test_iter_rows_streams_rows_in_order(httpx_mock, client):
+    httpx_mock.add_callback(_paged_report, is_reusable=True)
+    values = [
+        row["metrics"][0]
+        async for row in iter_report_rows(
+            client, "/stat/v1/data", {"ids": "1"}, page_size=7
+        )
+    ]
+    assert values == list(range(1, 26))
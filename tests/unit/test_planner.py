@@ -0,0 +1,157 @@
+import asyncio
+import re
+
+import httpx
+import pytest
+
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.planner import effective_sort, plan_key, split_report
+
+
+def test_plan_key_ignores_metrics_but_not_sort():
+    a = plan_key(
+        "/stat/v1/data", {"ids": "1", "metrics": "ym:s:visits", "sort": "-ym:s:users"}
+    )
+    b = plan_key(
+        "/stat/v1/data", {"ids": "1", "metrics": "ym:s:users", "sort": "-ym:s:users"}
+    )
+    c = plan_key("/stat/v1/data", {"ids": "1", "metrics": "ym:s:users"})
+    assert a == b == c
+    assert plan_key("/stat/v1/data", {"ids": "1", "metrics": "ym:s:visits"}) != a
+
+
+def test_plan_key_skips_presets_and_other_paths():
+    assert (
+        plan_key("/stat/v1/data", {"preset": "sources_summary", "metrics": "x"}) is None
+    )
+    assert plan_key("/stat/v1/data/bytime", {"ids": "1", "metrics": "x"}) is None
+
+
+def test_effective_sort_defaults_to_first_metric_descending():
+    assert effective_sort({"metrics": "ym:s:visits,ym:s:users"}) == "-ym:s:visits"
+
+
+def test_split_report_projects_metrics():
+    report = {
+        "query": {"metrics": ["a", "b", "c"]},
+        "data": [{"dimensions": [{"name": "x"}], "metrics": [1, 2, 3]}],
+        "totals": [1, 2, 3],
+        "min": [1, 2, 3],
+    }
+    result = split_report(report, ["a", "b", "c"], ["c", "a"])
+    assert result["data"][0]["metrics"] == [3, 1]
+    assert result["totals"] == [3, 1]
+    assert result["query"]["metrics"] == ["c", "a"]
+    assert report["data"][0]["metrics"] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_client_merges_concurrent_compatible_requests(httpx_mock):
+    def respond(request):
+        metrics = request.url.params["metrics"].split(",")
+        return httpx.Response(
+            200,
+            json={
+                "query": {"metrics": metrics},
+                "data": [
+                    {
+                        "dimensions": [{"name": "mobile"}],
+                        "metrics": list(range(len(metrics))),
+                    }
+                ],
+                "totals": list(range(len(metrics))),
+            },
+        )
+
+    httpx_mock.add_callback(
+        respond, url=re.compile(r".*stat/v1/data.*"), is_reusable=True
+    )
+    client = YaMetrikaClient(YaMetrikaConfig(api_key="test-token"))
+    base = {"ids": "1", "dimensions": "ym:s:deviceCategory", "date1": "2024-01-01"}
+    visits, users = await asyncio.gather(
+        client.get("/stat/v1/data", {**base, "metrics": "ym:s:visits"}),
+        client.get("/stat/v1/data", {**base, "metrics": "ym:s:visits,ym:s:users"}),
+    )
+    requests = httpx_mock.get_requests()
+    assert len(requests) == 1
+    assert requests[0].url.params["metrics"] == "ym:s:visits,ym:s:users"
+    assert visits["data"][0]["metrics"] == [0]
+    assert users["totals"] == [0, 1]
+    assert client.stats()["planner"]["merged_requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_client_does_not_merge_requests_with_different_sort(httpx_mock):
+    httpx_mock.add_response(
+        url=re.compile(r".*stat/v1/data.*"), json={"data": []}, is_reusable=True
+    )
+    client = YaMetrikaClient(YaMetrikaConfig(api_key="test-token"))
+    await asyncio.gather(
+        client.get("/stat/v1/data", {"ids": "1", "metrics": "ym:s:visits"}),
+        client.get("/stat/v1/data", {"ids": "1", "metrics": "ym:s:users"}),
+    )
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_planner_disabled_with_zero_window(httpx_mock):
+    httpx_mock.add_response(url=re.compile(r".*stat/v1/data.*"), json={"data": []})
+    client = YaMetrikaClient(YaMetrikaConfig(api_key="test-token", planner_window_ms=0))
+    assert client.planner is None
+    await client.get("/stat/v1/data", {"ids": "1", "metrics": "ym:s:visits"})
+    assert client.stats()["planner"] is None
+
+
+@pytest.mark.asyncio
+async def test_planner_counts_one_cache_miss_per_request(httpx_mock):
+    httpx_mock.add_response(url=re.compile(r".*stat/v1/data.*"), json={"data": []})
+    client = YaMetrikaClient(YaMetrikaConfig(api_key="test-token"))
+    params = {"ids": "1", "metrics": "ym:s:visits", "date1": "2024-01-01"}
+    await client.get("/stat/v1/data", params)
+    await client.get("/stat/v1/data", params)
+    cache = client.stats()["cache"]
+    assert (cache["misses"], cache["hits"], cache["hit_ratio"]) == (1, 1, 0.5)
+    assert client.stats()["planner"]["upstream_requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_planner_sends_request_at_once_when_idle(httpx_mock):
+    httpx_mock.add_response(
+        url=re.compile(r".*stat/v1/data.*"), json={"data": []}, is_reusable=True
+    )
+    config = YaMetrikaConfig(api_key="test-token", planner_window_ms=60_000)
+    client = YaMetrikaClient(config)
+    for metric in ("ym:s:visits", "ym:s:users"):
+        await asyncio.wait_for(
+            client.get("/stat/v1/data", {"ids": "1", "metrics": metric}), timeout=1
+        )
+    assert client.stats()["planner"]["immediate_requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_merged_request_is_retried_per_caller(httpx_mock):
+    def respond(request):
+        metrics = request.url.params["metrics"].split(",")
+        if "ym:s:typo" in metrics:
+            return httpx.Response(400, json={"message": "bad metric ym:s:typo"})
+        return httpx.Response(200, json={
+            "query": {"metrics": metrics},
+            "data": [],
+            "totals": [7] * len(metrics),
+        })
+
+    httpx_mock.add_callback(
+        respond, url=re.compile(r".*stat/v1/data.*"), is_reusable=True
+    )
+    client = YaMetrikaClient(YaMetrikaConfig(api_key="test-token"))
+    base = {"ids": "1", "date1": "2024-01-01", "sort": "-ym:s:visits"}
+    visits, typo = await asyncio.gather(
+        client.get("/stat/v1/data", {**base, "metrics": "ym:s:visits"}),
+        client.get("/stat/v1/data", {**base, "metrics": "ym:s:typo"}),
+        return_exceptions=True,
+    )
+    assert visits["totals"] == [7]
+    assert "ym:s:typo" in str(typo)
+    assert len(httpx_mock.get_requests()) == 3
+    assert client.stats()["planner"]["fallback_requests"] == 2
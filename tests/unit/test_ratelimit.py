@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from ya_metrics_mcp.metrika.ratelimit import (
+    RateLimiter,
+    TokenBucket,
+    counter_id_from_request,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=1, clock=clock)
+    assert bucket.delay() == 0
+    bucket.consume()
+    assert bucket.delay() == pytest.approx(0.5)
+    clock.now = 0.5
+    assert bucket.delay() == 0
+
+
+def test_counter_id_from_request():
+    assert counter_id_from_request("/stat/v1/data", {"ids": "123"}) == "123"
+    assert counter_id_from_request("/stat/v1/data/drilldown", {"id": "7"}) == "7"
+    assert counter_id_from_request("/management/v1/counter/42/goals", {}) == "42"
+    assert counter_id_from_request("/management/v1/counters", {}) is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:10 GMT", now=4.0) == pytest.approx(
+        6.0
+    )
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_queues_instead_of_failing():
+    limiter = RateLimiter(counter_rate=50)
+    waits = await asyncio.gather(*(limiter.acquire("tok", "1") for _ in range(55)))
+    assert max(waits) > 0
+    assert limiter.stats()["waited_requests"] >= 1
+    assert limiter.stats()["max_queue_depth"] >= 1
+    assert limiter.stats()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_disabled_does_not_wait():
+    limiter = RateLimiter()
+    assert not limiter.enabled
+    assert await limiter.acquire("tok", "1") == 0.0
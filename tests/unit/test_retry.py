@@ -0,0 +1,75 @@
+import pytest
+
+from ya_metrics_mcp.exceptions import CircuitOpenError, MCPYaMetrikaError
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.retry import CircuitBreaker, RetryPolicy, endpoint_family
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_endpoint_family():
+    assert endpoint_family("/stat/v1/data/bytime") == "stat"
+    assert endpoint_family("/management/v1/counters") == "management"
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=4.0)
+    delays = [policy.backoff(attempt=6) for _ in range(200)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_backoff_prefers_retry_after():
+    policy = RetryPolicy(max_delay=10.0)
+    assert policy.backoff(attempt=1, retry_after=3.0) == 3.0
+    assert policy.backoff(attempt=1, retry_after=60.0) == 10.0
+
+
+def test_next_delay_respects_attempts_and_deadline():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, deadline=5.0)
+    assert policy.next_delay(attempt=3, elapsed=0.0) is None
+    assert policy.next_delay(attempt=1, elapsed=4.5, retry_after=1.0) is None
+    assert policy.next_delay(attempt=1, elapsed=0.0, retry_after=1.0) == 1.0
+
+
+def test_circuit_breaker_opens_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker("stat", failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 11
+    breaker.before_call()  # half-open probe
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_client_fails_fast_when_circuit_open(httpx_mock):
+    httpx_mock.add_response(status_code=503, text="Unavailable", is_reusable=True)
+    config = YaMetrikaConfig(
+        api_key="tok", retries=1, circuit_failure_threshold=2, circuit_reset_timeout=60
+    )
+    client = YaMetrikaClient(config)
+    for ids in ("1", "2"):
+        with pytest.raises(MCPYaMetrikaError, match="503"):
+            await client.get("/stat/v1/data", {"ids": ids})
+    with pytest.raises(CircuitOpenError):
+        await client.get("/stat/v1/data", {"ids": "3"})
+    assert len(httpx_mock.get_requests()) == 2
+    assert client.stats()["circuit_breakers"]["stat"]["state"] == "open"
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher
+from ya_metrics_mcp.utils import serialization
+from ya_metrics_mcp.utils.serialization import dumps_json, serialize
+
+PAYLOAD = {"data": [{"dimensions": [{"name": "Москва"}], "metrics": [1.5, 2]}]}
+
+
+def test_compact_has_no_whitespace():
+    text = serialize(PAYLOAD, "compact")
+    assert " " not in text.replace("Москва", "")
+    assert "\n" not in text
+    assert json.loads(text) == PAYLOAD
+
+
+def test_pretty_is_indented_and_keeps_unicode():
+    text = serialize(PAYLOAD, "pretty")
+    assert "\n  " in text
+    assert "Москва" in text
+
+
+def test_serialize_rejects_unknown_format():
+    with pytest.raises(ValueError, match="output_format"):
+        serialize(PAYLOAD, "xml")
+
+
+@pytest.mark.skipif(serialization.orjson is None, reason="orjson not installed")
+def test_orjson_backend_matches_stdlib():
+    for pretty in (True, False):
+        assert dumps_json(PAYLOAD, pretty, "orjson") == dumps_json(
+            PAYLOAD, pretty, "stdlib"
+        )
+
+
+def test_format_response_uses_config_default_and_override():
+    config = YaMetrikaConfig(api_key="tok", output_format="compact")
+    fetcher = BaseFetcher(YaMetrikaClient(config))
+    assert "\n" not in fetcher.format_response(PAYLOAD)
+    assert "\n" in fetcher.format_response(PAYLOAD, "pretty")
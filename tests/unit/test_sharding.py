@@ -0,0 +1,176 @@
+import json
+import re
+
+import httpx
+import pytest
+
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.fetchers.advanced import AdvancedMixin
+from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher
+from ya_metrics_mcp.metrika.fetchers.performance import PerformanceMixin
+from ya_metrics_mcp.metrika.sharding import (
+    merge_bytime_reports,
+    merge_table_reports,
+    metric_kind,
+)
+
+
+class ShardFetcher(AdvancedMixin, PerformanceMixin, BaseFetcher):
+    pass
+
+
+def _row(name, *metrics):
+    return {"dimensions": [{"name": name}], "metrics": list(metrics)}
+
+
+def test_metric_kind():
+    assert metric_kind("ym:s:visits") == "additive"
+    assert metric_kind("ym:s:bounceRate") == "ratio"
+    assert metric_kind("ym:s:avgVisitDurationSeconds") == "ratio"
+    assert metric_kind("ym:s:users") == "distinct"
+
+
+def test_merge_table_reports_sums_and_weights():
+    metrics = ["ym:s:visits", "ym:s:bounceRate"]
+    merged = merge_table_reports(
+        [
+            {
+                "data": [_row("/a", 100, 10.0), _row("/b", 10, 50.0)],
+                "totals": [110, 13.6],
+            },
+            {"data": [_row("/a", 300, 30.0)], "totals": [300, 30.0]},
+        ],
+        metrics,
+    )
+    rows = {r["dimensions"][0]["name"]: r["metrics"] for r in merged["data"]}
+    assert rows["/a"] == [400, pytest.approx(25.0)]
+    assert rows["/b"] == [10, 50.0]
+    assert merged["totals"][0] == 410
+    assert merged["total_rows"] == 2
+
+
+def test_merge_bytime_reports_concatenates_and_pads():
+    merged = merge_bytime_reports(
+        [
+            {
+                "data": [_row("organic", [1, 2])],
+                "time_intervals": [["d1", "d1"], ["d2", "d2"]],
+                "totals": [[1, 2]],
+            },
+            {
+                "data": [_row("organic", [3]), _row("direct", [4])],
+                "time_intervals": [["d3", "d3"]],
+                "totals": [[7]],
+            },
+        ],
+        ["ym:s:visits"],
+    )
+    rows = {r["dimensions"][0]["name"]: r["metrics"][0] for r in merged["data"]}
+    assert rows == {"organic": [1, 2, 3], "direct": [None, None, 4]}
+    assert merged["totals"] == [[1, 2, 7]]
+    assert len(merged["time_intervals"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_page_performance_sharded_by_month(httpx_mock):
+    def respond(request: httpx.Request) -> httpx.Response:
+        metrics = request.url.params["metrics"].split(",")
+        assert "ym:s:visits" in metrics  # weight added for ratio metrics
+        return httpx.Response(
+            200,
+            json={
+                "query": {"date1": request.url.params["date1"]},
+                "data": [_row("/a", 10, 20.0, 60.0, 5)],
+                "totals": [10, 20.0, 60.0, 5],
+            },
+        )
+
+    httpx_mock.add_callback(
+        respond, url=re.compile(r".*stat/v1/data.*"), is_reusable=True
+    )
+    fetcher = ShardFetcher(YaMetrikaClient(YaMetrikaConfig(api_key="tok")))
+    result = json.loads(
+        await fetcher.get_page_performance(
+            "1", "2024-01-15", "2024-03-10", shard="month"
+        )
+    )
+    assert len(httpx_mock.get_requests()) == 3
+    assert result["data"][0]["metrics"] == [30, 20.0, 60.0]
+    assert result["query"]["date1"] == "2024-01-15"
+    assert result["sharding"]["shards"] == 3
+
+
+@pytest.mark.asyncio
+async def test_data_by_time_rejects_misaligned_shards():
+    fetcher = ShardFetcher(YaMetrikaClient(YaMetrikaConfig(api_key="tok")))
+    with pytest.raises(Exception, match="Cannot shard"):
+        await fetcher.get_data_by_time(
+            "1",
+            ["ym:s:visits"],
+            "2024-01-01",
+            "2024-03-01",
+            group="month",
+            shard="week",
+        )
+
+
+@pytest.mark.asyncio
+async def test_sharded_rows_are_summed_over_every_shard_row(httpx_mock):
+    # /a ranks first on day 1 and last on day 2; with one row per page each
+    # shard must be paged through to get exact per-row sums.
+    days = {
+        "2024-01-01": [_row("/a", 10, 0.0, 0.0, 1), _row("/b", 9, 0.0, 0.0, 1)],
+        "2024-01-02": [_row("/b", 10, 0.0, 0.0, 1), _row("/a", 1, 0.0, 0.0, 1)],
+    }
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        rows = days[params["date1"]]
+        offset, limit = int(params["offset"]), int(params["limit"])
+        return httpx.Response(
+            200,
+            json={
+                "query": {},
+                "data": rows[offset - 1:offset - 1 + limit],
+                "total_rows": len(rows),
+                "totals": [sum(r["metrics"][0] for r in rows), 0.0, 0.0, 2],
+            },
+        )
+
+    httpx_mock.add_callback(
+        respond, url=re.compile(r".*stat/v1/data.*"), is_reusable=True
+    )
+    config = YaMetrikaConfig(api_key="tok", page_size=1, planner_window_ms=0)
+    fetcher = ShardFetcher(YaMetrikaClient(config))
+    result = json.loads(
+        await fetcher.get_page_performance("1", "2024-01-01", "2024-01-02", shard="day")
+    )
+    rows = {r["dimensions"][0]["name"]: r["metrics"][0] for r in result["data"]}
+    assert rows == {"/b": 19, "/a": 11}
+    assert [r["dimensions"][0]["name"] for r in result["data"]] == ["/b", "/a"]
+    assert result["totals"][0] == sum(rows.values()) == 30
+    assert len(httpx_mock.get_requests()) == 4
+
+
+@pytest.mark.asyncio
+async def test_sharded_rows_respect_request_budget(httpx_mock):
+    def respond(request: httpx.Request) -> httpx.Response:
+        limit = int(request.url.params["limit"])
+        rows = [_row(f"/{i}", 1, 0.0, 0.0, 1) for i in range(limit)]
+        body = {"query": {}, "data": rows, "total_rows": 50, "totals": [50, 0, 0, 50]}
+        return httpx.Response(200, json=body)
+
+    httpx_mock.add_callback(
+        respond, url=re.compile(r".*stat/v1/data.*"), is_reusable=True
+    )
+    config = YaMetrikaConfig(
+        api_key="tok", page_size=2, shard_max_requests=3, planner_window_ms=0
+    )
+    fetcher = ShardFetcher(YaMetrikaClient(config))
+    result = json.loads(
+        await fetcher.get_page_performance("1", "2024-01-01", "2024-01-03", shard="day")
+    )
+    assert len(httpx_mock.get_requests()) == 3
+    assert result["sharding"]["truncated"] is True
+    assert result["sharding"]["rows_per_shard"] == 2
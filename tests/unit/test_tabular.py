@@ -0,0 +1,87 @@
+import json
+
+from ya_metrics_mcp.utils.serialization import serialize
+from ya_metrics_mcp.utils.tabular import is_report, to_delimited, to_table
+
+TABLE_REPORT = {
+    "query": {
+        "dimensions": ["ym:s:URLPath"],
+        "metrics": ["ym:s:pageviews", "ym:s:bounceRate"],
+    },
+    "data": [
+        {"dimensions": [{"name": "/a", "id": None}], "metrics": [10, 5.5]},
+        {"dimensions": [{"name": "/b", "id": None}], "metrics": [3, 0.0]},
+    ],
+    "totals": [13, 4.2],
+    "total_rows": 2,
+}
+
+BYTIME_REPORT = {
+    "query": {"dimensions": ["ym:s:lastTrafficSource"], "metrics": ["ym:s:visits"]},
+    "data": [
+        {"dimensions": [{"name": "organic", "id": "organic"}], "metrics": [[1, 2]]}
+    ],
+    "time_intervals": [["2024-01-01", "2024-01-01"], ["2024-01-02", "2024-01-02"]],
+    "totals": [[1, 2]],
+}
+
+COMPARISON_REPORT = {
+    "query": {"dimensions": ["ym:s:trafficSource"], "metrics": ["ym:s:visits"]},
+    "data": [{"dimensions": [{"name": "Direct"}], "metrics": {"a": [5], "b": [7]}}],
+}
+
+
+def test_is_report():
+    assert is_report(TABLE_REPORT)
+    assert not is_report({"counters": []})
+
+
+def test_to_table_uses_query_names():
+    table = to_table(TABLE_REPORT)
+    assert table["columns"] == ["ym:s:URLPath", "ym:s:pageviews", "ym:s:bounceRate"]
+    assert table["rows"] == [["/a", 10, 5.5], ["/b", 3, 0.0]]
+    assert table["totals"] == [13, 4.2]
+
+
+def test_to_table_comparison_prefixes_segments():
+    table = to_table(COMPARISON_REPORT)
+    assert table["columns"] == ["ym:s:trafficSource", "a:ym:s:visits", "b:ym:s:visits"]
+    assert table["rows"] == [["Direct", 5, 7]]
+
+
+def test_csv_bytime_is_long_form():
+    text = to_delimited(BYTIME_REPORT)
+    assert text.splitlines() == [
+        "period,ym:s:lastTrafficSource,ym:s:visits",
+        "2024-01-01,organic,1",
+        "2024-01-02,organic,2",
+    ]
+
+
+def test_csv_metadata_comment_lines_are_opt_in():
+    report = {
+        **TABLE_REPORT,
+        "sharding": {"unit": "day", "shards": 2, "approximate_metrics": []},
+        "freshness": {"stale": True, "age_seconds": 12.5, "refreshing": True},
+    }
+    header = "ym:s:URLPath,ym:s:pageviews,ym:s:bounceRate"
+    assert to_delimited(report).splitlines()[0] == header
+    lines = to_delimited(report, "\t", metadata=True).splitlines()
+    assert lines[:3] == [
+        '# sharding: {"unit":"day","shards":2,"approximate_metrics":[]}',
+        '# freshness: {"stale":true,"age_seconds":12.5,"refreshing":true}',
+        "ym:s:URLPath\tym:s:pageviews\tym:s:bounceRate",
+    ]
+    assert not to_delimited(TABLE_REPORT, metadata=True).startswith("#")
+
+
+def test_serialize_table_modes_are_smaller_than_json():
+    compact = serialize(TABLE_REPORT, "compact")
+    table = serialize(TABLE_REPORT, "table")
+    assert len(table) < len(compact)
+    assert json.loads(table)["rows"][0] == ["/a", 10, 5.5]
+    assert serialize(TABLE_REPORT, "tsv").splitlines()[1] == "/a\t10\t5.5"
+
+
+def test_serialize_table_falls_back_for_non_reports():
+    assert serialize({"counters": [1]}, "csv") == '{"counters":[1]}'
@@ -0,0 +1,79 @@
+import json
+import re
+
+import pytest
+
+from ya_metrics_mcp.metrika.client import YaMetrikaClient
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.metrika.fetchers.base import BaseFetcher
+from ya_metrics_mcp.metrika.fetchers.traffic import TrafficMixin
+from ya_metrics_mcp.utils import tracing
+from ya_metrics_mcp.utils.tracing import configure_tracing, recent_traces, span
+
+
+class TracedFetcher(TrafficMixin, BaseFetcher):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def memory_tracing():
+    configure_tracing("memory", 10)
+    yield
+    configure_tracing("memory", 100)
+
+
+def test_spans_nest_into_one_trace():
+    with span("outer", counter_id="1"):
+        with span("inner") as inner:
+            inner.set_attribute("size", 3)
+    (trace,) = recent_traces()
+    assert trace["name"] == "outer"
+    assert trace["attributes"] == {"counter_id": "1"}
+    assert trace["children"][0]["attributes"] == {"size": 3}
+
+
+def test_span_records_errors():
+    with pytest.raises(ValueError):
+        with span("failing"):
+            raise ValueError("boom")
+    assert recent_traces()[0]["error"] == "ValueError: boom"
+
+
+def test_off_mode_records_nothing():
+    configure_tracing("off")
+    with span("ignored"):
+        pass
+    assert recent_traces() == []
+
+
+def test_invalid_mode_is_rejected():
+    with pytest.raises(ValueError, match="tracing"):
+        tracing.validate_tracing_mode("jaeger")
+
+
+@pytest.mark.asyncio
+async def test_tool_trace_shows_retry_and_serialization(httpx_mock):
+    httpx_mock.add_response(url=re.compile(r".*stat/v1/data.*"), status_code=503)
+    httpx_mock.add_response(url=re.compile(r".*stat/v1/data.*"), json={"data": []})
+    config = YaMetrikaConfig(
+        api_key="tok", retries=2, retry_delay=0.001, planner_window_ms=0
+    )
+    fetcher = TracedFetcher(YaMetrikaClient(config))
+    await fetcher.get_visits("42", "2024-01-01", "2024-01-07")
+
+    (trace,) = recent_traces()
+    assert trace["name"] == "tool.get_visits"
+    assert trace["attributes"]["counter_id"] == "42"
+    assert trace["attributes"]["response.size"] > 0
+    names = [child["name"] for child in trace["children"]]
+    assert names == [
+        "ratelimit.wait", "metrika.request", "retry.sleep",
+        "ratelimit.wait", "metrika.request", "serialize",
+    ]
+    statuses = [c["attributes"]["http.status"] for c in trace["children"]
+                if c["name"] == "metrika.request"]
+    assert statuses == ["503", "200"]
+
+    traces = json.loads(await fetcher.get_recent_traces(limit=1))
+    assert traces["tracing"] == "memory"
+    assert traces["traces"][0]["name"] == "tool.get_visits"
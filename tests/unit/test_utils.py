@@ -1,8 +1,9 @@
 import pytest
+
+from ya_metrics_mcp.metrika.config import YaMetrikaConfig
+from ya_metrics_mcp.utils.date import default_date_range, validate_date
 from ya_metrics_mcp.utils.logging import mask_sensitive
-from ya_metrics_mcp.utils.date import validate_date, default_date_range
 from ya_metrics_mcp.utils.tools import filter_tools
-from ya_metrics_mcp.metrika.config import YaMetrikaConfig
 
 
 def test_mask_sensitive_keeps_last_4():
@@ -50,3 +51,42 @@ def test_filter_tools_read_only_removes_write():
     result = filter_tools([t for t, _ in read_tools], config,
                           tool_tags={t: tags for t, tags in read_tools})
     assert result == ["get_visits"]
+
+
+def test_split_date_range_by_week_follows_calendar_weeks():
+    from ya_metrics_mcp.utils.date import split_date_range
+
+    # 2024-01-03 is a Wednesday
+    assert split_date_range("2024-01-03", "2024-01-15", "week") == [
+        ("2024-01-03", "2024-01-07"),
+        ("2024-01-08", "2024-01-14"),
+        ("2024-01-15", "2024-01-15"),
+    ]
+
+
+def test_split_date_range_by_month_and_day():
+    from ya_metrics_mcp.utils.date import split_date_range
+
+    assert split_date_range("2024-01-20", "2024-03-05", "month") == [
+        ("2024-01-20", "2024-01-31"),
+        ("2024-02-01", "2024-02-29"),
+        ("2024-03-01", "2024-03-05"),
+    ]
+    assert len(split_date_range("2024-01-01", "2024-01-10", "day")) == 10
+    with pytest.raises(ValueError):
+        split_date_range("2024-02-01", "2024-01-01", "day")
+
+
+def test_comparison_range():
+    from ya_metrics_mcp.utils.date import comparison_range
+
+    assert comparison_range("2024-03-11", "2024-03-17", "previous") == (
+        "2024-03-04",
+        "2024-03-10",
+    )
+    assert comparison_range("2024-02-01", "2024-02-29", "year_ago") == (
+        "2023-02-01",
+        "2023-02-28",
+    )
+    with pytest.raises(ValueError):
+        comparison_range("2024-03-11", "2024-03-17", "quarter")